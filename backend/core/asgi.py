@@ -0,0 +1,8 @@
+"""ASGI config for JobPulse API - utilisé par Gunicorn + workers uvicorn (SERVER_MODE=asgi)."""
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+application = get_asgi_application()
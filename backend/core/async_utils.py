@@ -0,0 +1,67 @@
+"""
+core/async_utils.py - Outils des vues de lecture async (déploiement ASGI)
+=========================================================================
+
+Partagés par les vues async de jobs/async_views.py et core/views.py, et par le
+routage des lectures (core/db_router.py) :
+- fast_read : décorateur qui sert les GET JSON par la vue async et délègue tout
+  le reste à la vue DRF (exécutée dans un thread)
+- json_response : corps produit par le JSONRenderer de DRF (mêmes réponses qu'en WSGI)
+- validated_token : signature et expiration du jeton JWT, sans requête sur l'utilisateur
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+_renderer = JSONRenderer()
+_jwt = JWTAuthentication()
+
+
+def json_response(data, status=200):
+    response = HttpResponse(_renderer.render(data), status=status, content_type="application/json")
+    patch_vary_headers(response, ["Accept"])
+    return response
+
+
+def wants_json(request):
+    """Vrai sauf pour l'API navigable de DRF (?format=, Accept: text/html)."""
+    return "format" not in request.GET and "text/html" not in request.META.get("HTTP_ACCEPT", "")
+
+
+def validated_token(request):
+    """Jeton JWT de l'en-tête Authorization : None si absent, False s'il est invalide."""
+    header = _jwt.get_header(request)
+    if header is None:
+        return None
+    try:
+        raw_token = _jwt.get_raw_token(header)
+        return None if raw_token is None else _jwt.get_validated_token(raw_token)
+    except AuthenticationFailed:
+        return False
+
+
+def fast_read(fallback):
+    """
+    Décorateur de vue async : seules les requêtes GET JSON (sans jeton ou avec un
+    jeton valide) passent par la vue décorée ; si elle renvoie None, ou pour toute
+    autre requête, la vue DRF fallback répond.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def view(request, *args, **kwargs):
+            if request.method == "GET" and wants_json(request) and validated_token(request) is not False:
+                response = await func(request, *args, **kwargs)
+                if response is not None:
+                    return response
+            return await sync_to_async(fallback)(request, *args, **kwargs)
+
+        # La vue DRF applique elle-même la vérification CSRF (SessionAuthentication)
+        view.csrf_exempt = True
+        return view
+
+    return decorator
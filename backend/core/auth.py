@@ -0,0 +1,175 @@
+"""
+core/auth.py - Authentification JWT portant le rôle de l'utilisateur
+====================================================================
+
+Les jetons d'accès portent les claims username, role, is_candidate,
+is_recruiter et is_staff, calculés depuis la base à la connexion comme à
+chaque rafraîchissement (RoleRefreshToken, SIMPLE_JWT dans core/settings.py).
+
+ClaimsJWTAuthentication (DEFAULT_AUTHENTICATION_CLASSES) ne lit pas la table
+User : request.user est construit depuis le jeton (claims_user) avec id,
+username, is_staff et le rôle ; les autres champs (email...) ne sont lus en
+base que si une vue y accède.
+
+Le jeton est comparé à l'état courant de l'utilisateur, en cache
+("auth:user:<id>", une lecture Redis par requête, relu sur "default" en cas de MISS) :
+- rôle, is_staff ou username modifiés : 401 code "token_stale", le client
+  rafraîchit son jeton (POST /api/auth/refresh/) et reçoit les nouveaux claims
+- compte désactivé ou supprimé : 401 code "user_inactive"
+L'entrée est supprimée après chaque modification de User / UserProfile
+(jobs/signals.py).
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+STATE_KEY = "auth:user:{id}"
+STATE_TTL = 10 * 60
+TOKEN_CLAIMS = ("username", "role", "is_candidate", "is_recruiter", "is_staff")
+STATE_FIELDS = ("username", "email", "is_active", "is_staff", "profile__role")
+
+INACTIVE = {"active": False}
+
+
+def token_user_id(token):
+    """Identifiant du jeton (chaîne dans le claim) converti au type de la clé primaire de User."""
+    return get_user_model()._meta.pk.to_python(token[jwt_settings.USER_ID_CLAIM])
+
+
+def _state_query(user_id):
+    # Toujours le primaire : un réplica en retard remettrait l'ancien rôle en cache
+    return get_user_model().objects.using(DEFAULT_DB_ALIAS).filter(pk=user_id).values(*STATE_FIELDS)
+
+
+def _state_from_row(row):
+    from jobs.models import UserProfile
+
+    if row is None or not row["is_active"]:
+        return INACTIVE
+    # Sans UserProfile : candidat, comme à l'inscription (aucune écriture ici)
+    profile = UserProfile(role=row["profile__role"] or "candidate")
+    return {
+        "active": True,
+        "username": row["username"],
+        "email": row["email"] or "",
+        "role": profile.role,
+        "is_candidate": profile.is_candidate(),
+        "is_recruiter": profile.is_recruiter(),
+        "is_staff": row["is_staff"],
+    }
+
+
+def load_user_state(user_id):
+    """État relu en base et remis en cache (connexion, rafraîchissement du jeton)."""
+    state = _state_from_row(_state_query(user_id).first())
+    cache.set(STATE_KEY.format(id=user_id), state, STATE_TTL)
+    return state
+
+
+def user_state(user_id):
+    """État courant de l'utilisateur : {"active": False} ou username, email, rôle, is_staff."""
+    state = cache.get(STATE_KEY.format(id=user_id))
+    if state is None:
+        state = load_user_state(user_id)
+    return state
+
+
+async def auser_state(user_id):
+    key = STATE_KEY.format(id=user_id)
+    state = await cache.aget(key)
+    if state is None:
+        state = _state_from_row(await _state_query(user_id).afirst())
+        await cache.aset(key, state, STATE_TTL)
+    return state
+
+
+def invalidate_user(user_id):
+    cache.delete(STATE_KEY.format(id=user_id))
+
+
+def check_token(token, state):
+    """AuthenticationFailed si le compte est inactif ou si les claims du jeton sont périmés."""
+    if not state["active"]:
+        raise AuthenticationFailed("Utilisateur inactif ou supprimé.", code="user_inactive")
+    if any(token.get(claim) != state[claim] for claim in TOKEN_CLAIMS):
+        raise AuthenticationFailed("Rôle modifié : rafraîchissez le jeton.", code="token_stale")
+
+
+# ---- Jetons ----
+
+class RoleRefreshToken(RefreshToken):
+    """Jeton de rafraîchissement dont les jetons d'accès reçoivent les claims courants."""
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        state = load_user_state(token_user_id(self))
+        if not state["active"]:
+            raise AuthenticationFailed("Utilisateur inactif ou supprimé.", code="user_inactive")
+        for claim in TOKEN_CLAIMS:
+            access[claim] = state[claim]
+        return access
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RoleRefreshToken
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RoleRefreshToken
+
+
+# ---- Authentification ----
+
+def claims_user(token):
+    """
+    Instance User construite depuis les claims, sans requête : id, username,
+    is_staff et is_active sont renseignés, les autres champs sont différés
+    (chargés par l'ORM au premier accès, comme avec only()). Le rôle est
+    exposé par les attributs role, is_candidate et is_recruiter.
+    """
+    User = get_user_model()
+    known = {
+        User._meta.pk.attname: token_user_id(token),
+        "username": token["username"],
+        "is_staff": token["is_staff"],
+        "is_active": True,
+    }
+    fields = [field.attname for field in User._meta.concrete_fields if field.attname in known]
+    user = User.from_db(DEFAULT_DB_ALIAS, fields, [known[field] for field in fields])
+    user.role = token["role"]
+    user.is_candidate = token["is_candidate"]
+    user.is_recruiter = token["is_recruiter"]
+    return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication sans lecture de la table User : claims vérifiés contre l'état en cache."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = token_user_id(validated_token)
+        except (KeyError, ValidationError):
+            raise InvalidToken("Le jeton ne contient pas d'identifiant utilisateur valide.")
+        check_token(validated_token, user_state(user_id))
+        return claims_user(validated_token)
+
+
+def is_recruiter(user):
+    """Rôle recruteur : claim du jeton, sinon UserProfile (authentification par session)."""
+    from jobs.models import UserProfile
+
+    recruiter = getattr(user, "is_recruiter", None)
+    if recruiter is not None:
+        return recruiter
+    try:
+        return user.profile.is_recruiter()
+    except UserProfile.DoesNotExist:
+        return False
@@ -0,0 +1,207 @@
+"""
+core/db_router.py - Lectures sur les réplicas PostgreSQL
+========================================================
+
+Réplicas déclarés par DATABASE_REPLICA_HOSTS (core/settings.py) : alias
+replica_1, replica_2... Sans réplica, tout va sur "default" comme avant.
+
+Le routage est décidé par requête HTTP (ReplicaRoutingMiddleware) :
+- GET / HEAD / OPTIONS : lectures sur un réplica en bonne santé
+- autres méthodes, tâches Celery, commandes : tout sur "default"
+- dès qu'une écriture a lieu pendant la requête, la suite de la requête lit
+  sur "default" ; idem dans un transaction.atomic()
+- lecture de ses propres écritures : après une requête qui écrit, les requêtes
+  du même utilisateur (JWT, sinon cookie de session, sinon IP) lisent sur
+  "default" pendant REPLICA_STICKY_SECONDS (clé "db:primary:<identité>" en cache)
+- données calculées pour être mises en cache : replica_reads() indique si elles
+  ont pu être lues sur un réplica (en retard d'au plus REPLICA_MAX_LAG_SECONDS)
+
+Santé des réplicas : vérifiée au plus toutes les REPLICA_HEALTH_CHECK_INTERVAL
+secondes par processus (SELECT, retard de réplication <= REPLICA_MAX_LAG_SECONDS) ;
+un réplica en panne ou trop en retard est écarté, "default" sert de repli.
+"""
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+logger = logging.getLogger(__name__)
+
+REPLICA_PREFIX = "replica_"
+STICKY_KEY = "db:primary:{identity}"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Retard de réplication (s) ; 0 si le réplica a rejoué tout ce qu'il a reçu
+LAG_SQL = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class RoutingState:
+    """État d'une requête ; mutable pour rester partagé avec les threads sync_to_async."""
+
+    def __init__(self, replica_reads):
+        self.replica_reads = replica_reads
+        self.wrote = False
+
+
+_state = ContextVar("db_routing_state", default=None)
+
+
+def replica_reads():
+    """Vrai si les lectures de la requête en cours peuvent être servies par un réplica."""
+    state = _state.get()
+    return state is not None and state.replica_reads
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith(REPLICA_PREFIX)]
+
+
+# ---- Santé des réplicas ----
+
+_health = {}
+_health_lock = threading.Lock()
+
+
+def _check_replica(alias):
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor != "postgresql":
+                cursor.execute("SELECT 1")
+                return True
+            cursor.execute(LAG_SQL)
+            lag = float(cursor.fetchone()[0] or 0)
+    except DatabaseError as exc:
+        logger.warning("db_router: réplica %s indisponible (%s)", alias, exc)
+        connection.close_if_unusable_or_obsolete()
+        return False
+    if lag > settings.REPLICA_MAX_LAG_SECONDS:
+        logger.warning("db_router: réplica %s en retard de %.1f s, écarté", alias, lag)
+        return False
+    return True
+
+
+def is_healthy(alias):
+    now = time.monotonic()
+    checked_at, healthy = _health.get(alias, (None, True))
+    if checked_at is not None and now - checked_at < settings.REPLICA_HEALTH_CHECK_INTERVAL:
+        return healthy
+    with _health_lock:
+        # Un seul thread vérifie ; les autres gardent le dernier état connu
+        checked_at, healthy = _health.get(alias, (None, True))
+        if checked_at is not None and now - checked_at < settings.REPLICA_HEALTH_CHECK_INTERVAL:
+            return healthy
+        _health[alias] = (now, healthy)
+    healthy = _check_replica(alias)
+    _health[alias] = (time.monotonic(), healthy)
+    return healthy
+
+
+def replica_status():
+    """{alias: sain ?} d'après le dernier contrôle (pour le débogage)."""
+    return {alias: _health.get(alias, (None, None))[1] for alias in replica_aliases()}
+
+
+# ---- Router ----
+
+class ReplicaRouter:
+    """DATABASE_ROUTERS : écritures sur "default", lectures sur un réplica quand la requête le permet."""
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.replica_reads:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        healthy = [alias for alias in replica_aliases() if is_healthy(alias)]
+        return random.choice(healthy) if healthy else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+            state.replica_reads = False
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db.startswith(REPLICA_PREFIX):
+            return False
+        return None
+
+
+# ---- Middleware ----
+
+def request_identity(request, response=None):
+    """Utilisateur du JWT, sinon cookie de session (nouveau si la réponse en pose un), sinon IP."""
+    from .async_utils import validated_token
+
+    token = validated_token(request)
+    if token:
+        return f"u:{token.get(jwt_settings.USER_ID_CLAIM)}"
+    session_cookie = response.cookies.get(settings.SESSION_COOKIE_NAME) if response is not None else None
+    session_key = session_cookie.value if session_cookie else request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if session_key:
+        return f"s:{session_key}"
+    return f"ip:{request.META.get('REMOTE_ADDR', '')}"
+
+
+class ReplicaRoutingMiddleware:
+    """Active les lectures sur réplica pour la requête et pose la fenêtre "primaire" après une écriture."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = bool(replica_aliases())
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        safe = request.method in SAFE_METHODS
+        pinned = safe and cache.get(STICKY_KEY.format(identity=request_identity(request))) is not None
+        state = RoutingState(replica_reads=safe and not pinned)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote or not safe:
+            cache.set(STICKY_KEY.format(identity=request_identity(request, response)), 1, settings.REPLICA_STICKY_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        safe = request.method in SAFE_METHODS
+        pinned = safe and await cache.aget(STICKY_KEY.format(identity=request_identity(request))) is not None
+        state = RoutingState(replica_reads=safe and not pinned)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote or not safe:
+            await cache.aset(
+                STICKY_KEY.format(identity=request_identity(request, response)), 1, settings.REPLICA_STICKY_SECONDS
+            )
+        return response
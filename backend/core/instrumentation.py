@@ -0,0 +1,222 @@
+"""
+core/instrumentation.py - Mesures par requête (SQL, cache, sérialisation)
+=========================================================================
+
+MetricsMiddleware (en tête de MIDDLEWARE) mesure chaque requête :
+- requêtes SQL : nombre et durée (execute_wrapper posé sur chaque connexion)
+- cache Django : hits, misses et durée (CLIENT_CLASS InstrumentedRedisClient)
+- sérialisation DRF : durée de serializer.data
+- durée totale de la requête
+
+et les publie :
+- en-tête Server-Timing (onglet Réseau du navigateur), si SERVER_TIMING
+- une ligne de log JSON par requête (logger core.instrumentation, niveau INFO)
+- agrégats par route (nom d'URL, sinon motif) pour GET /metrics (core/metrics.py)
+
+Coût : quelques appels à perf_counter() par requête SQL ou accès au cache ;
+rien n'est mesuré hors requête HTTP (Celery, commandes).
+"""
+import json
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django_redis.client import DefaultClient
+from rest_framework.serializers import BaseSerializer
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestMetrics:
+    """Compteurs d'une requête ; mutable pour rester partagé avec les threads sync_to_async."""
+
+    __slots__ = (
+        "db_queries", "db_seconds", "cache_hits", "cache_misses", "cache_seconds",
+        "serialize_seconds", "serialize_depth",
+    )
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.serialize_depth = 0
+
+
+_current = ContextVar("request_metrics", default=None)
+
+
+# ---- SQL ----
+
+def _record_query(execute, sql, params, many, context):
+    request_metrics = _current.get()
+    if request_metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        request_metrics.db_queries += 1
+        request_metrics.db_seconds += time.perf_counter() - start
+
+
+def _install_query_wrapper(connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+# ---- Cache ----
+
+_MISSING = object()
+
+
+class InstrumentedRedisClient(DefaultClient):
+    """Client django-redis qui compte hits / misses de get() et get_many() pendant une requête."""
+
+    def get(self, key, default=None, version=None, client=None):
+        request_metrics = _current.get()
+        if request_metrics is None:
+            return super().get(key, default=default, version=version, client=client)
+        start = time.perf_counter()
+        value = super().get(key, default=_MISSING, version=version, client=client)
+        request_metrics.cache_seconds += time.perf_counter() - start
+        if value is _MISSING:
+            request_metrics.cache_misses += 1
+            return default
+        request_metrics.cache_hits += 1
+        return value
+
+    def get_many(self, keys, version=None, client=None):
+        request_metrics = _current.get()
+        if request_metrics is None:
+            return super().get_many(keys, version=version, client=client)
+        keys = list(keys)
+        start = time.perf_counter()
+        values = super().get_many(keys, version=version, client=client)
+        request_metrics.cache_seconds += time.perf_counter() - start
+        request_metrics.cache_hits += len(values)
+        request_metrics.cache_misses += len(keys) - len(values)
+        return values
+
+
+# ---- Sérialisation DRF ----
+
+def _instrument_serializers():
+    """Mesure BaseSerializer.data (Serializer et ListSerializer y passent via super().data)."""
+    data = BaseSerializer.data
+    if getattr(data.fget, "instrumented", False):
+        return
+    fget = data.fget
+
+    def timed_data(self):
+        request_metrics = _current.get()
+        if request_metrics is None:
+            return fget(self)
+        request_metrics.serialize_depth += 1
+        start = time.perf_counter()
+        try:
+            return fget(self)
+        finally:
+            request_metrics.serialize_depth -= 1
+            # .data imbriqués (SerializerMethodField...) : compté une seule fois
+            if not request_metrics.serialize_depth:
+                request_metrics.serialize_seconds += time.perf_counter() - start
+
+    timed_data.instrumented = True
+    BaseSerializer.data = property(timed_data, doc=data.__doc__)
+
+
+def install():
+    connection_created.connect(_install_query_wrapper, dispatch_uid="core.instrumentation")
+    for connection in connections.all(initialized_only=True):
+        _install_query_wrapper(connection)
+    _instrument_serializers()
+
+
+# ---- Middleware ----
+
+def route_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNMATCHED_ROUTE
+    return match.url_name or match.route or UNMATCHED_ROUTE
+
+
+def server_timing(request_metrics, duration):
+    return ", ".join([
+        f'db;dur={request_metrics.db_seconds * 1000:.1f};desc="queries={request_metrics.db_queries}"',
+        f'cache;dur={request_metrics.cache_seconds * 1000:.1f};'
+        f'desc="hits={request_metrics.cache_hits} misses={request_metrics.cache_misses}"',
+        f"serialize;dur={request_metrics.serialize_seconds * 1000:.1f}",
+        f"total;dur={duration * 1000:.1f}",
+    ])
+
+
+class MetricsMiddleware:
+    """Mesure la requête, ajoute Server-Timing, journalise et agrège par route."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        install()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request_metrics = RequestMetrics()
+        token = _current.set(request_metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        if self._finish(request, response, request_metrics, time.perf_counter() - start):
+            metrics.flush()
+        return response
+
+    async def __acall__(self, request):
+        request_metrics = RequestMetrics()
+        token = _current.set(request_metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        if self._finish(request, response, request_metrics, time.perf_counter() - start):
+            await sync_to_async(metrics.flush)()
+        return response
+
+    def _finish(self, request, response, request_metrics, duration):
+        """Server-Timing, ligne de log ; vrai si les agrégats sont à envoyer dans Redis."""
+        route = route_name(request)
+        if settings.SERVER_TIMING:
+            response["Server-Timing"] = server_timing(request_metrics, duration)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "route": route,
+                "status": response.status_code,
+                "duration_ms": round(duration * 1000, 1),
+                "db_queries": request_metrics.db_queries,
+                "db_ms": round(request_metrics.db_seconds * 1000, 1),
+                "cache_hits": request_metrics.cache_hits,
+                "cache_misses": request_metrics.cache_misses,
+                "cache_ms": round(request_metrics.cache_seconds * 1000, 1),
+                "serialize_ms": round(request_metrics.serialize_seconds * 1000, 1),
+            }))
+        return metrics.record(route, request.method, response.status_code, duration, request_metrics)
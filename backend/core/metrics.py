@@ -0,0 +1,215 @@
+"""
+core/metrics.py - Agrégats par route et endpoint Prometheus
+===========================================================
+
+Chaque processus cumule en mémoire les mesures de ses requêtes
+(core/instrumentation.py) et les ajoute dans Redis au plus toutes les
+METRICS_FLUSH_INTERVAL secondes (un pipeline) : GET /metrics voit ainsi
+tous les workers gunicorn, quel que soit celui qui répond.
+
+Redis :
+- metrics:routes        : SET des routes vues
+- metrics:route:<route> : HASH de compteurs (requests:<méthode>:<statut>,
+                          bucket:<borne>, duration_seconds, db_queries...)
+
+GET /metrics (format texte Prometheus), en plus des routes : retard de
+l'outbox (jobs/outbox.py), hits / misses du cache de liste (jobs/cache.py)
+et pools de connexions du processus qui répond (core/pools.py).
+Non exposé par nginx ; exige en plus "Authorization: Bearer <METRICS_TOKEN>". Sans
+METRICS_TOKEN, l'endpoint répond 404, sauf avec DEBUG (développement).
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+from .pools import pool_stats
+
+logger = logging.getLogger(__name__)
+
+ROUTES_KEY = "metrics:routes"
+ROUTE_KEY = "metrics:route:{route}"
+# Bornes (s) de l'histogramme des durées de requête
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+INF = "+Inf"
+# Compteurs par route : (champ du HASH, attribut de RequestMetrics, métrique Prometheus, aide)
+ROUTE_COUNTERS = (
+    ("db_queries", "db_queries", "jobpulse_db_queries_total", "Requêtes SQL"),
+    ("db_seconds", "db_seconds", "jobpulse_db_query_seconds_total", "Durée des requêtes SQL"),
+    ("cache_hits", "cache_hits", "jobpulse_cache_hits_total", "Lectures du cache trouvées"),
+    ("cache_misses", "cache_misses", "jobpulse_cache_misses_total", "Lectures du cache absentes"),
+    ("cache_seconds", "cache_seconds", "jobpulse_cache_seconds_total", "Durée des lectures du cache"),
+    ("serialize_seconds", "serialize_seconds", "jobpulse_serializer_seconds_total", "Durée de sérialisation DRF"),
+)
+
+
+class RouteAggregator:
+    """Compteurs en mémoire du processus, envoyés dans Redis par flush()."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = defaultdict(lambda: defaultdict(float))
+        self._flushed_at = time.monotonic()
+
+    def record(self, route, method, status, duration, request_metrics):
+        """Ajoute une requête ; vrai si un flush() est dû."""
+        bucket = next((str(bound) for bound in BUCKETS if duration <= bound), INF)
+        with self._lock:
+            counters = self._pending[route]
+            counters[f"requests:{method}:{status}"] += 1
+            counters[f"bucket:{bucket}"] += 1
+            counters["duration_seconds"] += duration
+            for field, attribute, _, _ in ROUTE_COUNTERS:
+                counters[field] += getattr(request_metrics, attribute)
+            return time.monotonic() - self._flushed_at >= settings.METRICS_FLUSH_INTERVAL
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(lambda: defaultdict(float))
+            self._flushed_at = time.monotonic()
+        if not pending:
+            return
+        try:
+            pipe = get_redis_connection("default").pipeline(transaction=False)
+            pipe.sadd(ROUTES_KEY, *pending)
+            for route, counters in pending.items():
+                key = ROUTE_KEY.format(route=route)
+                for field, value in counters.items():
+                    if field.endswith("_seconds"):
+                        pipe.hincrbyfloat(key, field, value)
+                    elif value:
+                        pipe.hincrby(key, field, int(value))
+            pipe.execute()
+        except RedisError:
+            # Mesures perdues pour cet intervalle : la mémoire reste bornée
+            logger.warning("metrics: Redis indisponible, %d routes non enregistrées", len(pending))
+
+
+_aggregator = RouteAggregator()
+record = _aggregator.record
+flush = _aggregator.flush
+
+
+# ---- Format Prometheus ----
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Exposition:
+    def __init__(self):
+        self.lines = []
+
+    def declare(self, name, kind, help_text):
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name, value, **labels):
+        label_text = ",".join(f'{key}="{_label(val)}"' for key, val in labels.items())
+        self.lines.append(f"{name}{{{label_text}}} {_number(value)}" if label_text else f"{name} {_number(value)}")
+
+    def render(self):
+        return "\n".join(self.lines) + "\n"
+
+
+def _route_samples(exposition):
+    redis = get_redis_connection("default")
+    routes = sorted(member.decode() for member in redis.smembers(ROUTES_KEY))
+    pipe = redis.pipeline(transaction=False)
+    for route in routes:
+        pipe.hgetall(ROUTE_KEY.format(route=route))
+    hashes = [
+        {field.decode(): float(value) for field, value in raw.items()}
+        for raw in pipe.execute()
+    ]
+
+    exposition.declare("jobpulse_http_requests_total", "counter", "Requêtes HTTP par route, méthode et statut")
+    for route, counters in zip(routes, hashes):
+        for field, value in sorted(counters.items()):
+            if field.startswith("requests:"):
+                _, method, status = field.split(":", 2)
+                exposition.sample("jobpulse_http_requests_total", value, route=route, method=method, status=status)
+
+    exposition.declare("jobpulse_http_request_duration_seconds", "histogram", "Durée des requêtes HTTP par route")
+    for route, counters in zip(routes, hashes):
+        cumulative = 0.0
+        for bound in [*map(str, BUCKETS), INF]:
+            cumulative += counters.get(f"bucket:{bound}", 0.0)
+            exposition.sample("jobpulse_http_request_duration_seconds_bucket", cumulative, route=route, le=bound)
+        exposition.sample("jobpulse_http_request_duration_seconds_sum", counters.get("duration_seconds", 0.0), route=route)
+        exposition.sample("jobpulse_http_request_duration_seconds_count", cumulative, route=route)
+
+    for field, _, name, help_text in ROUTE_COUNTERS:
+        exposition.declare(name, "counter", f"{help_text} par route")
+        for route, counters in zip(routes, hashes):
+            exposition.sample(name, counters.get(field, 0.0), route=route)
+
+
+def _outbox_samples(exposition):
+    from jobs.outbox import LAG_CACHE_KEY, outbox_lag
+
+    # Valeur posée par drain_outbox_task ; calculée (une requête) si absente
+    lag = cache.get(LAG_CACHE_KEY) or outbox_lag()
+    exposition.declare("jobpulse_outbox_pending", "gauge", "Événements de l'outbox non publiés")
+    exposition.sample("jobpulse_outbox_pending", lag["pending"])
+    exposition.declare("jobpulse_outbox_oldest_age_seconds", "gauge", "Âge du plus ancien événement non publié")
+    exposition.sample("jobpulse_outbox_oldest_age_seconds", lag["oldest_age_seconds"])
+    exposition.declare("jobpulse_outbox_failed", "gauge", "Événements de l'outbox abandonnés (sujet inconnu)")
+    exposition.sample("jobpulse_outbox_failed", lag.get("failed", 0))
+
+
+def _list_cache_samples(exposition):
+    from jobs.cache import cache_stats
+
+    stats = cache_stats()
+    exposition.declare("jobpulse_list_cache_requests_total", "counter", "Pages de GET /api/jobs/ servies depuis le cache ou calculées")
+    exposition.sample("jobpulse_list_cache_requests_total", stats["hits"], result="hit")
+    exposition.sample("jobpulse_list_cache_requests_total", stats["misses"], result="miss")
+
+
+POOL_GAUGES = {"size": "Connexions ouvertes", "idle": "Connexions inactives", "max_size": "Taille maximale"}
+
+
+def _pool_samples(exposition):
+    stats = pool_stats()
+    if not stats:
+        return
+    for field in next(iter(stats.values())):
+        gauge = field in POOL_GAUGES
+        name = f"jobpulse_pool_{field}" if gauge else f"jobpulse_pool_{field}_total"
+        help_text = POOL_GAUGES.get(field, field.replace("_", " "))
+        exposition.declare(name, "gauge" if gauge else "counter", f"{help_text} (pool du processus qui répond)")
+        for pool, values in stats.items():
+            exposition.sample(name, values[field], pool=pool)
+
+
+def metrics_view(request):
+    """GET /metrics : exposition Prometheus."""
+    token = settings.METRICS_TOKEN
+    if not token:
+        # Sans jeton configuré, l'endpoint n'existe qu'en développement
+        if not settings.DEBUG:
+            raise Http404
+    elif not constant_time_compare(request.META.get("HTTP_AUTHORIZATION", ""), f"Bearer {token}"):
+        return HttpResponseForbidden()
+    exposition = _Exposition()
+    flush()
+    for collect in (_route_samples, _outbox_samples, _list_cache_samples, _pool_samples):
+        try:
+            collect(exposition)
+        except Exception:
+            # Une source indisponible (Redis, PostgreSQL) n'empêche pas les autres
+            logger.exception("metrics: %s a échoué", collect.__name__)
+    return HttpResponse(exposition.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
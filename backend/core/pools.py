@@ -0,0 +1,203 @@
+"""
+core/pools.py - Pools de connexions (PostgreSQL, Redis) et leurs compteurs
+==========================================================================
+
+PostgreSQL : ENGINE "core.postgresql_pool" (core/postgresql_pool/base.py).
+Django "ferme" la connexion à la fin de chaque requête / tâche (CONN_MAX_AGE=0) :
+elle est rendue au pool du processus au lieu d'être fermée, et la requête
+suivante la reprend sans nouvelle connexion TCP, TLS et authentification.
+
+- taille bornée par processus (DB_POOL_SIZE selon PROCESS_TYPE : gunicorn / Celery)
+- au-delà, attente jusqu'à DB_POOL_TIMEOUT secondes, puis OperationalError
+- contrôle de santé (SELECT 1) d'une connexion inactive depuis plus de
+  DB_POOL_HEALTH_CHECK_IDLE secondes ; recyclage après DB_POOL_MAX_LIFETIME
+- une connexion rendue au milieu d'une transaction est annulée (ROLLBACK),
+  ou jetée si elle est inutilisable
+
+Redis : InstrumentedBlockingConnectionPool (CACHES["default"]) : pool bloquant
+borné (REDIS_POOL_SIZE), même comptage.
+
+Compteurs par pool, pour le processus courant : pool_stats().
+"""
+import logging
+import os
+import threading
+import time
+
+from redis import BlockingConnectionPool
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Aucune connexion libérée avant la fin du délai d'attente."""
+
+
+class PoolStats:
+    """Compteurs d'un pool : emprunts, attentes, délais dépassés..."""
+
+    FIELDS = ("checkouts", "waits", "timeouts", "created", "discarded", "health_check_failures")
+
+    def __init__(self):
+        for field in self.FIELDS:
+            setattr(self, field, 0)
+        self.wait_seconds = 0.0
+
+    def as_dict(self):
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        data["wait_seconds"] = round(self.wait_seconds, 3)
+        return data
+
+
+_pools = {}
+
+
+def register(name, pool):
+    _pools[name] = pool
+    return pool
+
+
+def pool_stats():
+    """{nom du pool: compteurs + connexions ouvertes / inactives} pour ce processus."""
+    return {name: pool.snapshot() for name, pool in sorted(_pools.items())}
+
+
+class ConnectionPool:
+    """
+    Pool borné et thread-safe de connexions DB-API. Les connexions sont créées
+    à la demande par connect() (passé à checkout), réutilisées en LIFO.
+    """
+
+    def __init__(self, name, max_size, timeout, max_lifetime, health_check_idle, check):
+        self.name = name
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_idle = health_check_idle
+        self.check = check
+        self.pid = os.getpid()
+        self.stats = PoolStats()
+        self._idle = []  # (connexion, rendue à)
+        self._created = {}  # id(connexion) → créée à
+        self._size = 0
+        self._cond = threading.Condition()
+
+    def checkout(self, connect):
+        """Connexion du pool (contrôlée si besoin) ou nouvelle connexion ; PoolTimeout si le pool reste plein."""
+        start = time.monotonic()
+        with self._cond:
+            self.stats.checkouts += 1
+        while True:
+            entry = self._acquire(start)
+            if entry is None:
+                return self._create(connect)
+            connection, released_at = entry
+            if self._usable(connection, released_at):
+                return connection
+            self._discard(connection)
+
+    def release(self, connection, reusable=True):
+        created_at = self._created.get(id(connection))
+        if not reusable or created_at is None or time.monotonic() - created_at > self.max_lifetime:
+            self._discard(connection)
+            return
+        with self._cond:
+            self._idle.append((connection, time.monotonic()))
+            self._cond.notify()
+
+    def snapshot(self):
+        with self._cond:
+            return {**self.stats.as_dict(), "size": self._size, "idle": len(self._idle), "max_size": self.max_size}
+
+    def _acquire(self, start):
+        """Entrée inactive, ou None si une place est réservée pour une nouvelle connexion."""
+        with self._cond:
+            waited = False
+            while not self._idle and self._size >= self.max_size:
+                remaining = self.timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    self.stats.timeouts += 1
+                    self.stats.wait_seconds += time.monotonic() - start
+                    logger.warning("pool %s : aucune connexion libre après %.1f s", self.name, self.timeout)
+                    raise PoolTimeout(f"pool {self.name} : aucune connexion libre après {self.timeout} s")
+                if not waited:
+                    self.stats.waits += 1
+                    waited = True
+                self._cond.wait(remaining)
+            if waited:
+                self.stats.wait_seconds += time.monotonic() - start
+            if self._idle:
+                return self._idle.pop()
+            self._size += 1
+            return None
+
+    def _create(self, connect):
+        try:
+            connection = connect()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created[id(connection)] = time.monotonic()
+            self.stats.created += 1
+        return connection
+
+    def _usable(self, connection, released_at):
+        if getattr(connection, "closed", False):
+            return False
+        if time.monotonic() - released_at < self.health_check_idle:
+            return True
+        if self.check(connection):
+            return True
+        with self._cond:
+            self.stats.health_check_failures += 1
+        return False
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._created.pop(id(connection), None)
+            self._size -= 1
+            self.stats.discarded += 1
+            self._cond.notify()
+
+
+class InstrumentedBlockingConnectionPool(BlockingConnectionPool):
+    """BlockingConnectionPool de redis-py avec les compteurs de PoolStats (CONNECTION_POOL_CLASS de django-redis)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        register(f"redis:{self.connection_kwargs.get('host', '')}/{self.connection_kwargs.get('db', 0)}", self)
+
+    def get_connection(self, command_name=None, *keys, **options):
+        self.stats.checkouts += 1
+        # File vide : toutes les connexions (max_connections) sont empruntées
+        waited = self.pool.empty()
+        start = time.monotonic()
+        if waited:
+            self.stats.waits += 1
+        try:
+            connection = super().get_connection(command_name, *keys, **options)
+        except RedisConnectionError:
+            if waited and time.monotonic() - start >= self.timeout:
+                self.stats.timeouts += 1
+            raise
+        finally:
+            if waited:
+                self.stats.wait_seconds += time.monotonic() - start
+        return connection
+
+    def make_connection(self):
+        self.stats.created += 1
+        return super().make_connection()
+
+    def snapshot(self):
+        idle = sum(1 for connection in list(self.pool.queue) if connection is not None)
+        return {**self.stats.as_dict(), "size": len(self._connections), "idle": idle, "max_size": self.max_connections}
@@ -0,0 +1,84 @@
+"""
+core/postgresql_pool/base.py - Backend PostgreSQL avec pool de connexions
+=========================================================================
+
+ENGINE "core.postgresql_pool" : le backend postgresql de Django, dont les
+connexions sont empruntées au pool du processus (core/pools.py) et lui sont
+rendues au close() au lieu d'être fermées. Paramètres dans DATABASES[alias]["POOL"].
+"""
+import os
+import threading
+
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from core.pools import ConnectionPool, PoolTimeout, register
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _check(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        return True
+    except base.Database.Error:
+        return False
+
+
+def get_pool(alias, settings_dict):
+    pool = _pools.get(alias)
+    # Après un fork (workers Celery prefork) : pool neuf, les sockets du parent ne sont pas partagés
+    if pool is None or pool.pid != os.getpid():
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None or pool.pid != os.getpid():
+                options = settings_dict.get("POOL", {})
+                pool = _pools[alias] = register(f"db:{alias}", ConnectionPool(
+                    name=f"db:{alias}",
+                    max_size=options.get("MAX_SIZE", 4),
+                    timeout=options.get("TIMEOUT", 10),
+                    max_lifetime=options.get("MAX_LIFETIME", 1800),
+                    health_check_idle=options.get("HEALTH_CHECK_IDLE", 30),
+                    check=_check,
+                ))
+    return pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        pool = get_pool(self.alias, self.settings_dict)
+        created = []
+
+        def connect():
+            created.append(True)
+            return super(DatabaseWrapper, self).get_new_connection(conn_params)
+
+        try:
+            connection = pool.checkout(connect)
+        except PoolTimeout as exc:
+            raise self.Database.OperationalError(str(exc)) from exc
+        if not created:
+            # Fixé par get_new_connection() pour une connexion neuve
+            self.isolation_level = IsolationLevel(
+                self.settings_dict["OPTIONS"].get("isolation_level", IsolationLevel.READ_COMMITTED)
+            )
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        get_pool(self.alias, self.settings_dict).release(self.connection, reusable=self._reset_for_pool())
+
+    def _reset_for_pool(self):
+        """Connexion réutilisable : ouverte, hors transaction (ROLLBACK si besoin)."""
+        connection = self.connection
+        if connection.closed:
+            return False
+        try:
+            if connection.info.transaction_status != base.Database.extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except base.Database.Error:
+            return False
+        return connection.info.transaction_status == base.Database.extensions.TRANSACTION_STATUS_IDLE
@@ -23,6 +23,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",  # SearchVector, index GIN, pg_trgm
     # Third party
     "rest_framework",  # Django REST Framework
     "django_filters",  # Filtres pour l'API
@@ -32,7 +33,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Mesures par requête : Server-Timing, log JSON, agrégats de GET /metrics (core/instrumentation.py)
+    "core.instrumentation.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    # Lectures des requêtes GET sur les réplicas (DATABASE_REPLICA_HOSTS)
+    "core.db_router.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -60,6 +65,31 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "core.wsgi.application"
+ASGI_APPLICATION = "core.asgi.application"
+
+# Mode de service (gunicorn.conf.py) : "wsgi" (workers sync) ou "asgi" (workers uvicorn).
+# En ASGI, les lectures fréquentes passent par des vues async (jobs/async_views.py).
+SERVER_MODE = os.environ.get("SERVER_MODE", "wsgi")
+ASYNC_READ_VIEWS = SERVER_MODE == "asgi"
+
+# ---- POOLS DE CONNEXIONS (core/pools.py) ----
+# Tailles par processus selon son type : "web" (gunicorn) ou "worker" (Celery, PROCESS_TYPE=worker
+# dans docker-compose.yml). Un worker gunicorn sync ne traite qu'une requête à la fois ; un worker
+# uvicorn en traite plusieurs (threads sync_to_async) ; un processus Celery prefork, une tâche.
+PROCESS_TYPE = os.environ.get("PROCESS_TYPE", "web")
+_POOL_DEFAULTS = {
+    # (PostgreSQL, Redis)
+    "web": (10, 50) if SERVER_MODE == "asgi" else (2, 10),
+    "worker": (2, 10),
+}
+_db_pool_default, _redis_pool_default = _POOL_DEFAULTS.get(PROCESS_TYPE, _POOL_DEFAULTS["web"])
+DB_POOL_SIZE = int(os.environ.get(f"DB_POOL_SIZE_{PROCESS_TYPE.upper()}", _db_pool_default))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "10"))
+DB_POOL_MAX_LIFETIME = int(os.environ.get("DB_POOL_MAX_LIFETIME", "1800"))
+DB_POOL_HEALTH_CHECK_IDLE = int(os.environ.get("DB_POOL_HEALTH_CHECK_IDLE", "30"))
+REDIS_POOL_SIZE = int(os.environ.get(f"REDIS_POOL_SIZE_{PROCESS_TYPE.upper()}", _redis_pool_default))
+REDIS_POOL_TIMEOUT = float(os.environ.get("REDIS_POOL_TIMEOUT", "5"))
+REDIS_HEALTH_CHECK_INTERVAL = 30
 
 # ---- BASE DE DONNÉES PostgreSQL ----
 # On parse DATABASE_URL ou on utilise une config par défaut pour le dev local
@@ -67,15 +97,42 @@ _db_url = os.environ.get("DATABASE_URL", "postgres://jobpulse:jobpulse_secret@lo
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        # Backend postgresql de Django + pool de connexions par processus
+        "ENGINE": "core.postgresql_pool",
         "NAME": os.environ.get("POSTGRES_DB", "jobpulse"),
         "USER": os.environ.get("POSTGRES_USER", "jobpulse"),
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD", "jobpulse_secret"),
         "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
         "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+        # Fermée à chaque fin de requête / tâche = rendue au pool
+        "CONN_MAX_AGE": 0,
+        "POOL": {
+            "MAX_SIZE": DB_POOL_SIZE,
+            "TIMEOUT": DB_POOL_TIMEOUT,
+            "MAX_LIFETIME": DB_POOL_MAX_LIFETIME,
+            "HEALTH_CHECK_IDLE": DB_POOL_HEALTH_CHECK_IDLE,
+        },
     }
 }
 
+# ---- RÉPLICAS EN LECTURE (core/db_router.py) ----
+# "hôte[:port],hôte[:port]" : mêmes base et identifiants que default, alias replica_1, replica_2...
+DATABASE_REPLICA_HOSTS = [host.strip() for host in os.environ.get("DATABASE_REPLICA_HOSTS", "").split(",") if host.strip()]
+for _index, _replica in enumerate(DATABASE_REPLICA_HOSTS, start=1):
+    _host, _, _port = _replica.partition(":")
+    DATABASES[f"replica_{_index}"] = {
+        **DATABASES["default"],
+        "HOST": _host,
+        "PORT": _port or DATABASES["default"]["PORT"],
+        # Tests : les réplicas pointent sur la base de test de default
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+# Après une écriture, les lectures du même utilisateur restent sur default (lecture de ses écritures)
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", "5"))
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_HEALTH_CHECK_INTERVAL = float(os.environ.get("REPLICA_HEALTH_CHECK_INTERVAL", "10"))
+
 # ---- REDIS : Cache + Broker Celery ----
 REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
 CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/1")
@@ -86,7 +143,17 @@ CACHES = {
         "BACKEND": "django_redis.cache.RedisCache",
         "LOCATION": REDIS_URL,
         "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            # DefaultClient qui compte hits / misses par requête (core/instrumentation.py)
+            "CLIENT_CLASS": "core.instrumentation.InstrumentedRedisClient",
+            # Pool bloquant borné et instrumenté (core/pools.py), partagé avec get_redis_connection()
+            "CONNECTION_POOL_CLASS": "core.pools.InstrumentedBlockingConnectionPool",
+            "CONNECTION_POOL_KWARGS": {
+                "max_connections": REDIS_POOL_SIZE,
+                "timeout": REDIS_POOL_TIMEOUT,
+                "health_check_interval": REDIS_HEALTH_CHECK_INTERVAL,
+                "socket_connect_timeout": 2,
+                "socket_timeout": 5,
+            },
         },
     }
 }
@@ -94,9 +161,62 @@ CACHES = {
 # ---- CELERY ----
 # Configuration détaillée dans core/celery.py
 CELERY_RESULT_BACKEND = REDIS_URL
+# Connexions au broker et au backend de résultats : bornées, contrôlées périodiquement
+CELERY_BROKER_POOL_LIMIT = int(os.environ.get("CELERY_BROKER_POOL_LIMIT", "10"))
+CELERY_BROKER_TRANSPORT_OPTIONS = {"health_check_interval": REDIS_HEALTH_CHECK_INTERVAL, "socket_keepalive": True}
+CELERY_REDIS_MAX_CONNECTIONS = REDIS_POOL_SIZE
+CELERY_REDIS_BACKEND_HEALTH_CHECK_INTERVAL = REDIS_HEALTH_CHECK_INTERVAL
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 
+# Celery beat : `celery -A core beat` (service "beat" dans docker-compose.yml)
+CELERY_BEAT_SCHEDULE = {
+    # Outbox transactionnelle (jobs/outbox.py) : publication des événements en attente
+    "drain-outbox": {"task": "jobs.tasks.drain_outbox_task", "schedule": 2.0},
+    "purge-outbox": {"task": "jobs.tasks.purge_outbox_task", "schedule": 60 * 60 * 24},
+    # Index TF-IDF des recommandations (jobs/recommend.py) : nouvelles offres, puis reconstruction nocturne
+    "update-recommend-index": {"task": "jobs.tasks.update_recommend_index_task", "schedule": 60.0},
+    "rebuild-recommend-index": {"task": "jobs.tasks.rebuild_recommend_index_task", "schedule": 60 * 60 * 24},
+    # Exports asynchrones de candidatures (jobs/exports.py) conservés 24 h
+    "purge-exports": {"task": "jobs.tasks.purge_exports_task", "schedule": 60 * 60},
+}
+
+# Notifications sur une queue dédiée, consommée par le service "notifications_worker"
+# (`celery -A core worker -Q notifications -c N`) : elles n'occupent pas les autres workers
+CELERY_TASK_ROUTES = {
+    "jobs.tasks.send_job_notification_task": {"queue": "notifications"},
+    "jobs.tasks.send_job_batch_notification_task": {"queue": "notifications"},
+    "jobs.tasks.flush_notifications_task": {"queue": "notifications"},
+    "jobs.tasks.notify_matching_candidates_task": {"queue": "notifications"},
+    # Extraction du texte des CV (jobs/cv.py) : worker "cv_worker", concurrence bornée
+    "jobs.tasks.extract_cv_task": {"queue": "cv"},
+}
+# Limites de temps par CV (secondes) : douce (abandon propre) puis dure (process tué)
+CV_EXTRACTION_SOFT_TIME_LIMIT = int(os.environ.get("CV_EXTRACTION_SOFT_TIME_LIMIT", "30"))
+CV_EXTRACTION_TIME_LIMIT = CV_EXTRACTION_SOFT_TIME_LIMIT + 15
+
+# ---- EMAIL (notifications, jobs/notifications.py) ----
+# Serveur SMTP local pour les tests : `python -m aiosmtpd -n -l localhost:1025` (ou mailpit)
+EMAIL_BACKEND = os.environ.get("EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend")
+EMAIL_HOST = os.environ.get("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.environ.get("EMAIL_PORT", "1025"))
+EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.environ.get("EMAIL_USE_TLS", "0") == "1"
+EMAIL_TIMEOUT = 10
+DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "JobPulse <noreply@jobpulse.local>")
+# Destinataires des notifications de nouvelles offres (séparés par des virgules)
+JOB_NOTIFICATION_RECIPIENTS = [
+    address.strip()
+    for address in os.environ.get("JOB_NOTIFICATION_RECIPIENTS", "alerts@jobpulse.local").split(",")
+    if address.strip()
+]
+# Fenêtre de regroupement (secondes) et nombre max de messages par paquet SMTP
+NOTIFICATION_BATCH_WINDOW = float(os.environ.get("NOTIFICATION_BATCH_WINDOW", "2"))
+NOTIFICATION_BATCH_SIZE = int(os.environ.get("NOTIFICATION_BATCH_SIZE", "100"))
+# Nombre minimum de compétences en commun pour notifier un candidat d'une nouvelle offre (jobs/skills.py)
+JOBS_MATCH_MIN_SKILLS = int(os.environ.get("JOBS_MATCH_MIN_SKILLS", "1"))
+
 # ---- DOCUMENTATION API (drf-spectacular) ----
 SPECTACULAR_SETTINGS = {
     "TITLE": "JobPulse API",
@@ -119,10 +239,12 @@ SPECTACULAR_SETTINGS = {
 
 # ---- DJANGO REST FRAMEWORK ----
 REST_FRAMEWORK = {
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    # count estimé par le planner au-delà de JOBS_EXACT_COUNT_THRESHOLD lignes (jobs/pagination.py)
+    "DEFAULT_PAGINATION_CLASS": "jobs.pagination.EstimatedCountPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # Rôle lu dans les claims du jeton, sans requête sur User (core/auth.py)
+        "core.auth.ClaimsJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",  # Pour l'admin DRF
     ],
     "DEFAULT_PERMISSION_CLASSES": [
@@ -134,8 +256,34 @@ REST_FRAMEWORK = {
         "rest_framework.filters.OrderingFilter",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Seaux à jetons Redis (core/throttling.py) : "N/période" = rafale de N, puis N par période
+    "DEFAULT_THROTTLE_RATES": {
+        "login": os.environ.get("THROTTLE_RATE_LOGIN", "20/min"),  # par IP
+        "login_username": os.environ.get("THROTTLE_RATE_LOGIN_USERNAME", "5/min"),  # par compte visé
+        "register": os.environ.get("THROTTLE_RATE_REGISTER", "10/hour"),  # par IP
+        "apply": os.environ.get("THROTTLE_RATE_APPLY", "30/hour"),  # par utilisateur
+    },
+    # Proxys de confiance devant Django : 0 = REMOTE_ADDR (X-Forwarded-For ignoré, falsifiable
+    # par le client) ; 1 derrière nginx (docker-compose.yml) = dernière adresse ajoutée par nginx
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", "0")),
+}
+
+# Jetons d'accès avec username, role, is_candidate, is_recruiter, is_staff (recalculés au rafraîchissement)
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": "core.auth.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "core.auth.RoleTokenRefreshSerializer",
 }
 
+# Seuil (lignes estimées) au-delà duquel le count paginé n'est plus exact
+JOBS_EXACT_COUNT_THRESHOLD = int(os.environ.get("JOBS_EXACT_COUNT_THRESHOLD", "10000"))
+
+# Import en masse POST /api/jobs/import/ (jobs/importers.py)
+JOBS_IMPORT_BATCH_SIZE = int(os.environ.get("JOBS_IMPORT_BATCH_SIZE", "500"))
+JOBS_IMPORT_MAX_BATCH_SIZE = 5000
+
+# Index TF-IDF de GET /api/jobs/recommended/ (jobs/recommend.py), partagé par l'API et les workers
+RECOMMEND_INDEX_DIR = os.environ.get("RECOMMEND_INDEX_DIR", str(BASE_DIR / "var" / "recommend"))
+
 # ---- Internationalisation ----
 LANGUAGE_CODE = "fr-fr"
 TIME_ZONE = "Europe/Paris"
@@ -149,4 +297,36 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# ---- CV : upload et téléchargement protégé (jobs/uploads.py, jobs/protected_media.py) ----
+# Uploads écrits sur disque par morceaux, refusés au-delà de la taille max ou si le format ne correspond pas
+FILE_UPLOAD_HANDLERS = ["jobs.uploads.CVUploadHandler"]
+CV_MAX_UPLOAD_SIZE = int(os.environ.get("CV_MAX_UPLOAD_SIZE", str(5 * 1024 * 1024)))
+# Fenêtre (secondes) du lien signé cv_url : renouvelé à chaque fenêtre, accepté pendant deux
+CV_URL_MAX_AGE = 60 * 10
+# 1 derrière nginx : le fichier est envoyé par nginx (X-Accel-Redirect vers PROTECTED_MEDIA_URL)
+USE_X_ACCEL_REDIRECT = os.environ.get("USE_X_ACCEL_REDIRECT", "0") == "1"
+PROTECTED_MEDIA_URL = "/protected-media/"
+
+# ---- Mesures par requête et GET /metrics (core/instrumentation.py, core/metrics.py) ----
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "1") == "1"
+# Agrégats par route envoyés dans Redis au plus toutes les N secondes par processus
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", "5"))
+# GET /metrics exige "Authorization: Bearer <METRICS_TOKEN>" ; sans jeton, l'endpoint
+# répond 404 (accès libre seulement avec DEBUG)
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Une ligne JSON par requête (logger core.instrumentation) ; REQUEST_LOG_LEVEL=WARNING pour les couper
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "core.instrumentation": {
+            "handlers": ["console"],
+            "level": os.environ.get("REQUEST_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -0,0 +1,125 @@
+"""
+core/throttling.py - Limitation de débit par seau à jetons (Redis)
+==================================================================
+
+Throttles DRF des points d'entrée coûteux ou sensibles aux rafales :
+- POST /api/auth/login/     : par IP (scope "login") et par nom d'utilisateur
+                              visé (scope "login_username") : le hachage du mot de
+                              passe ne tourne plus pour une rafale de tentatives
+- POST /api/auth/register/  : par IP (scope "register")
+- POST /api/applications/   : par utilisateur (scope "apply")
+
+Taux "N/période" dans REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] (core/settings.py) :
+seau de N jetons, rechargé en continu (N jetons par période). Une rafale de N
+requêtes passe, puis une requête toutes les période/N secondes.
+
+Chaque contrôle = un seul aller-retour Redis : script Lua (EVALSHA) qui
+recharge, consomme et renvoie l'attente avant le prochain jeton. État dans le
+hash "throttle:<scope>:<identité>" (tokens, ts), expirant quand le seau est
+plein. Requête refusée : 429 avec Retry-After (secondes, arrondi au supérieur
+par DRF). Redis indisponible : la requête passe (journalisé).
+"""
+import hashlib
+import logging
+import time
+
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+from rest_framework.throttling import SimpleRateThrottle
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] : seau ; ARGV : capacité, jetons par seconde, maintenant (s)
+# Retour : {1 si autorisé sinon 0, attente avant le prochain jeton (s, chaîne)}
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "ts", tostring(now))
+redis.call("EXPIRE", KEYS[1], math.ceil((capacity - tokens) / rate) + 1)
+return {allowed, tostring(wait)}
+"""
+
+_script = None
+
+
+def _token_bucket(redis):
+    global _script
+    if _script is None:
+        _script = redis.register_script(TOKEN_BUCKET_LUA)
+    return _script
+
+
+def take_token(key, capacity, duration, now=None, redis=None):
+    """(autorisé, attente en secondes avant le prochain jeton) pour le seau key."""
+    redis = redis if redis is not None else get_redis_connection("default")
+    now = time.time() if now is None else now
+    allowed, wait = _token_bucket(redis)(keys=[key], args=[capacity, capacity / duration, now], client=redis)
+    return bool(allowed), float(wait)
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """SimpleRateThrottle (taux, scope, identité) dont l'historique est remplacé par le seau Redis."""
+
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        try:
+            allowed, self.retry_after = take_token(self.key, self.num_requests, self.duration, self.timer())
+        except RedisError:
+            logger.warning("throttling: Redis indisponible, %s non limité", self.key)
+            return True
+        return allowed
+
+    def wait(self):
+        return self.retry_after
+
+
+class LoginRateThrottle(TokenBucketThrottle):
+    scope = "login"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class LoginUsernameRateThrottle(TokenBucketThrottle):
+    """Tentatives sur un même compte, quelle que soit l'IP (attaque distribuée)."""
+
+    scope = "login_username"
+
+    def get_cache_key(self, request, view):
+        username = request.data.get("username") if hasattr(request.data, "get") else None
+        if not username or not isinstance(username, str):
+            return None
+        ident = hashlib.sha256(username.strip().lower().encode()).hexdigest()[:32]
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class RegisterRateThrottle(LoginRateThrottle):
+    scope = "register"
+
+
+class ApplyRateThrottle(TokenBucketThrottle):
+    scope = "apply"
+
+    def get_cache_key(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": request.user.pk}
@@ -11,13 +11,22 @@ from rest_framework.permissions import AllowAny
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
-from .views import RegisterView, MeView
+from .metrics import metrics_view
+from .throttling import LoginRateThrottle, LoginUsernameRateThrottle
+from .views import RegisterView, MeView, me
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    # Prometheus : scrapé directement sur backend:8000 (bloqué par nginx)
+    path("metrics", metrics_view, name="metrics"),
     path("api/auth/register/", RegisterView.as_view(), name="register"),
-    path("api/auth/login/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("api/auth/me/", MeView.as_view(), name="me"),
+    path(
+        "api/auth/login/",
+        TokenObtainPairView.as_view(throttle_classes=[LoginRateThrottle, LoginUsernameRateThrottle]),
+        name="token_obtain_pair",
+    ),
+    # Vue async en mode ASGI (jobs/async_views.py)
+    path("api/auth/me/", me if settings.ASYNC_READ_VIEWS else MeView.as_view(), name="me"),
     path("api/auth/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("api/", include("jobs.urls")),  # Toutes les routes API sont sous /api/
     # Documentation API Swagger / OpenAPI (accès public)
@@ -1,28 +1,43 @@
 """
 core/views.py - Vues d'authentification
+
+me : variante async de MeView, routée en mode ASGI (voir jobs/async_views.py)
 """
 from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+
+from .async_utils import fast_read, json_response, validated_token
+from .auth import auser_state, check_token, token_user_id, user_state
+from .throttling import RegisterRateThrottle
 
 User = get_user_model()
 
 
-def get_user_profile_data(user):
-    """Retourne les données profil (role) pour un utilisateur."""
-    from jobs.models import UserProfile
-    profile, _ = UserProfile.objects.get_or_create(user=user, defaults={"role": "candidate"})
-    return {"role": profile.role, "is_candidate": profile.is_candidate(), "is_recruiter": profile.is_recruiter()}
+def me_data(user_id, state):
+    """Réponse de /api/auth/me/ depuis l'état en cache de l'utilisateur (core/auth.py)."""
+    return {
+        "id": user_id,
+        "username": state["username"],
+        "email": state["email"],
+        "role": state["role"],
+        "is_candidate": state["is_candidate"],
+        "is_recruiter": state["is_recruiter"],
+    }
 
 
 class RegisterView(APIView):
     """
     POST /api/auth/register/
     Crée un utilisateur avec rôle : candidate | recruiter | both
+    Limité par IP (scope "register", core/throttling.py).
     """
     permission_classes = [AllowAny]
+    throttle_classes = [RegisterRateThrottle]
 
     def post(self, request):
         username = request.data.get("username")
@@ -60,15 +75,25 @@ class RegisterView(APIView):
 class MeView(APIView):
     """
     GET /api/auth/me/
-    Retourne les infos de l'utilisateur connecté (username, role).
+    Retourne les infos de l'utilisateur connecté (username, role), sans
+    requête SQL tant que son état est en cache.
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        profile_data = get_user_profile_data(request.user)
-        return Response({
-            "id": request.user.id,
-            "username": request.user.username,
-            "email": request.user.email or "",
-            **profile_data,
-        })
+        return Response(me_data(request.user.pk, user_state(request.user.pk)))
+
+
+@fast_read(MeView.as_view())
+async def me(request):
+    """GET /api/auth/me/ en mode ASGI ; sans jeton, jeton périmé ou utilisateur inactif : MeView répond 401."""
+    token = validated_token(request)
+    if not token:
+        return None
+    try:
+        user_id = token_user_id(token)
+        state = await auser_state(user_id)
+        check_token(token, state)
+    except (KeyError, ValidationError, AuthenticationFailed):
+        return None
+    return json_response(me_data(user_id, state))
@@ -0,0 +1,30 @@
+"""
+gunicorn.conf.py - Configuration Gunicorn
+=========================================
+
+gunicorn -c gunicorn.conf.py ; le mode est choisi par SERVER_MODE (même variable
+que core/settings.py) :
+
+- wsgi (défaut) : workers sync, core.wsgi. Un worker par requête en cours :
+  un client lent ou une lecture Redis/PostgreSQL lente bloque tout le worker.
+- asgi : workers uvicorn, core.asgi. Les lectures fréquentes sont des vues async
+  (jobs/async_views.py) ; un worker sert de nombreuses connexions lentes.
+
+Comparaison des deux modes : python manage.py loadtest (jobs/management/commands/loadtest.py).
+"""
+import os
+
+server_mode = os.environ.get("SERVER_MODE", "wsgi")
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "2"))
+timeout = 120
+# Connexions HTTP keep-alive derrière nginx
+keepalive = 5
+
+if server_mode == "asgi":
+    wsgi_app = "core.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "core.wsgi:application"
+    worker_class = "sync"
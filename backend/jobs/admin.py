@@ -1,6 +1,6 @@
 """Admin Django pour les offres d'emploi et entreprises"""
 from django.contrib import admin
-from .models import JobOffer, Company, Application, CandidateProfile, UserProfile
+from .models import JobOffer, Company, Application, CandidateProfile, UserProfile, OutboxEvent, Skill
 
 
 @admin.register(UserProfile)
@@ -14,6 +14,12 @@ class CandidateProfileAdmin(admin.ModelAdmin):
     search_fields = ["user__username", "full_name", "skills"]
 
 
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ["name"]
+    search_fields = ["name"]
+
+
 @admin.register(Company)
 class CompanyAdmin(admin.ModelAdmin):
     list_display = ["name", "sector", "created_at"]
@@ -32,3 +38,10 @@ class ApplicationAdmin(admin.ModelAdmin):
     list_display = ["user", "job_offer", "status", "created_at"]
     list_filter = ["status"]
     search_fields = ["user__username", "job_offer__title", "message"]
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ["id", "topic", "created_at", "published_at", "attempts", "failed_at"]
+    list_filter = ["topic"]
+    readonly_fields = ["topic", "payload", "created_at", "published_at", "attempts", "failed_at"]
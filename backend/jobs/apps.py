@@ -14,6 +14,7 @@ class JobsConfig(AppConfig):
     def ready(self):
         """
         Appelé quand Django a chargé toutes les apps.
-        On importe les signals ici pour qu'ils soient enregistrés.
+        On importe les signals et les lookups ici pour qu'ils soient enregistrés.
         """
+        import jobs.lookups  # noqa: F401
         import jobs.signals  # noqa: F401
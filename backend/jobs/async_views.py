@@ -0,0 +1,86 @@
+"""
+jobs/async_views.py - Vues de lecture async (déploiement ASGI)
+==============================================================
+
+En mode ASGI (SERVER_MODE=asgi : core/asgi.py, workers uvicorn, voir
+gunicorn.conf.py), les lectures les plus fréquentes sont servies par des vues
+async : pendant qu'une requête attend Redis ou PostgreSQL, ou qu'un client
+lent reçoit sa réponse, le worker continue de servir les autres requêtes.
+
+- GET /api/jobs/          : page en cache (jobs/cache.py) lue avec cache.aget()
+- GET /api/jobs/{id}/     : validateurs (ETag / 304) et offre lus avec l'ORM async
+- GET /api/jobs/trending/ : trending.aget_trending_jobs() (redis.asyncio)
+- GET /api/auth/me/       : core/views.py
+
+Tout le reste est délégué à la vue DRF, exécutée dans un thread (sync_to_async) :
+écritures, MISS du cache de liste, API navigable (HTML), jeton JWT invalide
+(la vue DRF répond 401), offre inexistante (404)... Le corps JSON est produit
+par le JSONRenderer de DRF : mêmes réponses qu'en mode WSGI (core/async_utils.py).
+
+Les lectures publiques vérifient seulement la signature et l'expiration du jeton
+éventuel (pas de requête sur l'utilisateur).
+"""
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from core.async_utils import fast_read, json_response
+
+from .cache import BYPASS_HEADER, HITS_KEY, aincr, alist_cache_key, list_cache_params
+from .conditional import make_etag
+from .models import JobOffer
+from .serializers import JobOfferSerializer
+from .trending import aget_trending_jobs
+from .views import JOB_VALIDATOR_FIELDS, JobOfferViewSet, TrendingJobsView, job_validators
+
+job_list_fallback = JobOfferViewSet.as_view({"get": "list", "post": "create"}, basename="job", detail=False)
+job_detail_fallback = JobOfferViewSet.as_view(
+    {"get": "retrieve", "put": "update", "patch": "partial_update", "delete": "destroy"},
+    basename="job",
+    detail=True,
+)
+
+
+@fast_read(job_list_fallback)
+async def job_list(request):
+    if request.META.get(BYPASS_HEADER) == "1":
+        return None
+    key = await alist_cache_key(request, list_cache_params(JobOfferViewSet))
+    etag = make_etag(key)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    data = await cache.aget(key)
+    if data is None:
+        # MISS : la vue DRF calcule la page et la met en cache
+        return None
+    await aincr(HITS_KEY)
+    response = json_response(data)
+    response["X-Cache"] = "HIT"
+    response["ETag"] = etag
+    return response
+
+
+@fast_read(job_detail_fallback)
+async def job_detail(request, pk):
+    row = await JobOffer.objects.filter(pk=pk).values_list(*JOB_VALIDATOR_FIELDS).afirst()
+    validators = job_validators(pk, row)
+    if validators is None:
+        return None
+    etag, last_modified = validators
+    timestamp = int(last_modified.timestamp())
+    not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if not_modified is not None:
+        return not_modified
+    job = await JobOfferViewSet.queryset.filter(pk=pk).afirst()
+    if job is None:
+        return None
+    response = json_response(JobOfferSerializer(job, context={"request": request}).data)
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(timestamp)
+    return response
+
+
+@fast_read(TrendingJobsView.as_view())
+async def trending_jobs(request):
+    return json_response(await aget_trending_jobs(JobOfferSerializer))
@@ -0,0 +1,195 @@
+"""
+jobs/cache.py - Cache des résultats de GET /api/jobs/
+=====================================================
+
+L'essentiel du trafic de la liste des offres porte sur quelques combinaisons de
+filtres. On met en cache (django-redis, CACHES["default"]) la page sérialisée,
+sous une clé canonique construite à partir des paramètres utiles de la requête :
+
+    jobs:list:<génération>:<sha1(hôte, chemin, paramètres normalisés)>
+
+Invalidation par génération : tout save()/delete() d'une JobOffer ou d'une
+Company incrémente jobs:list:generation après commit (jobs/signals.py) : une
+lecture concurrente ne peut pas remettre en cache l'état d'avant l'écriture
+sous la nouvelle génération. Les anciennes clés
+ne sont plus jamais lues et expirent d'elles-mêmes (LIST_CACHE_TTL).
+
+Réplicas (core/db_router.py) : une page calculée sur un réplica dans les
+REPLICA_MAX_LAG_SECONDS qui suivent un bump peut ne pas voir l'écriture ; elle est
+renvoyée mais pas mise en cache (clé jobs:list:recent_bump), sinon elle resterait
+servie sous la nouvelle génération jusqu'à expiration.
+
+- En-tête de réponse X-Cache : HIT | MISS | BYPASS
+- En-tête de requête X-Cache-Bypass: 1 : ignore le cache (la réponse fraîche
+  remplace l'entrée en cache), pour le débogage
+- Compteurs jobs:list:hits / jobs:list:misses : voir cache_stats()
+
+Les facettes de GET /api/jobs/facets/ (jobs/facets.py) passent par le même
+mécanisme, avec les seuls paramètres de filtre (facet_cache_params).
+"""
+import hashlib
+import json
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from core.db_router import replica_reads
+
+GENERATION_KEY = "jobs:list:generation"
+RECENT_BUMP_KEY = "jobs:list:recent_bump"
+HITS_KEY = "jobs:list:hits"
+MISSES_KEY = "jobs:list:misses"
+LIST_CACHE_TTL = 60 * 10
+BYPASS_HEADER = "HTTP_X_CACHE_BYPASS"
+
+# Filtres insensibles à la casse : "Paris" et "paris" partagent la même entrée
+CASE_INSENSITIVE_PARAMS = {"location", "company", "location_similar", "company_similar", "search", "near"}
+PAGINATION_PARAMS = ["cursor", "page"]
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Clé perdue (éviction, flush) : repartir d'une valeur jamais utilisée
+        cache.add(GENERATION_KEY, int(time.time() * 1000), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    """Invalide d'un coup toutes les pages de liste en cache."""
+    # Présente tant qu'un réplica peut ne pas avoir rejoué l'écriture
+    cache.set(RECENT_BUMP_KEY, 1, max(1, math.ceil(settings.REPLICA_MAX_LAG_SECONDS)))
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        get_generation()
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def cache_stats():
+    """Compteurs hits / misses du cache de liste (depuis le dernier flush Redis)."""
+    values = cache.get_many([HITS_KEY, MISSES_KEY])
+    return {"hits": values.get(HITS_KEY, 0), "misses": values.get(MISSES_KEY, 0)}
+
+
+def normalize_params(query_params, allowed):
+    """
+    Paramètres utiles, triés, sans valeurs vides ; les paramètres inconnus
+    (ignorés par la vue) ne fragmentent pas le cache.
+    """
+    normalized = []
+    for name in sorted(allowed):
+        values = sorted(value.strip() for value in query_params.getlist(name) if value.strip())
+        if not values:
+            continue
+        if name in CASE_INSENSITIVE_PARAMS:
+            values = [value.lower() for value in values]
+        normalized.append([name, values])
+    return normalized
+
+
+def list_cache_params(view):
+    """Paramètres qui influencent la liste : filtres, ?search=, ?ordering=, pagination."""
+    params = [api_settings.SEARCH_PARAM, api_settings.ORDERING_PARAM, *PAGINATION_PARAMS]
+    if getattr(view, "filterset_class", None) is not None:
+        params += list(view.filterset_class.base_filters)
+    return params
+
+
+def facet_cache_params(view):
+    """Paramètres qui influencent les facettes : filtres et ?search= (ni tri, ni pagination)."""
+    params = [api_settings.SEARCH_PARAM]
+    if getattr(view, "filterset_class", None) is not None:
+        params += list(view.filterset_class.base_filters)
+    return params
+
+
+def _list_cache_key(request, allowed, generation):
+    # request.GET pour une HttpRequest Django (vues async, jobs/async_views.py)
+    query_params = getattr(request, "query_params", request.GET)
+    payload = json.dumps(
+        [request.get_host(), request.path, normalize_params(query_params, allowed)],
+        separators=(",", ":"),
+    )
+    digest = hashlib.sha1(payload.encode()).hexdigest()
+    return f"jobs:list:{generation}:{digest}"
+
+
+def list_cache_key(request, allowed):
+    """Clé canonique de la liste ; calculée une fois par requête (cache, ETag)."""
+    key = getattr(request, "_list_cache_key", None)
+    if key is None:
+        key = _list_cache_key(request, allowed, get_generation())
+        request._list_cache_key = key
+    return key
+
+
+# ---- Variantes async (API async du cache Django), pour jobs/async_views.py ----
+
+async def aget_generation():
+    generation = await cache.aget(GENERATION_KEY)
+    if generation is None:
+        await cache.aadd(GENERATION_KEY, int(time.time() * 1000), None)
+        generation = await cache.aget(GENERATION_KEY)
+    return generation
+
+
+async def alist_cache_key(request, allowed):
+    return _list_cache_key(request, allowed, await aget_generation())
+
+
+async def aincr(key):
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        if not await cache.aadd(key, 1, None):
+            await cache.aincr(key)
+
+
+class GenerationCachedListMixin:
+    """
+    Mixin de ViewSet : met en cache la réponse de list() (données sérialisées,
+    pagination comprise). Les paramètres pris en compte sont les filtres du
+    filterset_class, ?search=, ?ordering= et les paramètres de pagination.
+    """
+
+    list_cache_ttl = LIST_CACHE_TTL
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, list_cache_params(self), lambda: super(GenerationCachedListMixin, self).list(request, *args, **kwargs)
+        )
+
+    def cached_response(self, request, params, compute):
+        """Réponse de compute() (appelée en cas de MISS) mise en cache sous la clé des params."""
+        key = list_cache_key(request, params)
+        bypass = request.META.get(BYPASS_HEADER) == "1"
+
+        if not bypass:
+            data = cache.get(key)
+            if data is not None:
+                _incr(HITS_KEY)
+                return self._with_cache_header(Response(data), "HIT")
+            _incr(MISSES_KEY)
+
+        response = compute()
+        if response.status_code == 200 and not (replica_reads() and cache.get(RECENT_BUMP_KEY)):
+            cache.set(key, response.data, self.list_cache_ttl)
+        return self._with_cache_header(response, "BYPASS" if bypass else "MISS")
+
+    @staticmethod
+    def _with_cache_header(response, status):
+        response["X-Cache"] = status
+        return response
@@ -0,0 +1,90 @@
+"""
+jobs/conditional.py - Requêtes conditionnelles (ETag / Last-Modified)
+=====================================================================
+
+Le client Angular interroge en boucle /api/jobs/, /api/jobs/{id}/ et
+/api/profiles/me/. Les validateurs sont calculés AVANT la vue, sans sérialiser
+la réponse :
+
+- détail : une requête values_list() sur updated_at (offre + entreprise, profil...)
+- liste  : la clé du cache de liste (jobs/cache.py), qui contient la génération
+           incrémentée à chaque écriture sur JobOffer / Company
+
+Comportement (RFC 9110, via django.utils.cache.get_conditional_response) :
+- GET/HEAD + If-None-Match / If-Modified-Since à jour → 304 Not Modified
+- PUT/PATCH + If-Match périmé → 412 Precondition Failed (mise à jour perdue évitée)
+- la réponse porte l'ETag (et Last-Modified) à jour, y compris après PUT/PATCH
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cache import list_cache_key, list_cache_params
+
+
+def make_etag(*parts):
+    """ETag fort (entre guillemets) à partir de valeurs qui changent avec la ressource."""
+    source = ":".join("" if part is None else str(part) for part in parts)
+    return quote_etag(hashlib.md5(source.encode()).hexdigest())
+
+
+class ConditionalRequestMixin:
+    """
+    Mixin de vue : conditional_response() évalue les préconditions à partir de
+    get_validators() avant d'appeler la vue. Les vues définissent
+    get_object_validators(pk) et peuvent surcharger get_validators() pour des
+    actions supplémentaires.
+    """
+
+    def get_object_validators(self, pk):
+        """(etag, last_modified) de l'objet pk, ou None s'il n'existe pas."""
+        return None
+
+    def get_validators(self, request):
+        if self.action == "list":
+            return make_etag(list_cache_key(request, list_cache_params(self))), None
+        if self.action in ("retrieve", "update", "partial_update"):
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            try:
+                return self.get_object_validators(self.kwargs[lookup_url_kwarg])
+            except (ValueError, TypeError):
+                # Identifiant invalide : la vue répond 404 (get_object_or_404)
+                return None
+        return None
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        validators = self.get_validators(request)
+        if validators is None:
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = validators
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is not None:
+            return response
+
+        response = handler(request, *args, **kwargs)
+        if 200 <= response.status_code < 300:
+            if request.method not in ("GET", "HEAD"):
+                # La ressource vient de changer : validateurs recalculés pour le prochain If-Match
+                etag, last_modified = self.get_validators(request) or (None, None)
+                timestamp = int(last_modified.timestamp()) if last_modified else None
+            if etag:
+                response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
+
+
+class ConditionalModelViewSetMixin(ConditionalRequestMixin):
+    """Requêtes conditionnelles sur list, retrieve, update et partial_update d'un ModelViewSet."""
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().retrieve, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().update, *args, **kwargs)
@@ -0,0 +1,144 @@
+"""
+jobs/cv.py - Extraction du texte des CV (PDF / DOCX)
+====================================================
+
+ProfileViewSet.me enregistre le fichier et répond tout de suite : l'extraction
+se fait dans Celery (extract_cv_task), déclenchée après le COMMIT quand le
+fichier du CV change (jobs/signals.py).
+
+- empreinte SHA-256 du contenu : si elle n'a pas changé (même CV renvoyé),
+  aucune extraction n'est refaite
+- PDF via pypdf (import à la demande), DOCX lu directement (zip + XML)
+- texte tronqué à MAX_CV_TEXT_LENGTH, stocké dans cv_text et indexé dans
+  cv_search_vector (GIN) pour ?cv_search= dans les vues recruteur
+- la tâche tourne sur la queue "cv" (worker dédié, concurrence bornée) avec une
+  limite de temps par fichier ; un fichier illisible ou trop long à traiter est
+  enregistré avec un texte vide (pas de nouvel essai tant que le CV ne change pas)
+"""
+import hashlib
+import logging
+import zipfile
+from xml.etree import ElementTree
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db.models import Value
+
+from .models import CandidateProfile
+from .search import SEARCH_CONFIG
+
+logger = logging.getLogger(__name__)
+
+MAX_CV_TEXT_LENGTH = 200000
+MAX_PDF_PAGES = 50
+# Taille décompressée max de word/document.xml (protection contre les "zip bombs")
+MAX_DOCX_XML_SIZE = 20 * 1024 * 1024
+HASH_CHUNK_SIZE = 64 * 1024
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class CVExtractionError(Exception):
+    """Le fichier ne peut pas être lu (format non supporté, fichier corrompu...)."""
+
+
+def file_sha256(fieldfile):
+    digest = hashlib.sha256()
+    with fieldfile.open("rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extract_pdf(f):
+    try:
+        from pypdf import PdfReader
+    except ImportError as exc:
+        raise CVExtractionError("pypdf n'est pas installé") from exc
+    try:
+        reader = PdfReader(f)
+        parts, length = [], 0
+        for page in reader.pages[:MAX_PDF_PAGES]:
+            text = page.extract_text() or ""
+            parts.append(text)
+            length += len(text)
+            if length >= MAX_CV_TEXT_LENGTH:
+                break
+        return "\n".join(parts)
+    except Exception as exc:
+        raise CVExtractionError(f"PDF illisible : {exc}") from exc
+
+
+def extract_docx(f):
+    try:
+        with zipfile.ZipFile(f) as archive:
+            info = archive.getinfo("word/document.xml")
+            if info.file_size > MAX_DOCX_XML_SIZE:
+                raise CVExtractionError("document.xml trop volumineux")
+            root = ElementTree.fromstring(archive.read(info))
+    except (KeyError, zipfile.BadZipFile, ElementTree.ParseError) as exc:
+        raise CVExtractionError(f"DOCX illisible : {exc}") from exc
+    paragraphs = (
+        "".join(node.text or "" for node in paragraph.iter(f"{WORD_NS}t"))
+        for paragraph in root.iter(f"{WORD_NS}p")
+    )
+    return "\n".join(p for p in paragraphs if p)
+
+
+EXTRACTORS = {
+    "pdf": extract_pdf,
+    "docx": extract_docx,
+}
+
+
+def extract_text(fieldfile):
+    extension = fieldfile.name.rsplit(".", 1)[-1].lower() if "." in fieldfile.name else ""
+    extractor = EXTRACTORS.get(extension)
+    if extractor is None:
+        raise CVExtractionError(f"format non supporté : .{extension}")
+    with fieldfile.open("rb") as f:
+        text = extractor(f)
+    # Caractères NUL refusés par PostgreSQL dans un champ texte
+    return text.replace("\x00", " ")[:MAX_CV_TEXT_LENGTH]
+
+
+def _store(profile, cv_name, text, sha256):
+    """Enregistre le résultat si le CV n'a pas été remplacé entre-temps (UPDATE, sans signal)."""
+    return CandidateProfile.objects.filter(pk=profile.pk, cv=cv_name).update(
+        cv_text=text,
+        cv_sha256=sha256,
+        cv_search_vector=SearchVector(Value(text), config=SEARCH_CONFIG),
+    )
+
+
+def process_profile_cv(profile_id, timed_out=False):
+    """
+    Extrait et indexe le texte du CV du profil.
+    Retourne "empty", "unchanged", "extracted" ou "failed".
+    timed_out=True : la limite de temps a été atteinte, on enregistre un texte vide.
+    """
+    profile = CandidateProfile.objects.filter(pk=profile_id).only("id", "cv", "cv_sha256").first()
+    if profile is None:
+        return "empty"
+    if not profile.cv:
+        CandidateProfile.objects.filter(pk=profile_id).update(cv_text="", cv_sha256="", cv_search_vector=None)
+        return "empty"
+
+    cv_name = profile.cv.name
+    sha256 = file_sha256(profile.cv)
+    if sha256 == profile.cv_sha256:
+        return "unchanged"
+    if timed_out:
+        _store(profile, cv_name, "", sha256)
+        return "failed"
+    try:
+        text = extract_text(profile.cv)
+    except CVExtractionError as exc:
+        logger.warning("cv: extraction impossible pour le profil %s (%s)", profile_id, exc)
+        _store(profile, cv_name, "", sha256)
+        return "failed"
+    _store(profile, cv_name, text, sha256)
+    return "extracted"
+
+
+def cv_search_query(terms):
+    """Requête plein texte (syntaxe websearch) sur cv_search_vector."""
+    return SearchQuery(terms, search_type="websearch", config=SEARCH_CONFIG)
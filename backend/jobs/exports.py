@@ -0,0 +1,185 @@
+"""
+jobs/exports.py - Export des candidatures et des offres (CSV / NDJSON)
+======================================================================
+
+- GET  /api/applications/export/?output=csv|ndjson : réponse en streaming
+- POST /api/applications/export/async/             : fichier écrit dans
+  MEDIA_ROOT/exports/ par une tâche Celery, pour les très gros exports
+- GET  /api/jobs/export/?output=csv|ndjson         : offres, en streaming
+
+Candidatures : mêmes filtres que GET /api/applications/ (ApplicationFilter :
+job_offer, company, status, created_after, created_before) et mêmes droits (un
+utilisateur n'exporte que ses candidatures, le staff exporte tout).
+Offres : mêmes filtres que GET /api/jobs/ (JobOfferFilter), utilisateur authentifié.
+
+Mémoire constante : values_list() (pas d'instances de modèle) parcouru avec
+iterator(chunk_size=EXPORT_CHUNK_SIZE), qui utilise un curseur côté serveur
+PostgreSQL ; chaque ligne est encodée puis envoyée aussitôt.
+"""
+import csv
+import json
+import os
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .filters import ApplicationFilter, JobOfferFilter
+from .models import Application, JobOffer
+
+FORMAT_CSV = "csv"
+FORMAT_NDJSON = "ndjson"
+CONTENT_TYPES = {
+    FORMAT_CSV: "text/csv; charset=utf-8",
+    FORMAT_NDJSON: "application/x-ndjson",
+}
+EXPORT_CHUNK_SIZE = 2000
+EXPORTS_SUBDIR = "exports"
+EXPORTS_RETENTION = timedelta(days=1)
+TASK_OWNER_KEY = "export:task:{id}"
+
+# (colonne exportée, chemin values_list)
+APPLICATION_FIELDS = [
+    ("id", "id"),
+    ("created_at", "created_at"),
+    ("status", "status"),
+    ("job_offer_id", "job_offer_id"),
+    ("job_offer_title", "job_offer__title"),
+    ("company_name", "job_offer__company__name"),
+    ("user_username", "user__username"),
+    ("user_email", "user__email"),
+    ("message", "message"),
+    ("full_name", "user__candidate_profile__full_name"),
+    ("phone", "user__candidate_profile__phone"),
+    ("skills", "user__candidate_profile__skills"),
+    ("experience", "user__candidate_profile__experience"),
+    ("cover_letter", "user__candidate_profile__cover_letter"),
+    ("cv", "user__candidate_profile__cv"),
+]
+JOB_FIELDS = [
+    ("id", "id"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+    ("title", "title"),
+    ("company_id", "company_id"),
+    ("company_name", "company__name"),
+    ("location", "location"),
+    ("latitude", "latitude"),
+    ("longitude", "longitude"),
+    ("salary", "salary"),
+    ("description", "description"),
+]
+
+
+def header(fields):
+    return [name for name, _ in fields]
+
+
+def _values(queryset, fields):
+    return queryset.order_by("id").values_list(*[path for _, path in fields])
+
+
+def export_queryset(user, params):
+    """Candidatures visibles par user, filtrées comme la liste, triées par id (ordre stable)."""
+    queryset = Application.objects.all()
+    if not user.is_staff:
+        queryset = queryset.filter(user=user)
+    return _values(ApplicationFilter(params, queryset=queryset).qs, APPLICATION_FIELDS)
+
+
+def job_export_queryset(params):
+    """Offres filtrées comme GET /api/jobs/, triées par id."""
+    return _values(JobOfferFilter(params, queryset=JobOffer.objects.all()).qs, JOB_FIELDS)
+
+
+def _rows(queryset):
+    return queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+class _Echo:
+    """Pseudo-fichier pour csv.writer : write() renvoie la ligne au lieu de l'écrire."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(queryset, columns):
+    writer = csv.writer(_Echo())
+    yield "\ufeff"  # BOM : Excel détecte l'UTF-8
+    yield writer.writerow(columns)
+    for row in _rows(queryset):
+        yield writer.writerow(["" if value is None else value for value in row])
+
+
+def ndjson_lines(queryset, columns):
+    for row in _rows(queryset):
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+def render_lines(queryset, fmt, fields=APPLICATION_FIELDS):
+    columns = header(fields)
+    return csv_lines(queryset, columns) if fmt == FORMAT_CSV else ndjson_lines(queryset, columns)
+
+
+def filename(fmt, prefix="applications"):
+    return f"{prefix}-{timezone.now():%Y%m%d-%H%M%S}.{fmt}"
+
+
+def streaming_response(queryset, fmt, fields=APPLICATION_FIELDS, prefix="applications"):
+    response = StreamingHttpResponse(render_lines(queryset, fmt, fields), content_type=CONTENT_TYPES[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{filename(fmt, prefix)}"'
+    # Nginx transmet chaque morceau sans bufferiser la réponse
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+# ---- Export asynchrone (Celery) ----
+
+def exports_dir():
+    return Path(settings.MEDIA_ROOT) / EXPORTS_SUBDIR
+
+
+def write_export(queryset, fmt):
+    """Écrit l'export dans MEDIA_ROOT/exports/ (fichier temporaire puis renommage) ; retourne le nom."""
+    directory = exports_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    name = f"{uuid.uuid4().hex}.{fmt}"
+    tmp = directory / f".{name}.tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        f.writelines(render_lines(queryset, fmt))
+    os.replace(tmp, directory / name)
+    return name
+
+
+def register_task(task_id, user_id):
+    """Mémorise le propriétaire de l'export (seul lui peut suivre et télécharger le fichier)."""
+    cache.set(TASK_OWNER_KEY.format(id=task_id), user_id, int(EXPORTS_RETENTION.total_seconds()))
+
+
+def task_owner(task_id):
+    return cache.get(TASK_OWNER_KEY.format(id=task_id))
+
+
+def export_path(name):
+    """Chemin du fichier d'export, ou None s'il a été purgé."""
+    path = exports_dir() / Path(name).name
+    return path if path.is_file() else None
+
+
+def purge_exports():
+    """Supprime les exports plus anciens que EXPORTS_RETENTION."""
+    directory = exports_dir()
+    if not directory.exists():
+        return 0
+    limit = (timezone.now() - EXPORTS_RETENTION).timestamp()
+    deleted = 0
+    for entry in directory.iterdir():
+        if entry.is_file() and entry.stat().st_mtime < limit:
+            entry.unlink(missing_ok=True)
+            deleted += 1
+    return deleted
@@ -0,0 +1,72 @@
+"""
+jobs/facets.py - Facettes de GET /api/jobs/facets/
+==================================================
+
+Compteurs de la barre de filtres (par lieu, par entreprise, par tranche de
+salaire) pour la sélection courante de JobOfferFilter / ?search=, en UNE
+requête : la liste filtrée est compilée en sous-requête, puis agrégée avec
+GROUP BY GROUPING SETS ((lieu), (entreprise), (tranche), ()) ; GROUPING()
+distingue les lignes de chaque ensemble (et le total) des valeurs NULL.
+
+Le résultat est mis en cache par jeu de filtres normalisé, sous la génération
+de jobs/cache.py : il est invalidé par toute écriture sur JobOffer / Company.
+"""
+from django.db import connections
+from django.db.models import Case, F, IntegerField, Value, When
+
+# Bornes supérieures des tranches de salaire ; la dernière tranche est ouverte
+SALARY_BOUNDS = [30000, 40000, 50000, 60000, 80000]
+FACET_SIZE = 20
+
+
+def salary_bucket():
+    """Numéro de tranche (0 à len(SALARY_BOUNDS)), NULL si le salaire n'est pas renseigné."""
+    whens = [When(salary__lt=upper, then=Value(index)) for index, upper in enumerate(SALARY_BOUNDS)]
+    return Case(
+        *whens,
+        When(salary__isnull=False, then=Value(len(SALARY_BOUNDS))),
+        default=None,
+        output_field=IntegerField(),
+    )
+
+
+def salary_range(index):
+    return {
+        "min": SALARY_BOUNDS[index - 1] if index > 0 else 0,
+        "max": SALARY_BOUNDS[index] if index < len(SALARY_BOUNDS) else None,
+    }
+
+
+def compute_facets(queryset):
+    """{"total", "location": [...], "company": [...], "salary": [...]} pour le queryset filtré."""
+    filtered = (
+        queryset.order_by()
+        .annotate(facet_company=F("company__name"), facet_salary=salary_bucket())
+        .values_list("location", "facet_company", "facet_salary")
+    )
+    sql, params = filtered.query.sql_with_params()
+    facet_sql = (
+        "SELECT f.location, f.company, f.salary, "
+        "GROUPING(f.location), GROUPING(f.company), GROUPING(f.salary), COUNT(*) "
+        f"FROM ({sql}) AS f (location, company, salary) "
+        "GROUP BY GROUPING SETS ((f.location), (f.company), (f.salary), ())"
+    )
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(facet_sql, params)
+        rows = cursor.fetchall()
+
+    facets = {"total": 0, "location": [], "company": [], "salary": []}
+    for location, company, salary, g_location, g_company, g_salary, count in rows:
+        if g_location and g_company and g_salary:
+            facets["total"] = count
+        elif not g_location:
+            facets["location"].append({"value": location, "count": count})
+        elif not g_company:
+            facets["company"].append({"value": company, "count": count})
+        elif salary is not None:
+            facets["salary"].append({"value": salary, **salary_range(salary), "count": count})
+
+    for name in ("location", "company"):
+        facets[name] = sorted(facets[name], key=lambda item: (-item["count"], item["value"] or ""))[:FACET_SIZE]
+    facets["salary"].sort(key=lambda item: item["value"])
+    return facets
@@ -3,14 +3,21 @@ jobs/filters.py - Filtres pour l'API des offres d'emploi
 ========================================================
 
 Permet de filtrer et rechercher les offres via des paramètres GET :
-- location : contient (icontains)
-- company : contient (icontains)
+- location : contient (ILIKE, servi par l'index trigramme jobs_joboffer.location)
+- company : contient (ILIKE, servi par l'index trigramme jobs_company.name)
+- location_similar / company_similar : recherche approximative (fautes de frappe)
 - salary_min : salaire >= valeur
 - salary_max : salaire <= valeur
-- search : recherche dans title et description (icontains)
+- search : recherche plein texte (voir jobs/search.py)
+- near / radius_km : offres à moins de radius_km d'un lieu (voir jobs/geo.py)
+
+ApplicationFilter : filtres de GET /api/applications/ et de ses exports (jobs/exports.py)
 """
 import django_filters
-from .models import JobOffer
+from rest_framework.exceptions import ValidationError
+
+from . import geo
+from .models import Application, JobOffer
 
 
 class JobOfferFilter(django_filters.FilterSet):
@@ -21,13 +28,64 @@ class JobOfferFilter(django_filters.FilterSet):
     - ?salary_min=30000
     - ?salary_max=80000
     - ?search=python
+    - ?location_similar=Pari (trouve "Paris")
+    - ?near=Lyon&radius_km=50 (ou ?near=45.76,4.83)
+
+    Les filtres texte utilisent trgm_icontains (jobs/lookups.py) plutôt que
+    icontains pour que PostgreSQL passe par les index GIN pg_trgm.
+    Le mode approximatif utilise l'opérateur <% (word_similarity) de pg_trgm,
+    lui aussi servi par ces index.
     """
 
-    location = django_filters.CharFilter(lookup_expr="icontains", label="Lieu contient")
-    company = django_filters.CharFilter(field_name="company__name", lookup_expr="icontains", label="Entreprise contient")
+    location = django_filters.CharFilter(lookup_expr="trgm_icontains", label="Lieu contient")
+    company = django_filters.CharFilter(field_name="company__name", lookup_expr="trgm_icontains", label="Entreprise contient")
+    location_similar = django_filters.CharFilter(
+        field_name="location", lookup_expr="trigram_word_similar", label="Lieu ressemblant à"
+    )
+    company_similar = django_filters.CharFilter(
+        field_name="company__name", lookup_expr="trigram_word_similar", label="Entreprise ressemblant à"
+    )
     salary_min = django_filters.NumberFilter(field_name="salary", lookup_expr="gte", label="Salaire min")
     salary_max = django_filters.NumberFilter(field_name="salary", lookup_expr="lte", label="Salaire max")
+    near = django_filters.CharFilter(method="filter_near", label="À proximité de (lieu ou lat,lon)")
+    # Lu par filter_near ; seul, sans effet
+    radius_km = django_filters.NumberFilter(method="filter_radius", label="Rayon (km)")
 
     class Meta:
         model = JobOffer
-        fields = ["location", "company", "salary_min", "salary_max"]
+        fields = [
+            "location", "company", "location_similar", "company_similar", "salary_min", "salary_max",
+            "near", "radius_km",
+        ]
+
+    def filter_near(self, queryset, name, value):
+        point = geo.parse_point(value)
+        if point is None:
+            raise ValidationError({"near": [f"Lieu inconnu : {value}"]})
+        radius = self.form.cleaned_data.get("radius_km")
+        if radius is None:
+            radius = geo.DEFAULT_RADIUS_KM
+        if not 0 < radius <= geo.MAX_RADIUS_KM:
+            raise ValidationError({"radius_km": [f"Le rayon doit être compris entre 0 et {geo.MAX_RADIUS_KM} km."]})
+        return geo.within_radius(queryset, *point, float(radius))
+
+    def filter_radius(self, queryset, name, value):
+        return queryset
+
+
+class ApplicationFilter(django_filters.FilterSet):
+    """
+    Filtres disponibles pour GET /api/applications/ et /api/applications/export/ :
+    - ?job_offer=12
+    - ?company=3
+    - ?status=pending
+    - ?created_after=2024-01-01&created_before=2024-12-31
+    """
+
+    company = django_filters.NumberFilter(field_name="job_offer__company", label="Entreprise (id)")
+    created_after = django_filters.DateFilter(field_name="created_at", lookup_expr="date__gte", label="Créée à partir du")
+    created_before = django_filters.DateFilter(field_name="created_at", lookup_expr="date__lte", label="Créée jusqu'au")
+
+    class Meta:
+        model = Application
+        fields = ["job_offer", "company", "status", "created_after", "created_before"]
@@ -0,0 +1,124 @@
+"""
+jobs/geo.py - Géocodage des lieux et recherche par rayon
+========================================================
+
+JobOffer.location est un texte libre ("Paris", "Lyon (69)", "Remote") : à
+l'écriture, il est géocodé contre un gazetteer hors ligne (jobs/data/gazetteer.csv,
+villes françaises et européennes) et les coordonnées sont stockées dans
+latitude / longitude (NULL si le lieu est inconnu ou "Remote").
+
+?near=Lyon&radius_km=50 (JobOfferFilter) :
+1. rectangle englobant du cercle : filtre BETWEEN sur (latitude, longitude),
+   servi par l'index joboffer_lat_lon_idx
+2. distance exacte (formule de haversine) calculée en SQL sur les seules
+   lignes du rectangle
+"""
+import csv
+import math
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / "data" / "gazetteer.csv"
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.045
+DEFAULT_RADIUS_KM = 50
+MAX_RADIUS_KM = 1000
+# Morceaux d'un lieu libre : "Lyon (69)", "Paris, France", "Lille / Remote"
+SEPARATORS = re.compile(r"[,;/()|]+| - ")
+COORDINATES = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+def normalize_place(name):
+    """Minuscules, sans accents ni ponctuation : "Saint-Étienne" → "saint etienne"."""
+    text = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode("ascii")
+    text = re.sub(r"[^a-z0-9]+", " ", text.lower())
+    return " ".join(text.split())
+
+
+@lru_cache(maxsize=1)
+def gazetteer():
+    """Nom normalisé → (latitude, longitude), chargé une fois par processus."""
+    places = {}
+    with open(GAZETTEER_PATH, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            places.setdefault(normalize_place(row["name"]), (float(row["latitude"]), float(row["longitude"])))
+    return places
+
+
+def geocode(location):
+    """(latitude, longitude) du lieu, ou None s'il n'est pas dans le gazetteer."""
+    if not location:
+        return None
+    places = gazetteer()
+    candidates = [location, *SEPARATORS.split(location)]
+    for candidate in candidates:
+        name = normalize_place(candidate)
+        if not name:
+            continue
+        if name in places:
+            return places[name]
+        # "Paris 15e", "Lyon Part-Dieu" : préfixes de plus en plus courts
+        words = name.split()
+        for size in range(len(words) - 1, 0, -1):
+            prefix = " ".join(words[:size])
+            if prefix in places:
+                return places[prefix]
+    return None
+
+
+def parse_point(value):
+    """Point de ?near= : "45.76,4.83" ou un nom de lieu ; None si inconnu."""
+    match = COORDINATES.match(value or "")
+    if match:
+        latitude, longitude = float(match.group(1)), float(match.group(2))
+        if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+            return latitude, longitude
+        return None
+    return geocode(value)
+
+
+def set_coordinates(offer):
+    """Renseigne latitude / longitude de l'offre d'après son lieu (sans save())."""
+    point = geocode(offer.location)
+    offer.latitude, offer.longitude = point if point else (None, None)
+    return point is not None
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(lat_min, lat_max, lon_min, lon_max) du rectangle qui contient le cercle."""
+    delta_lat = radius_km / KM_PER_DEGREE
+    # cos(lat) tend vers 0 près des pôles : on borne pour ne pas diviser par ~0
+    delta_lon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+    return (
+        latitude - delta_lat,
+        latitude + delta_lat,
+        max(longitude - delta_lon, -180.0),
+        min(longitude + delta_lon, 180.0),
+    )
+
+
+def haversine_km(latitude, longitude):
+    """Expression SQL : distance (km) entre le point et (latitude, longitude) de la ligne."""
+    lat1, lon1 = Radians(Value(latitude, output_field=FloatField())), Radians(Value(longitude, output_field=FloatField()))
+    lat2, lon2 = Radians(F("latitude")), Radians(F("longitude"))
+    a = Power(Sin((lat2 - lat1) / 2), 2) + Cos(lat1) * Cos(lat2) * Power(Sin((lon2 - lon1) / 2), 2)
+    # Least : les arrondis peuvent donner sqrt(a) > 1, hors du domaine de asin()
+    return Value(2 * EARTH_RADIUS_KM, output_field=FloatField()) * ASin(Least(Sqrt(a), Value(1.0)))
+
+
+def within_radius(queryset, latitude, longitude, radius_km):
+    """Offres à moins de radius_km du point : rectangle (index) puis distance exacte."""
+    lat_min, lat_max, lon_min, lon_max = bounding_box(latitude, longitude, radius_km)
+    return (
+        queryset.filter(
+            latitude__range=(lat_min, lat_max),
+            longitude__range=(lon_min, lon_max),
+        )
+        .alias(distance_km=haversine_km(latitude, longitude))
+        .filter(distance_km__lte=radius_km)
+    )
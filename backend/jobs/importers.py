@@ -0,0 +1,173 @@
+"""
+jobs/importers.py - Import en masse d'offres (JSON Lines / CSV)
+===============================================================
+
+Utilisé par POST /api/jobs/import/. Le corps de la requête est lu ligne par
+ligne (jamais chargé en entier) :
+
+1. chaque ligne est validée avec les règles de JobOfferSerializer
+   (le champ company est un NOM d'entreprise, pas un id)
+2. les lignes valides sont accumulées par lots de batch_size
+3. pour chaque lot : entreprises résolues ou créées en 2 requêtes maximum
+   (cache local nom → id ; les entreprises créées ont pour owner l'utilisateur
+   qui importe), bulk_create des offres (lieux géocodés, jobs/geo.py),
+   recalcul du search_vector en un UPDATE, et UN événement outbox de
+   notification (plus un de recherche des candidats correspondants,
+   jobs/skills.py) pour tout le lot
+
+bulk_create ne déclenche pas les signals post_save : ce qu'ils font pour une
+création unitaire (jobs/signals.py) est fait ici lot par lot.
+
+La mémoire utilisée est bornée : un lot, le cache d'entreprises (plafonné) et
+au plus max_errors erreurs détaillées dans le rapport.
+"""
+import csv
+import json
+
+from django.db import transaction
+from rest_framework import serializers
+
+from . import geo, outbox
+from .cache import bump_generation
+from .models import Company, JobOffer
+from .search import update_search_vectors
+from .serializers import JobOfferSerializer
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+CONTENT_TYPES = {
+    "text/csv": FORMAT_CSV,
+    "application/csv": FORMAT_CSV,
+    "application/x-ndjson": FORMAT_JSONL,
+    "application/jsonl": FORMAT_JSONL,
+    "application/x-jsonlines": FORMAT_JSONL,
+}
+
+
+class JobOfferImportSerializer(JobOfferSerializer):
+    """Mêmes règles que JobOfferSerializer, mais company est le nom de l'entreprise."""
+
+    company = serializers.CharField(max_length=255, required=False, allow_blank=True)
+
+    class Meta(JobOfferSerializer.Meta):
+        fields = ["title", "company", "description", "salary", "location"]
+
+
+class CompanyResolver:
+    """
+    Cache nom → id des entreprises, rempli par lots (plafonné à max_size entrées).
+    Les entreprises créées ont pour owner l'utilisateur qui importe.
+    """
+
+    def __init__(self, owner=None, max_size=10000):
+        self.owner = owner
+        self.max_size = max_size
+        self.ids = {}
+
+    def resolve(self, names):
+        """Garantit que chaque nom du lot a un id en cache (crée les entreprises manquantes)."""
+        missing = {name for name in names if name and name not in self.ids}
+        if not missing:
+            return
+        if len(self.ids) + len(missing) > self.max_size:
+            self.ids.clear()
+        for company_id, name in Company.objects.filter(name__in=missing).order_by("id").values_list("id", "name"):
+            self.ids.setdefault(name, company_id)
+        to_create = [Company(name=name, owner=self.owner) for name in missing if name not in self.ids]
+        for company in Company.objects.bulk_create(to_create):
+            self.ids[company.name] = company.pk
+
+    def get(self, name):
+        return self.ids.get(name) if name else None
+
+
+class JobOfferImporter:
+    """Importe un flux de lignes (CSV ou JSON Lines) et produit un rapport par ligne."""
+
+    def __init__(self, batch_size=500, max_errors=100, context=None, owner=None):
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.context = context or {}
+        self.companies = CompanyResolver(owner=owner)
+        self.created = 0
+        self.failed = 0
+        self.batches = 0
+        self.errors = []
+
+    # ---- Lecture du flux ----
+
+    def _lines(self, stream):
+        for raw in stream:
+            yield raw.decode("utf-8-sig") if isinstance(raw, bytes) else raw
+
+    def _rows_csv(self, stream):
+        reader = csv.DictReader(self._lines(stream))
+        for row in reader:
+            # Cellule vide = champ absent (le serializer applique ses valeurs par défaut)
+            yield reader.line_num, {key: value for key, value in row.items() if key and value not in ("", None)}
+
+    def _rows_jsonl(self, stream):
+        for number, line in enumerate(self._lines(stream), start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield number, None
+                continue
+            yield number, row if isinstance(row, dict) else None
+
+    # ---- Import ----
+
+    def run(self, stream, fmt):
+        rows = self._rows_csv(stream) if fmt == FORMAT_CSV else self._rows_jsonl(stream)
+        batch = []
+        for number, row in rows:
+            if row is None:
+                self._error(number, {"non_field_errors": ["Ligne JSON invalide (objet attendu)."]})
+                continue
+            serializer = JobOfferImportSerializer(data=row, context=self.context)
+            if not serializer.is_valid():
+                self._error(number, serializer.errors)
+                continue
+            batch.append(serializer.validated_data)
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+        if batch:
+            self._flush(batch)
+        if self.created:
+            transaction.on_commit(bump_generation)
+        return self.report()
+
+    def _flush(self, batch):
+        with transaction.atomic():
+            self.companies.resolve({data.get("company") for data in batch})
+            offers = JobOffer.objects.bulk_create([self._build(data) for data in batch])
+            job_ids = [offer.pk for offer in offers]
+            update_search_vectors(JobOffer.objects.filter(pk__in=job_ids))
+            outbox.enqueue(outbox.TOPIC_JOB_BATCH_CREATED, {"job_ids": job_ids})
+            outbox.enqueue(outbox.TOPIC_JOB_MATCH_CANDIDATES, {"job_ids": job_ids})
+        self.created += len(job_ids)
+        self.batches += 1
+
+    def _build(self, data):
+        data = dict(data)
+        company_name = data.pop("company", None)
+        offer = JobOffer(**data, company_id=self.companies.get(company_name))
+        geo.set_coordinates(offer)
+        return offer
+
+    def _error(self, number, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": number, "errors": errors})
+
+    def report(self):
+        return {
+            "created": self.created,
+            "failed": self.failed,
+            "batches": self.batches,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
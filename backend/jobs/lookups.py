@@ -0,0 +1,29 @@
+"""
+jobs/lookups.py - Lookups ORM spécifiques à PostgreSQL
+======================================================
+
+icontains génère `UPPER(col::text) LIKE UPPER('%x%')` : l'expression UPPER(...)
+empêche PostgreSQL d'utiliser un index trigramme (gin_trgm_ops) posé sur la
+colonne. Le lookup trgm_icontains produit `col ILIKE '%x%'`, que pg_trgm sait
+servir directement depuis l'index.
+
+Enregistré au démarrage via JobsConfig.ready().
+"""
+from django.db.models import CharField, TextField
+from django.db.models.lookups import IContains
+
+
+class TrigramIContains(IContains):
+    """Sous-chaîne insensible à la casse via ILIKE (index GIN pg_trgm)."""
+
+    lookup_name = "trgm_icontains"
+
+    def get_rhs_op(self, connection, rhs):
+        if hasattr(self.rhs, "as_sql") or self.bilateral_transforms:
+            # Référence à une autre colonne : même motif que icontains
+            return "ILIKE '%%' || {} || '%%'".format(rhs)
+        return "ILIKE %s" % rhs
+
+
+CharField.register_lookup(TrigramIContains)
+TextField.register_lookup(TrigramIContains)
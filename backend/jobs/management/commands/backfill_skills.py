@@ -0,0 +1,32 @@
+"""
+Commande : python manage.py backfill_skills [--batch-size 1000]
+Remplit les compétences normalisées (Skill / CandidateSkill, jobs/skills.py)
+des profils candidats existants, par lots (keyset sur l'id, mémoire bornée).
+Peut être relancée sans risque : chaque lot remplace les compétences des profils.
+"""
+from django.core.management.base import BaseCommand
+
+from jobs.models import CandidateProfile
+from jobs.skills import sync_profiles
+
+
+class Command(BaseCommand):
+    help = "Normalise les compétences des profils candidats existants (index inversé)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Profils par lot")
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        last_id, total = 0, 0
+        while True:
+            batch = list(
+                CandidateProfile.objects.filter(pk__gt=last_id).order_by("pk").only("id", "skills")[:batch_size]
+            )
+            if not batch:
+                break
+            sync_profiles(batch)
+            last_id = batch[-1].pk
+            total += len(batch)
+            self.stdout.write(f"  {total} profils traités")
+        self.stdout.write(self.style.SUCCESS(f"Compétences normalisées pour {total} profils."))
@@ -0,0 +1,68 @@
+"""
+Commande : python manage.py bench_notifications --count 1000
+Mesure le débit des notifications (messages / seconde) avant et après le
+pipeline groupé (jobs/notifications.py), contre le serveur SMTP configuré.
+
+Serveur SMTP local : `python -m aiosmtpd -n -l localhost:1025` puis
+EMAIL_HOST=localhost EMAIL_PORT=1025 python manage.py bench_notifications
+(--backend locmem pour mesurer sans réseau).
+"""
+import json
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django_redis import get_redis_connection
+
+from jobs import notifications
+
+BACKENDS = {
+    "smtp": "django.core.mail.backends.smtp.EmailBackend",
+    "locmem": "django.core.mail.backends.locmem.EmailBackend",
+}
+# Ancienne tâche : time.sleep(5) par offre
+LEGACY_DELAY = 5.0
+
+
+class Command(BaseCommand):
+    help = "Compare le débit des notifications : une connexion par message vs envoi groupé"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1000, help="Nombre de notifications")
+        parser.add_argument("--backend", choices=sorted(BACKENDS), default=None,
+                            help="Backend email (défaut : EMAIL_BACKEND)")
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        backend = BACKENDS.get(options["backend"]) or settings.EMAIL_BACKEND
+        messages = [
+            notifications.message(
+                settings.JOB_NOTIFICATION_RECIPIENTS or ["bench@jobpulse.local"],
+                f"Bench #{i}",
+                f"Notification de test #{i}",
+            )
+            for i in range(count)
+        ]
+
+        # Avant : une tâche = une connexion SMTP = un message
+        start = time.perf_counter()
+        for m in messages:
+            EmailMessage(m["subject"], m["body"], settings.DEFAULT_FROM_EMAIL, m["to"],
+                         connection=get_connection(backend)).send()
+        legacy = time.perf_counter() - start
+
+        # Après : mise en file Redis (sans programmer de tâche) puis flush sur une seule connexion
+        redis = get_redis_connection("default")
+        redis.delete(notifications.PENDING_KEY)
+        start = time.perf_counter()
+        redis.rpush(notifications.PENDING_KEY, *[json.dumps(m) for m in messages])
+        sent = notifications.flush(connection=get_connection(backend))
+        batched = time.perf_counter() - start
+
+        self.stdout.write(f"Backend : {backend} — {count} notifications")
+        self.stdout.write(f"  Ancienne tâche (time.sleep(5)) : {1 / LEGACY_DELAY:.2f} msg/s par worker")
+        self.stdout.write(f"  Une connexion par message      : {count / legacy:.1f} msg/s ({legacy:.2f} s)")
+        self.stdout.write(self.style.SUCCESS(
+            f"  Envoi groupé (1 connexion)     : {sent / batched:.1f} msg/s ({batched:.2f} s, {sent} envoyés)"
+        ))
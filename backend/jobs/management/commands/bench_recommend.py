@@ -0,0 +1,78 @@
+"""
+Commande : python manage.py bench_recommend --offers 500000 --queries 200
+Mesure la latence (p50 / p95 / p99) du top-k de GET /api/jobs/recommended/
+(jobs/recommend.py) sur un corpus synthétique, sans base de données :
+vocabulaire de loi de Zipf, index construit dans un dossier temporaire puis
+relu en mmap, comme par les process gunicorn.
+"""
+import shutil
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from jobs import recommend
+
+
+class Command(BaseCommand):
+    help = "Benchmark de latence des recommandations TF-IDF sur N offres synthétiques"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--offers", type=int, default=500000)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--vocabulary", type=int, default=30000, help="Nombre de mots distincts")
+        parser.add_argument("--words", type=int, default=120, help="Mots par offre")
+        parser.add_argument("--k", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        vocabulary = [f"mot{i}" for i in range(options["vocabulary"])]
+        dimensions = np.array([zlib.crc32(w.encode()) % recommend.N_FEATURES for w in vocabulary], dtype=np.int32)
+        weights = 1.0 / np.arange(1, len(vocabulary) + 1)
+        cdf = np.cumsum(weights / weights.sum())
+
+        def sample(rng, size):
+            return np.minimum(np.searchsorted(cdf, rng.random(size)), len(vocabulary) - 1)
+
+        def rows(max_id):
+            # Même graine à chaque passe : rebuild_index() lit le corpus deux fois
+            rng = np.random.default_rng(options["seed"])
+            last = options["offers"] if max_id is None else min(max_id, options["offers"])
+            for job_id in range(1, last + 1):
+                words = sample(rng, options["words"])
+                indices, counts = np.unique(dimensions[words], return_counts=True)
+                yield job_id, (indices.astype(np.int32), counts.astype(np.float32))
+
+        path = Path(tempfile.mkdtemp(prefix="bench_recommend_"))
+        try:
+            start = time.perf_counter()
+            meta = recommend.rebuild_index(path, rows)
+            build = time.perf_counter() - start
+            size = sum(f.stat().st_size for f in path.rglob("*.npy"))
+            self.stdout.write(
+                f"Index : {meta['n_docs']} offres, {len(meta['segments'])} segments, "
+                f"{size / 1e6:.0f} Mo, construit en {build:.1f} s"
+            )
+
+            index = recommend.RecommendationIndex(path, meta)
+            rng = np.random.default_rng(options["seed"] + 1)
+            profiles = [
+                ", ".join(vocabulary[i] for i in sample(rng, 15))
+                for _ in range(options["queries"])
+            ]
+            index.top_k(profiles[0], k=options["k"])  # chauffe le cache de pages
+            latencies = []
+            for text in profiles:
+                start = time.perf_counter()
+                index.top_k(text, k=options["k"])
+                latencies.append((time.perf_counter() - start) * 1000)
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            self.stdout.write(self.style.SUCCESS(
+                f"top-{options['k']} sur {options['queries']} requêtes : "
+                f"p50 {p50:.1f} ms, p95 {p95:.1f} ms, p99 {p99:.1f} ms"
+            ))
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
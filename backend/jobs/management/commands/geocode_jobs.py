@@ -0,0 +1,38 @@
+"""
+Commande : python manage.py geocode_jobs [--batch-size 1000] [--all]
+Géocode le lieu des offres existantes (latitude / longitude, jobs/geo.py),
+par lots (keyset sur l'id, mémoire bornée, un bulk_update par lot).
+Par défaut seules les offres sans coordonnées sont traitées ; --all recalcule
+tout (après une mise à jour du gazetteer).
+"""
+from django.core.management.base import BaseCommand
+
+from jobs import geo, trending
+from jobs.cache import bump_generation
+from jobs.models import JobOffer
+
+
+class Command(BaseCommand):
+    help = "Géocode le lieu des offres existantes (recherche ?near=)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Offres par lot")
+        parser.add_argument("--all", action="store_true", help="Recalcule aussi les offres déjà géocodées")
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        offers = JobOffer.objects.all() if options["all"] else JobOffer.objects.filter(latitude__isnull=True)
+        last_id, total, located = 0, 0, 0
+        while True:
+            batch = list(offers.filter(pk__gt=last_id).order_by("pk").only("id", "location")[:batch_size])
+            if not batch:
+                break
+            changed = [offer for offer in batch if geo.set_coordinates(offer) or options["all"]]
+            JobOffer.objects.bulk_update(changed, ["latitude", "longitude"])
+            trending.invalidate_jobs([offer.pk for offer in changed])
+            last_id = batch[-1].pk
+            total += len(batch)
+            located += sum(offer.latitude is not None for offer in batch)
+            self.stdout.write(f"  {total} offres traitées ({located} localisées)")
+        bump_generation()
+        self.stdout.write(self.style.SUCCESS(f"{located} offres géocodées sur {total}."))
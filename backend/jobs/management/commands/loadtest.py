@@ -0,0 +1,156 @@
+"""
+Commande : python manage.py loadtest --target sync=http://localhost:8001 --target async=http://localhost:8000
+Compare des déploiements (SERVER_MODE=wsgi / asgi, voir gunicorn.conf.py) sous
+des clients lents simultanés.
+
+Pour chaque cible :
+1. --slow-clients connexions envoient leur requête octet par octet pendant
+   --slow-seconds puis lisent la réponse par petits morceaux (clients mobiles,
+   réseaux lents) ; elles sont rouvertes en boucle pendant toute la mesure
+2. --requests requêtes normales (--concurrency en parallèle) sur les --path
+   mesurent la latence : p50 / p95 / p99, erreurs (5xx, timeouts, connexions refusées)
+
+Client HTTP/1.1 minimal (asyncio, sans dépendance) : http:// uniquement. Viser
+gunicorn directement (port 8000), pas nginx qui met les requêtes en tampon.
+"""
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = ["/api/jobs/", "/api/jobs/trending/"]
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def build_request(host, path):
+    return (
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: application/json\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode()
+
+
+async def timed_request(host, port, path, timeout):
+    """(code HTTP ou None en cas d'erreur réseau / timeout, durée en secondes)."""
+    start = time.perf_counter()
+
+    async def exchange():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(build_request(host, path))
+            await writer.drain()
+            status_line = await reader.readline()
+            await reader.read()
+            return int(status_line.split()[1])
+        finally:
+            writer.close()
+
+    try:
+        status = await asyncio.wait_for(exchange(), timeout)
+    except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+        status = None
+    return status, time.perf_counter() - start
+
+
+async def slow_client(host, port, path, seconds, stop):
+    request = build_request(host, path)
+    delay = seconds / len(request)
+    while not stop.is_set():
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            for index in range(len(request)):
+                if stop.is_set():
+                    break
+                writer.write(request[index:index + 1])
+                await writer.drain()
+                await asyncio.sleep(delay)
+            while not stop.is_set() and await reader.read(512):
+                await asyncio.sleep(0.05)
+            writer.close()
+        except OSError:
+            await asyncio.sleep(0.1)
+
+
+async def run_target(url, paths, options):
+    parts = urlsplit(url)
+    if parts.scheme != "http" or not parts.hostname:
+        raise CommandError(f"URL non supportée : {url} (http://hôte:port attendu)")
+    host, port = parts.hostname, parts.port or 80
+
+    stop = asyncio.Event()
+    slow = [
+        asyncio.create_task(slow_client(host, port, paths[index % len(paths)], options["slow_seconds"], stop))
+        for index in range(options["slow_clients"])
+    ]
+    # Laisse les clients lents occuper les workers avant de mesurer
+    await asyncio.sleep(min(2.0, options["slow_seconds"] / 2))
+
+    semaphore = asyncio.Semaphore(options["concurrency"])
+
+    async def one(index):
+        async with semaphore:
+            return await timed_request(host, port, paths[index % len(paths)], options["timeout"])
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(index) for index in range(options["requests"])))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    for task in slow:
+        task.cancel()
+    await asyncio.gather(*slow, return_exceptions=True)
+
+    latencies = [duration for status, duration in results if status is not None and status < 500]
+    return {
+        "ok": len(latencies),
+        "errors": len(results) - len(latencies),
+        "p50": percentile(latencies, 0.50) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare la latence de déploiements sync / async sous des clients lents simultanés"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target", action="append", required=True,
+            help="nom=URL de base, répétable (ex. sync=http://localhost:8001)",
+        )
+        parser.add_argument("--path", action="append", help=f"Chemins interrogés (défaut : {', '.join(DEFAULT_PATHS)})")
+        parser.add_argument("--requests", type=int, default=500, help="Requêtes mesurées par cible")
+        parser.add_argument("--concurrency", type=int, default=20, help="Requêtes mesurées en parallèle")
+        parser.add_argument("--slow-clients", type=int, default=100, help="Connexions lentes simultanées")
+        parser.add_argument("--slow-seconds", type=float, default=10.0, help="Durée d'envoi d'une requête lente")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Timeout d'une requête mesurée (s)")
+
+    def handle(self, *args, **options):
+        paths = options["path"] or DEFAULT_PATHS
+        options["requests"] = max(1, options["requests"])
+        options["concurrency"] = max(1, options["concurrency"])
+        targets = []
+        for target in options["target"]:
+            name, sep, url = target.partition("=")
+            if not sep:
+                name, url = target, target
+            targets.append((name, url))
+
+        self.stdout.write(
+            f"{options['requests']} requêtes ({options['concurrency']} en parallèle) sur {', '.join(paths)}, "
+            f"{options['slow_clients']} clients lents ({options['slow_seconds']} s par requête)"
+        )
+        self.stdout.write(f"{'cible':<12}{'ok':>7}{'erreurs':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}")
+        for name, url in targets:
+            stats = asyncio.run(run_target(url, paths, options))
+            self.stdout.write(
+                f"{name:<12}{stats['ok']:>7}{stats['errors']:>9}{stats['p50']:>10.1f}"
+                f"{stats['p95']:>10.1f}{stats['p99']:>10.1f}{stats['rps']:>9.1f}"
+            )
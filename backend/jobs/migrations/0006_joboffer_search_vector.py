@@ -0,0 +1,36 @@
+# Migration: recherche plein texte sur JobOffer (tsvector pondéré + index GIN)
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# Même pondération que jobs/search.py::job_offer_search_vector
+BACKFILL_SQL = """
+UPDATE jobs_joboffer AS jo SET search_vector =
+    setweight(to_tsvector('french', COALESCE(jo.title, '')), 'A')
+    || setweight(to_tsvector('french', COALESCE(
+        (SELECT c.name FROM jobs_company AS c WHERE c.id = jo.company_id), ''
+    )), 'B')
+    || setweight(to_tsvector('french', COALESCE(jo.description, '')), 'C');
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0005_userprofile"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="joboffer",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="joboffer",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["search_vector"], name="joboffer_search_vector_gin"),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,31 @@
+# Migration: index trigrammes (pg_trgm) pour les filtres ?location= et ?company=
+# Index créés en CONCURRENTLY : pas de verrou d'écriture sur les grosses tables.
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("jobs", "0006_joboffer_search_vector"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="joboffer",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["location"], name="joboffer_location_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="company",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="company_name_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Migration: index (clé de tri, id) pour la pagination par curseur
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("jobs", "0007_trigram_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="joboffer",
+            index=models.Index(fields=["created_at", "id"], name="joboffer_created_id_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="joboffer",
+            index=models.Index(fields=["salary", "id"], name="joboffer_salary_id_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="joboffer",
+            index=models.Index(fields=["title", "id"], name="joboffer_title_id_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="application",
+            index=models.Index(fields=["created_at", "id"], name="application_created_id_idx"),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Migration: updated_at sur JobOffer et Company (validateurs ETag / Last-Modified)
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0008_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="company",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name="Dernière modification"),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="joboffer",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name="Dernière modification"),
+            preserve_default=False,
+        ),
+    ]
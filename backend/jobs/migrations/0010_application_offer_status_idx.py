@@ -0,0 +1,20 @@
+# Migration: index composite Application(job_offer, status, created_at) pour le tableau de bord recruteur
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("jobs", "0009_joboffer_company_updated_at"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="application",
+            index=models.Index(fields=["job_offer", "status", "created_at"], name="application_offer_status_idx"),
+        ),
+    ]
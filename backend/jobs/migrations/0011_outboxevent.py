@@ -0,0 +1,36 @@
+# Migration: outbox transactionnelle (OutboxEvent)
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0010_application_offer_status_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("topic", models.CharField(max_length=100, verbose_name="Sujet")),
+                ("payload", models.JSONField(default=dict, verbose_name="Contenu")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Date de création")),
+                ("published_at", models.DateTimeField(blank=True, null=True, verbose_name="Date de publication")),
+                ("attempts", models.PositiveIntegerField(default=0, verbose_name="Tentatives de publication")),
+            ],
+            options={
+                "verbose_name": "Événement outbox",
+                "verbose_name_plural": "Événements outbox",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(published_at__isnull=True),
+                        fields=["id"],
+                        name="outbox_pending_idx",
+                    )
+                ],
+            },
+        ),
+    ]
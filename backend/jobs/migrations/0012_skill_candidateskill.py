@@ -0,0 +1,68 @@
+# Migration: compétences normalisées (Skill) et index inversé compétence → candidats (CandidateSkill)
+# Remplissage des profils existants : python manage.py backfill_skills
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0011_outboxevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Skill",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=100, unique=True, verbose_name="Nom")),
+            ],
+            options={
+                "verbose_name": "Compétence",
+                "verbose_name_plural": "Compétences",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="CandidateSkill",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="profile_skills",
+                        to="jobs.candidateprofile",
+                    ),
+                ),
+                (
+                    "skill",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="skill_profiles",
+                        to="jobs.skill",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Compétence du candidat",
+                "verbose_name_plural": "Compétences des candidats",
+                "indexes": [models.Index(fields=["skill", "profile"], name="candidateskill_skill_idx")],
+                "constraints": [
+                    models.UniqueConstraint(fields=("profile", "skill"), name="unique_candidate_skill"),
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="candidateprofile",
+            name="skill_set",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="candidates",
+                through="jobs.CandidateSkill",
+                to="jobs.skill",
+                verbose_name="Compétences normalisées",
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Migration: texte extrait du CV (cv_text, cv_sha256) et index plein texte (cv_search_vector)
+# Index créé en CONCURRENTLY : pas de verrou d'écriture sur la table des profils.
+# Extraction des CV existants : tâche extract_cv_task (jobs/cv.py)
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("jobs", "0012_skill_candidateskill"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="candidateprofile",
+            name="cv_text",
+            field=models.TextField(blank=True, editable=False, verbose_name="Texte du CV"),
+        ),
+        migrations.AddField(
+            model_name="candidateprofile",
+            name="cv_sha256",
+            field=models.CharField(
+                blank=True, editable=False, max_length=64, verbose_name="Empreinte SHA-256 du CV"
+            ),
+        ),
+        migrations.AddField(
+            model_name="candidateprofile",
+            name="cv_search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        AddIndexConcurrently(
+            model_name="candidateprofile",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["cv_search_vector"], name="candidateprofile_cv_gin"
+            ),
+        ),
+    ]
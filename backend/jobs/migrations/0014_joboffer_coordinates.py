@@ -0,0 +1,32 @@
+# Migration: coordonnées des offres (latitude, longitude) géocodées depuis location (jobs/geo.py)
+# Index créé en CONCURRENTLY : pas de verrou d'écriture sur la table des offres.
+# Géocodage des offres existantes : python manage.py geocode_jobs
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("jobs", "0013_candidateprofile_cv_text"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="joboffer",
+            name="latitude",
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name="Latitude"),
+        ),
+        migrations.AddField(
+            model_name="joboffer",
+            name="longitude",
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name="Longitude"),
+        ),
+        AddIndexConcurrently(
+            model_name="joboffer",
+            index=models.Index(fields=["latitude", "longitude"], name="joboffer_lat_lon_idx"),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Migration: événements outbox abandonnés (failed_at), exclus de l'index des événements en attente
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0014_joboffer_coordinates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outboxevent",
+            name="failed_at",
+            field=models.DateTimeField(blank=True, null=True, verbose_name="Date d'abandon"),
+        ),
+        migrations.RemoveIndex(
+            model_name="outboxevent",
+            name="outbox_pending_idx",
+        ),
+        migrations.AddIndex(
+            model_name="outboxevent",
+            index=models.Index(
+                condition=models.Q(failed_at__isnull=True, published_at__isnull=True),
+                fields=["id"],
+                name="outbox_pending_idx",
+            ),
+        ),
+    ]
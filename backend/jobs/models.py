@@ -1,10 +1,14 @@
 """
-jobs/models.py - Modèles Company, JobOffer, Application, CandidateProfile, UserProfile
-=====================================================================================
+jobs/models.py - Modèles Company, JobOffer, Application, CandidateProfile, UserProfile, Skill, OutboxEvent
+=========================================================================================================
 
 UserProfile : rôle utilisateur (candidat, recruteur, les deux)
+Skill / CandidateSkill : compétences normalisées et index inversé compétence → candidats (jobs/skills.py)
+OutboxEvent : événements à publier vers Celery (outbox transactionnelle, jobs/outbox.py)
 """
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 
@@ -71,12 +75,24 @@ class CandidateProfile(models.Model):
         blank=True,
         null=True,
     )
+    # Texte extrait du CV par une tâche Celery après l'upload (jobs/cv.py)
+    cv_text = models.TextField(verbose_name="Texte du CV", blank=True, editable=False)
+    cv_sha256 = models.CharField(max_length=64, verbose_name="Empreinte SHA-256 du CV", blank=True, editable=False)
+    cv_search_vector = SearchVectorField(null=True, editable=False)
     cover_letter = models.TextField(verbose_name="Lettre de motivation", blank=True)
     skills = models.TextField(
         verbose_name="Compétences",
         blank=True,
         help_text="Compétences séparées par des virgules",
     )
+    # Compétences normalisées, tenues à jour depuis skills (jobs/skills.py)
+    skill_set = models.ManyToManyField(
+        "Skill",
+        through="CandidateSkill",
+        related_name="candidates",
+        blank=True,
+        verbose_name="Compétences normalisées",
+    )
     experience = models.TextField(verbose_name="Expérience professionnelle", blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -84,11 +100,51 @@ class CandidateProfile(models.Model):
     class Meta:
         verbose_name = "Profil candidat"
         verbose_name_plural = "Profils candidats"
+        indexes = [
+            # Sert ?cv_search= dans les vues recruteur
+            GinIndex(fields=["cv_search_vector"], name="candidateprofile_cv_gin"),
+        ]
 
     def __str__(self):
         return f"Profil de {self.user.username}"
 
 
+class Skill(models.Model):
+    """Compétence normalisée (minuscules, espaces réduits) : "Python", " python " → "python"."""
+    name = models.CharField(max_length=100, unique=True, verbose_name="Nom")
+
+    class Meta:
+        verbose_name = "Compétence"
+        verbose_name_plural = "Compétences"
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+class CandidateSkill(models.Model):
+    """
+    Table de liaison CandidateProfile ↔ Skill.
+    L'index (skill, profile) est l'index inversé : compétence → candidats,
+    lu sans accès à la table pour trouver les candidats d'une offre.
+    """
+    profile = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE, related_name="profile_skills")
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="skill_profiles")
+
+    class Meta:
+        verbose_name = "Compétence du candidat"
+        verbose_name_plural = "Compétences des candidats"
+        constraints = [
+            models.UniqueConstraint(fields=["profile", "skill"], name="unique_candidate_skill"),
+        ]
+        indexes = [
+            models.Index(fields=["skill", "profile"], name="candidateskill_skill_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.profile_id} → {self.skill_id}"
+
+
 class Company(models.Model):
     """
     Entreprise qui publie des offres d'emploi.
@@ -106,11 +162,16 @@ class Company(models.Model):
         verbose_name="Recruteur",
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Dernière modification")
 
     class Meta:
         verbose_name = "Entreprise"
         verbose_name_plural = "Entreprises"
         ordering = ["name"]
+        indexes = [
+            # Sert ?company= (ILIKE) et ?company_similar= sur /api/jobs/
+            GinIndex(fields=["name"], name="company_name_trgm", opclasses=["gin_trgm_ops"]),
+        ]
 
     def __str__(self):
         return self.name
@@ -126,6 +187,9 @@ class JobOffer(models.Model):
     - salary : Salaire proposé (Decimal pour la précision financière)
     - location : Lieu du travail (ville, pays, ou "Remote")
     - created_at : Date de création (auto-rempli)
+    - updated_at : Date de dernière modification (ETag / Last-Modified)
+    - search_vector : tsvector pondéré (titre > entreprise > description), maintenu par les signals
+    - latitude / longitude : coordonnées du lieu (jobs/geo.py), NULL si inconnu ou "Remote"
     """
 
     title = models.CharField(max_length=255, verbose_name="Titre")
@@ -147,11 +211,26 @@ class JobOffer(models.Model):
     )
     location = models.CharField(max_length=255, verbose_name="Lieu", default="Non précisé")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Dernière modification")
+    search_vector = SearchVectorField(null=True, editable=False)
+    latitude = models.FloatField(null=True, blank=True, editable=False, verbose_name="Latitude")
+    longitude = models.FloatField(null=True, blank=True, editable=False, verbose_name="Longitude")
 
     class Meta:
         verbose_name = "Offre d'emploi"
         verbose_name_plural = "Offres d'emploi"
         ordering = ["-created_at"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="joboffer_search_vector_gin"),
+            # Sert ?location= (ILIKE) et ?location_similar=
+            GinIndex(fields=["location"], name="joboffer_location_trgm", opclasses=["gin_trgm_ops"]),
+            # Pagination par curseur (jobs/pagination.py) : (clé de tri, id)
+            models.Index(fields=["created_at", "id"], name="joboffer_created_id_idx"),
+            models.Index(fields=["salary", "id"], name="joboffer_salary_id_idx"),
+            models.Index(fields=["title", "id"], name="joboffer_title_id_idx"),
+            # Rectangle englobant de ?near= (jobs/geo.py)
+            models.Index(fields=["latitude", "longitude"], name="joboffer_lat_lon_idx"),
+        ]
 
     def __str__(self):
         company_name = self.company.name if self.company else "Sans entreprise"
@@ -198,6 +277,11 @@ class Application(models.Model):
         verbose_name = "Candidature"
         verbose_name_plural = "Candidatures"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="application_created_id_idx"),
+            # Tableau de bord recruteur : compteurs par statut et candidats d'une offre
+            models.Index(fields=["job_offer", "status", "created_at"], name="application_offer_status_idx"),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["user", "job_offer"],
@@ -207,3 +291,34 @@ class Application(models.Model):
 
     def __str__(self):
         return f"{self.user.username} → {self.job_offer.title}"
+
+
+class OutboxEvent(models.Model):
+    """
+    Événement écrit dans la même transaction que la donnée qui le produit,
+    puis publié vers Celery par drain_outbox_task (jobs/outbox.py).
+    published_at reste NULL tant que l'événement n'a pas été publié ;
+    failed_at est renseigné si l'événement ne pourra jamais l'être (sujet inconnu).
+    """
+    topic = models.CharField(max_length=100, verbose_name="Sujet")
+    payload = models.JSONField(default=dict, verbose_name="Contenu")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
+    published_at = models.DateTimeField(null=True, blank=True, verbose_name="Date de publication")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Tentatives de publication")
+    failed_at = models.DateTimeField(null=True, blank=True, verbose_name="Date d'abandon")
+
+    class Meta:
+        verbose_name = "Événement outbox"
+        verbose_name_plural = "Événements outbox"
+        ordering = ["id"]
+        indexes = [
+            # Index partiel : le drainer ne parcourt que les événements en attente
+            models.Index(
+                fields=["id"],
+                name="outbox_pending_idx",
+                condition=models.Q(published_at__isnull=True, failed_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} #{self.pk}"
@@ -0,0 +1,120 @@
+"""
+jobs/notifications.py - Pipeline d'envoi des notifications email
+================================================================
+
+Avant : une tâche par offre, bloquée 5 s (time.sleep) sur un "envoi" : un
+import de 10 000 offres occupait les workers pendant des heures.
+
+Maintenant :
+1. enqueue() pousse les messages dans une liste Redis (notifications:pending)
+   et programme UNE tâche flush_notifications_task après NOTIFICATION_BATCH_WINDOW
+   secondes, sauf si un flush est déjà programmé (coalescence)
+2. flush() vide la liste par paquets de NOTIFICATION_BATCH_SIZE et envoie
+   tous les messages sur UNE seule connexion SMTP
+3. les tâches de notification passent par la queue Celery "notifications"
+   (CELERY_TASK_ROUTES), consommée par un worker dédié : elles ne prennent
+   plus la place des autres tâches
+
+Serveur SMTP local pour les tests : EMAIL_HOST=localhost EMAIL_PORT=1025 avec
+`python -m aiosmtpd -n -l localhost:1025` (ou mailpit / MailHog).
+Mesure du débit : python manage.py bench_notifications
+"""
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "notifications:pending"
+FLUSH_SCHEDULED_KEY = "notifications:flush_scheduled"
+
+
+def message(to, subject, body):
+    """Message sérialisable (JSON) à passer à enqueue()."""
+    return {"to": list(to), "subject": subject, "body": body}
+
+
+def enqueue(messages):
+    """Ajoute des messages à la file et programme un flush si aucun n'est prévu."""
+    messages = [m for m in messages if m["to"]]
+    if not messages:
+        return 0
+    redis = get_redis_connection("default")
+    redis.rpush(PENDING_KEY, *[json.dumps(m) for m in messages])
+    schedule_flush()
+    return len(messages)
+
+
+def schedule_flush():
+    window = settings.NOTIFICATION_BATCH_WINDOW
+    # Le verrou expire même si le flush ne s'exécute jamais (worker arrêté)
+    if cache.add(FLUSH_SCHEDULED_KEY, 1, window + 60):
+        from .tasks import flush_notifications_task
+
+        flush_notifications_task.apply_async(countdown=window)
+
+
+def _pop(redis, count):
+    raw = redis.lpop(PENDING_KEY, count) or []
+    return [json.loads(item) for item in raw]
+
+
+def _requeue(redis, messages):
+    """Remet des messages non envoyés en tête de file (ordre conservé)."""
+    if messages:
+        redis.lpush(PENDING_KEY, *[json.dumps(m) for m in reversed(messages)])
+
+
+def flush(connection=None):
+    """
+    Envoie tous les messages en attente sur une seule connexion SMTP.
+    Retourne le nombre de messages envoyés. En cas d'erreur SMTP, le paquet
+    en cours est remis en file et l'exception remonte (la tâche est relancée).
+    """
+    # Libéré AVANT de lire la file : un enqueue() concurrent reprogramme un flush
+    cache.delete(FLUSH_SCHEDULED_KEY)
+    redis = get_redis_connection("default")
+    batch_size = settings.NOTIFICATION_BATCH_SIZE
+    connection = connection or get_connection(fail_silently=False)
+    sent = 0
+    with connection:
+        while True:
+            batch = _pop(redis, batch_size)
+            if not batch:
+                break
+            emails = [
+                EmailMessage(m["subject"], m["body"], settings.DEFAULT_FROM_EMAIL, m["to"], connection=connection)
+                for m in batch
+            ]
+            try:
+                sent += connection.send_messages(emails) or 0
+            except Exception:
+                _requeue(redis, batch)
+                logger.exception("notifications: échec d'envoi, %s messages remis en file", len(batch))
+                raise
+    return sent
+
+
+def job_created_messages(job_id, job_title, company):
+    """Notification d'une nouvelle offre aux destinataires JOB_NOTIFICATION_RECIPIENTS."""
+    return [message(
+        settings.JOB_NOTIFICATION_RECIPIENTS,
+        f"Nouvelle offre : {job_title} @ {company}",
+        f"Une nouvelle offre a été publiée sur JobPulse (#{job_id}) : {job_title} chez {company}.",
+    )]
+
+
+def job_batch_messages(jobs):
+    """Un seul récapitulatif pour un lot d'offres importées : jobs = [(id, titre, entreprise)]."""
+    if not jobs:
+        return []
+    lines = [f"- #{job_id} : {title} @ {company}" for job_id, title, company in jobs]
+    return [message(
+        settings.JOB_NOTIFICATION_RECIPIENTS,
+        f"{len(jobs)} nouvelles offres importées",
+        "Offres importées sur JobPulse :\n" + "\n".join(lines),
+    )]
@@ -0,0 +1,153 @@
+"""
+jobs/outbox.py - Outbox transactionnelle
+========================================
+
+Appeler .delay() dans un signal post_save coûte un aller-retour vers le broker
+dans la requête HTTP, et la tâche peut partir avant le COMMIT (l'offre n'est
+pas encore visible) ou être perdue si le broker ne répond pas.
+
+À la place :
+1. enqueue() écrit un OutboxEvent dans la MÊME transaction que la donnée
+2. drain_outbox_task (Celery beat, CELERY_BEAT_SCHEDULE) publie les événements
+   en attente par lots, verrouillés avec SELECT ... FOR UPDATE SKIP LOCKED
+   (plusieurs drainers peuvent tourner sans publier deux fois le même lot)
+3. livraison "au moins une fois" : les tâches consommatrices reçoivent
+   event_id et ignorent un événement déjà traité (claim_event / release_event)
+4. un événement de sujet inconnu ne sera jamais publié : il est abandonné
+   (failed_at) et sort de la file, sans bloquer les suivants ; il reste en base
+   pour diagnostic (admin) et n'est pas purgé
+
+Métriques : outbox_lag() (nombre d'événements en attente, âge du plus ancien,
+nombre d'événements abandonnés),
+aussi stockée dans le cache sous LAG_CACHE_KEY après chaque passage du drainer.
+"""
+import logging
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+TOPIC_JOB_CREATED = "job.created"
+TOPIC_JOB_BATCH_CREATED = "job.batch_created"
+TOPIC_JOB_MATCH_CANDIDATES = "job.match_candidates"
+
+DRAIN_BATCH_SIZE = 200
+DRAIN_MAX_BATCHES = 50
+DONE_KEY = "outbox:done:{id}"
+DONE_TTL = 60 * 60 * 24 * 7
+LAG_CACHE_KEY = "outbox:lag"
+PUBLISHED_RETENTION = timedelta(days=7)
+
+
+def enqueue(topic, payload):
+    """Écrit un événement ; à appeler dans la transaction qui produit la donnée."""
+    return OutboxEvent.objects.create(topic=topic, payload=payload)
+
+
+def _handlers():
+    from .tasks import (
+        notify_matching_candidates_task,
+        send_job_batch_notification_task,
+        send_job_notification_task,
+    )
+
+    return {
+        TOPIC_JOB_CREATED: send_job_notification_task,
+        TOPIC_JOB_BATCH_CREATED: send_job_batch_notification_task,
+        TOPIC_JOB_MATCH_CANDIDATES: notify_matching_candidates_task,
+    }
+
+
+def _pending():
+    return OutboxEvent.objects.filter(published_at__isnull=True, failed_at__isnull=True)
+
+
+def _drain_batch(handlers):
+    """
+    Publie un lot d'événements en attente.
+    Retourne (nb d'événements lus, False si le broker a refusé une publication).
+    """
+    with transaction.atomic():
+        events = list(_pending().select_for_update(skip_locked=True).order_by("id")[:DRAIN_BATCH_SIZE])
+        published, failed, dead, broker_ok = [], [], [], True
+        for event in events:
+            handler = handlers.get(event.topic)
+            if handler is None:
+                # Aucun passage ne pourra le publier : abandonné plutôt que relu à chaque lot
+                logger.error("outbox: sujet inconnu %s, événement #%s abandonné", event.topic, event.pk)
+                dead.append(event.pk)
+                continue
+            try:
+                handler.apply_async(kwargs={**event.payload, "event_id": event.pk})
+            except Exception:
+                # Broker indisponible : l'événement reste en attente pour le prochain passage
+                logger.exception("outbox: échec de publication de l'événement #%s", event.pk)
+                failed.append(event.pk)
+                broker_ok = False
+                break
+            published.append(event.pk)
+
+        now = timezone.now()
+        if published:
+            OutboxEvent.objects.filter(pk__in=published).update(published_at=now)
+        if failed:
+            OutboxEvent.objects.filter(pk__in=failed).update(attempts=F("attempts") + 1)
+        if dead:
+            OutboxEvent.objects.filter(pk__in=dead).update(attempts=F("attempts") + 1, failed_at=now)
+    return len(events), broker_ok
+
+
+def drain():
+    """Vide l'outbox par lots (borné à DRAIN_MAX_BATCHES lots par passage)."""
+    handlers = _handlers()
+    total = 0
+    for _ in range(DRAIN_MAX_BATCHES):
+        count, broker_ok = _drain_batch(handlers)
+        total += count
+        if count < DRAIN_BATCH_SIZE or not broker_ok:
+            break
+    cache.set(LAG_CACHE_KEY, outbox_lag(), None)
+    return total
+
+
+def outbox_lag():
+    """
+    {"pending": nb d'événements en attente, "oldest_age_seconds": âge du plus ancien,
+    "failed": nb d'événements abandonnés}.
+    """
+    stats = _pending().aggregate(pending=Count("id"), oldest=Min("created_at"))
+    oldest = stats["oldest"]
+    age = (timezone.now() - oldest).total_seconds() if oldest else 0.0
+    failed = OutboxEvent.objects.filter(failed_at__isnull=False).count()
+    return {"pending": stats["pending"], "oldest_age_seconds": round(age, 3), "failed": failed}
+
+
+def purge_published():
+    """Supprime les événements publiés depuis plus de PUBLISHED_RETENTION."""
+    deleted, _ = OutboxEvent.objects.filter(
+        published_at__lt=timezone.now() - PUBLISHED_RETENTION
+    ).delete()
+    return deleted
+
+
+def claim_event(event_id):
+    """
+    Déduplication côté consommateur : True si l'événement doit être traité,
+    False s'il l'a déjà été (ou est en cours de traitement ailleurs).
+    Sans event_id (appel direct de la tâche), on traite toujours.
+    """
+    if event_id is None:
+        return True
+    return cache.add(DONE_KEY.format(id=event_id), 1, DONE_TTL)
+
+
+def release_event(event_id):
+    """Annule claim_event() si le traitement a échoué (l'événement pourra être rejoué)."""
+    if event_id is not None:
+        cache.delete(DONE_KEY.format(id=event_id))
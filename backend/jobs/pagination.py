@@ -0,0 +1,360 @@
+"""
+jobs/pagination.py - Pagination des listes de l'API
+===================================================
+
+PageNumberPagination (?page=N) coûte un COUNT(*) par page et un OFFSET qui
+ralentit à mesure que l'on descend dans la liste. KeysetPagination pagine par
+curseur opaque : la page suivante est « les lignes situées après la dernière
+ligne vue » selon le tri courant, ce qui se traduit par un WHERE servi par les
+index au lieu d'un OFFSET.
+
+- Tri : celui appliqué par OrderingFilter (?ordering=-created_at, salary, title...)
+  ou, à défaut, le tri par défaut du modèle ; l'id est toujours ajouté en
+  départage pour que le tri soit total (ex. : (created_at, id)).
+- Les valeurs NULL (ex. : salary) sont toujours placées en fin de liste.
+- ?page=N : on bascule sur la pagination par numéro de page (réponse avec count).
+
+EstimatedCountPagination (pagination par défaut, voir REST_FRAMEWORK) garde la
+pagination par numéro de page mais évite le COUNT(*) exact sur les gros
+résultats : le count est borné (COUNT sur LIMIT JOBS_EXACT_COUNT_THRESHOLD + 1) ;
+seulement si cette sonde est pleine, le count renvoyé est l'estimation du
+planner PostgreSQL (count_is_estimate = true).
+"""
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset):
+    """
+    Nombre de lignes estimé par le planner (EXPLAIN, sans exécuter la requête).
+    None si la base n'est pas PostgreSQL ou si l'estimation échoue.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class EstimatedPage(Page):
+    """Page dont has_next() ne dépend pas du count (qui peut être estimé)."""
+
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self._has_more = has_more
+
+    def has_next(self):
+        return self._has_more
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator Django dont le count est exact pour les petits résultats et
+    estimé (planner) pour les gros. En mode estimé, la présence d'une page
+    suivante est déterminée en lisant une ligne de plus que la page.
+    """
+
+    count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, "query"):
+            return super().count
+        threshold = getattr(settings, "JOBS_EXACT_COUNT_THRESHOLD", 10000)
+        # Sonde bornée : exacte (une seule requête) tant que le résultat est petit
+        probe = self.object_list.order_by()[: threshold + 1].count()
+        if probe <= threshold:
+            return probe
+        estimate = estimate_count(self.object_list)
+        if estimate is None:
+            return super().count
+        self.count_is_estimate = True
+        # Le planner peut sous-estimer : au moins les lignes déjà vues
+        return max(estimate, probe)
+
+    def validate_number(self, number):
+        if not self.count_is_estimate:
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        self.count  # détermine le mode (exact / estimé)
+        if not self.count_is_estimate:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage("That page contains no results")
+        return EstimatedPage(rows[: self.per_page], number, self, has_more=len(rows) > self.per_page)
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """
+    PageNumberPagination avec count approximatif sur les gros résultats.
+
+    Réponse : {"count", "count_is_estimate", "next", "previous", "results"}
+    """
+
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("count", self.page.paginator.count),
+            ("count_is_estimate", self.page.paginator.count_is_estimate),
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_estimate"] = {"type": "boolean"}
+        return response_schema
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination par curseur sur (champs de tri..., id).
+
+    Réponse : {"next": url | null, "previous": url | null, "results": [...]}
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    page_query_param = "page"
+    page_number_class = EstimatedCountPagination
+    invalid_cursor_message = "Curseur invalide."
+
+    def __init__(self):
+        self._page_number = None
+
+    # ---- Point d'entrée DRF ----
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        keys = self._get_keys(queryset)
+        if self.page_query_param in request.query_params or keys is None:
+            self._page_number = self.page_number_class()
+            return self._page_number.paginate_queryset(queryset, request, view)
+
+        self.keys = keys
+        self.model = queryset.model
+        self.base_url = request.build_absolute_uri()
+        values, reverse = self._decode_cursor(request)
+
+        queryset = queryset.order_by(*self._order_by(reverse))
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, reverse))
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = values is not None, has_more
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        if self._page_number is not None:
+            return self._page_number.get_paginated_response(data)
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Curseur de pagination (liens next / previous).",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Numéro de page : active la pagination classique avec count.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    # ---- Liens ----
+
+    def get_next_link(self):
+        if self._page_number is not None:
+            return self._page_number.get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if self._page_number is not None:
+            return self._page_number.get_previous_link()
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], reverse=True)
+
+    def _link(self, obj, reverse):
+        values = [self._dump_value(getattr(obj, name)) for name, _desc in self.keys]
+        payload = json.dumps({"v": values, "r": reverse}, separators=(",", ":"))
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+        url = remove_query_param(self.base_url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    # ---- Tri et clés ----
+
+    def _get_keys(self, queryset):
+        """
+        Liste [(nom, desc)] des clés de tri, id compris.
+        None si le tri n'est pas paginable par curseur (champ joint, expression...).
+        """
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        keys = []
+        for item in ordering:
+            if not isinstance(item, str):
+                return None
+            name, desc = item.lstrip("-"), item.startswith("-")
+            if "__" in name or name == "?":
+                return None
+            if name in ("pk", "id"):
+                keys.append(("pk", desc))
+                return keys
+            keys.append((name, desc))
+        keys.append(("pk", keys[0][1] if keys else True))
+        return keys
+
+    def _is_nullable(self, name):
+        if name == "pk":
+            return False
+        try:
+            return self.model._meta.get_field(name).null
+        except FieldDoesNotExist:
+            return False  # annotation (ex. : search_rank)
+
+    def _order_by(self, reverse):
+        order = []
+        for name, desc in self.keys:
+            expression = F(name).desc if desc != reverse else F(name).asc
+            if self._is_nullable(name):
+                # NULL en fin de liste en sens normal, donc en tête en sens inverse
+                order.append(expression(**({"nulls_first": True} if reverse else {"nulls_last": True})))
+            else:
+                # Pas de NULLS FIRST/LAST : le tri reste servi tel quel par l'index B-tree
+                order.append(expression())
+        return order
+
+    def _seek(self, values, reverse):
+        """
+        Condition « strictement après (ou avant si reverse) la ligne de curseur » :
+        (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (name, desc), value in zip(self.keys, values):
+            nullable = self._is_nullable(name)
+            if value is None:
+                # NULL est en fin de liste : rien après, tout le non-NULL avant
+                step = Q(**{f"{name}__isnull": False}) if reverse else None
+                here = Q(**{f"{name}__isnull": True})
+            else:
+                lookup = "lt" if desc != reverse else "gt"
+                step = Q(**{f"{name}__{lookup}": value})
+                if nullable and not reverse:
+                    step |= Q(**{f"{name}__isnull": True})
+                here = Q(**{name: value})
+            if step is not None:
+                condition |= equal & step
+            equal &= here
+
+        # Borne large sur la première clé (created_at <= v) : donne au planner
+        # une condition de plage exploitable par l'index en plus du OR.
+        name, desc = self.keys[0]
+        if values[0] is not None and not self._is_nullable(name):
+            lookup = "lte" if desc != reverse else "gte"
+            condition &= Q(**{f"{name}__{lookup}": values[0]})
+        return condition
+
+    # ---- Curseur ----
+
+    def _decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            values, reverse = payload["v"], bool(payload["r"])
+            if len(values) != len(self.keys):
+                raise ValueError
+            return [self._load_value(name, value) for (name, _desc), value in zip(self.keys, values)], reverse
+        except (TypeError, ValueError, KeyError, binascii.Error, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _dump_value(self, value):
+        if value is None or isinstance(value, (int, float, str, bool)):
+            return value
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        return str(value)
+
+    def _load_value(self, name, value):
+        if value is None:
+            return None
+        try:
+            field = self.model._meta.pk if name == "pk" else self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return float(value)
+        try:
+            return field.to_python(value)
+        except ValidationError:
+            raise ValueError(value)
@@ -0,0 +1,17 @@
+"""
+jobs/permissions.py - Permissions DRF spécifiques à JobPulse
+"""
+from rest_framework.permissions import BasePermission
+
+from core.auth import is_recruiter
+
+
+class IsRecruiter(BasePermission):
+    """Utilisateur authentifié dont le rôle est recruteur (ou candidat et recruteur)."""
+
+    message = "Réservé aux recruteurs."
+
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+        return is_recruiter(request.user)
@@ -0,0 +1,88 @@
+"""
+jobs/protected_media.py - Téléchargement protégé des CV
+=======================================================
+
+Les CV ne sont plus servis par /media/ (bloqué dans nginx.conf) mais par
+GET /api/profiles/{id}/cv/ :
+
+1. Django vérifie les droits : le candidat lui-même, le staff, ou un recruteur
+   dont une offre a reçu une candidature de ce candidat
+2. le fichier est envoyé par nginx (en-tête X-Accel-Redirect vers la location
+   "internal" /protected-media/) : aucun worker gunicorn n'est occupé pendant
+   le transfert. Sans nginx (USE_X_ACCEL_REDIRECT=0, dev) : FileResponse.
+
+Le lien cv_url des serializers contient un jeton signé (viewer + profil) : il
+fonctionne dans un simple <a href> où le JWT n'est pas envoyé. Les droits du
+viewer sont revérifiés à chaque téléchargement. Les validateurs de
+/api/profiles/me/ changent à chaque fenêtre de CV_URL_MAX_AGE secondes
+(cv_url_window) : un 304 ne garde pas un lien au-delà de sa fenêtre, et le
+jeton est accepté pendant deux fenêtres (celle où il est émis et la suivante).
+"""
+import mimetypes
+import posixpath
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.http import FileResponse, HttpResponse
+from django.urls import reverse
+
+from .models import Application
+
+TOKEN_SALT = "jobs.cv-download"
+
+
+def can_download_cv(user, profile):
+    if not user or not user.is_authenticated:
+        return False
+    if user.is_staff or user.pk == profile.user_id:
+        return True
+    return Application.objects.filter(user_id=profile.user_id, job_offer__company__owner=user).exists()
+
+
+def cv_url_window(now=None):
+    """Début (datetime UTC) de la fenêtre de CV_URL_MAX_AGE secondes en cours."""
+    now = time.time() if now is None else now
+    return datetime.fromtimestamp(now - now % settings.CV_URL_MAX_AGE, tz=timezone.utc)
+
+
+def cv_download_url(request, profile):
+    """URL absolue (jeton signé pour l'utilisateur de la requête), ou None sans CV."""
+    if not profile.cv:
+        return None
+    url = reverse("profile-cv", kwargs={"pk": profile.pk})
+    user = getattr(request, "user", None) if request else None
+    if user is not None and user.is_authenticated:
+        token = signing.dumps({"p": profile.pk, "u": user.pk}, salt=TOKEN_SALT, compress=True)
+        url = f"{url}?token={token}"
+    return request.build_absolute_uri(url) if request else url
+
+
+def token_user(token, profile):
+    """Utilisateur porteur du jeton, ou None si le jeton est invalide, expiré ou pour un autre profil."""
+    try:
+        # Deux fenêtres : un lien émis en fin de fenêtre reste utilisable après le dernier 304
+        data = signing.loads(token, salt=TOKEN_SALT, max_age=2 * settings.CV_URL_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if data.get("p") != profile.pk:
+        return None
+    return get_user_model().objects.filter(pk=data.get("u"), is_active=True).first()
+
+
+def protected_file_response(fieldfile, download_name):
+    """Réponse qui envoie le fichier : X-Accel-Redirect si nginx est devant, sinon FileResponse."""
+    content_type = mimetypes.guess_type(fieldfile.name)[0] or "application/octet-stream"
+    disposition = f"inline; filename*=UTF-8''{quote(download_name)}"
+    if settings.USE_X_ACCEL_REDIRECT:
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = quote(posixpath.join(settings.PROTECTED_MEDIA_URL, fieldfile.name))
+    else:
+        response = FileResponse(fieldfile.open("rb"), content_type=content_type)
+    response["Content-Disposition"] = disposition
+    response["Cache-Control"] = "private, no-store"
+    response["X-Content-Type-Options"] = "nosniff"
+    return response
@@ -0,0 +1,86 @@
+"""
+jobs/query_budget.py - Budget de requêtes SQL
+=============================================
+
+Vérifie qu'un bloc de code (vue, sérialisation d'une page...) exécute au plus
+N requêtes SQL, quelle que soit la taille des données : c'est ce qui détecte
+un N+1 (une requête par ligne) introduit par un nouveau champ de serializer.
+
+    from jobs.query_budget import assert_max_queries
+
+    with assert_max_queries(3):
+        client.get("/api/applications/")
+
+Les requêtes de toutes les connexions sont comptées ("default" et réplicas,
+core/db_router.py) : une lecture routée vers un réplica n'échappe pas au budget.
+
+Utilisable dans les tests comme dans un shell Django (python manage.py shell).
+"""
+from contextlib import ExitStack, contextmanager
+
+from django.core.signals import request_started
+from django.db import DEFAULT_DB_ALIAS, connections, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Le bloc a exécuté plus de requêtes que le budget autorisé."""
+
+
+class _IdleCaptureQueriesContext(CaptureQueriesContext):
+    """CaptureQueriesContext qui n'ouvre pas la connexion : un réplica inutilisé (ou en panne) n'est pas contacté."""
+
+    def __enter__(self):
+        self.force_debug_cursor = self.connection.force_debug_cursor
+        self.connection.force_debug_cursor = True
+        self.initial_queries = len(self.connection.queries_log)
+        self.final_queries = None
+        request_started.disconnect(reset_queries)
+        return self
+
+
+def _capture(alias):
+    capture_class = CaptureQueriesContext if alias == DEFAULT_DB_ALIAS else _IdleCaptureQueriesContext
+    return capture_class(connections[alias])
+
+
+class CapturedQueries:
+    """Requêtes capturées sur plusieurs connexions : {"alias", "sql", "time"}."""
+
+    def __init__(self, contexts):
+        self.contexts = contexts
+
+    @property
+    def captured_queries(self):
+        return [
+            {"alias": alias, **query}
+            for alias, context in self.contexts.items()
+            for query in context.captured_queries
+        ]
+
+    def __len__(self):
+        return sum(len(context) for context in self.contexts.values())
+
+
+@contextmanager
+def assert_max_queries(budget, using=None):
+    """
+    Lève QueryBudgetExceeded si le bloc exécute plus de `budget` requêtes, toutes
+    connexions confondues (ou sur la seule connexion `using`). Le message liste
+    les requêtes exécutées.
+    """
+    aliases = [using] if using is not None else list(connections)
+    with ExitStack() as stack:
+        captured = CapturedQueries({
+            alias: stack.enter_context(_capture(alias)) for alias in aliases
+        })
+        yield captured
+    executed = len(captured)
+    if executed > budget:
+        queries = "\n".join(
+            f"{index}. [{query['alias']}] {query['sql']}"
+            for index, query in enumerate(captured.captured_queries, start=1)
+        )
+        raise QueryBudgetExceeded(
+            f"{executed} requêtes exécutées pour un budget de {budget} :\n{queries}"
+        )
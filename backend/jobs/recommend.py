@@ -0,0 +1,357 @@
+"""
+jobs/recommend.py - Recommandation d'offres (TF-IDF, GET /api/jobs/recommended/)
+================================================================================
+
+Les offres (titre + description) sont vectorisées hors ligne en TF-IDF, sur un
+espace de N_FEATURES dimensions par hachage des mots (pas de vocabulaire à
+maintenir entre deux mises à jour). Le profil candidat (skills + experience)
+est vectorisé de la même façon : le score est le cosinus entre les deux.
+
+Stockage (RECOMMEND_INDEX_DIR, partagé par l'API et les workers Celery) :
+- seg_<n>/ : un segment = une matrice creuse scipy (data, indices, indptr .npy)
+             stockée par colonnes (CSC : pour chaque dimension, les offres qui la
+             contiennent = index inversé) + ids.npy (id des offres, une par ligne),
+             lignes normalisées L2
+- df_<version>.npy : nombre d'offres contenant chaque dimension (pour l'IDF)
+- meta.json : version, nombre d'offres, dernier id indexé, segments actifs
+              (écrit en dernier, par os.replace : une mise à jour est atomique)
+
+Mise à jour :
+- update_index() (Celery beat, toutes les minutes) : un nouveau segment pour les
+  offres créées depuis le dernier passage
+- rebuild_index() (chaque nuit, ou au-delà de MAX_SEGMENTS segments) :
+  reconstruction complète (IDF recalculé, offres modifiées / supprimées prises en compte)
+
+Lecture : les .npy sont ouverts avec np.load(mmap_mode="r") : les pages sont
+dans le cache du système, partagées par tous les process gunicorn. Le top-k est
+un produit matrice × vecteur par segment puis np.argpartition (pas de boucle
+Python par offre) ne lisant que les colonnes des mots du profil.
+Mesure : python manage.py bench_recommend --offers 500000
+"""
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+N_FEATURES = 2 ** 18
+SEGMENT_SIZE = 50000
+MAX_SEGMENTS = 20
+RELOAD_INTERVAL = 5
+LOCK_KEY = "recommend:index:lock"
+LOCK_TTL = 60 * 30
+TOKEN_RE = re.compile(r"[\w+#]{2,}")
+STOP_WORDS = frozenset(
+    "le la les un une des de du et ou en au aux pour par sur avec dans the and for with of to in on at".split()
+)
+
+
+# ---- Vectorisation ----
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall((text or "").casefold()) if token not in STOP_WORDS]
+
+
+def hashed_counts(text):
+    """(dimensions, occurrences) du texte, dimensions = crc32(mot) % N_FEATURES."""
+    counts = {}
+    for token in tokenize(text):
+        index = zlib.crc32(token.encode()) % N_FEATURES
+        counts[index] = counts.get(index, 0) + 1
+    indices = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+    values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+    order = np.argsort(indices)
+    return indices[order], values[order]
+
+
+def idf_weights(df, n_docs):
+    """IDF lissé : log((1 + n) / (1 + df)) + 1."""
+    return (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+
+
+def _weighted(indices, counts, idf):
+    """TF sous-linéaire (1 + log tf) × IDF, normalisé L2."""
+    values = (1.0 + np.log(counts)) * idf[indices]
+    norm = float(np.sqrt(np.dot(values, values)))
+    return values / norm if norm else values
+
+
+def build_matrix(rows, idf):
+    """rows = [(job_id, (dimensions, occurrences))] → (ids int64, matrice CSR float32)."""
+    ids = np.empty(len(rows), dtype=np.int64)
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    all_indices, all_values = [], []
+    for row, (job_id, (indices, counts)) in enumerate(rows):
+        ids[row] = job_id
+        all_indices.append(indices)
+        all_values.append(_weighted(indices, counts, idf))
+        indptr[row + 1] = indptr[row] + len(indices)
+    indices = np.concatenate(all_indices) if all_indices else np.empty(0, dtype=np.int32)
+    values = np.concatenate(all_values).astype(np.float32) if all_values else np.empty(0, dtype=np.float32)
+    matrix = sparse.csr_matrix((values, indices, indptr), shape=(len(rows), N_FEATURES))
+    return ids, matrix
+
+
+def query_vector(text, idf):
+    """(dimensions, poids) du profil, pondérés et normalisés comme les offres."""
+    indices, counts = hashed_counts(text)
+    return indices, _weighted(indices, counts, idf).astype(np.float32)
+
+
+# ---- Stockage sur disque ----
+
+def index_dir():
+    return Path(settings.RECOMMEND_INDEX_DIR)
+
+
+def read_meta(path=None):
+    try:
+        with open((path or index_dir()) / "meta.json") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_meta(path, meta):
+    tmp = path / "meta.json.tmp"
+    with open(tmp, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp, path / "meta.json")
+
+
+def _save_array(path, name, array):
+    np.save(path / f"{name}.npy", np.ascontiguousarray(array))
+
+
+def write_segment(path, name, ids, matrix):
+    """Écrit le segment (en CSC) dans un dossier temporaire puis le renomme (jamais lu à moitié écrit)."""
+    matrix = matrix.tocsc()
+    matrix.sort_indices()
+    tmp = path / f"{name}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    _save_array(tmp, "ids", ids)
+    _save_array(tmp, "data", matrix.data.astype(np.float32))
+    index_dtype = np.int32 if matrix.nnz < np.iinfo(np.int32).max else np.int64
+    _save_array(tmp, "indices", matrix.indices.astype(index_dtype))
+    _save_array(tmp, "indptr", matrix.indptr.astype(index_dtype))
+    os.replace(tmp, path / name)
+
+
+def _cleanup(path, meta):
+    """Supprime les segments et fichiers df qui ne sont plus référencés (les mmap ouverts restent valides)."""
+    keep = set(meta["segments"]) | {meta["df"], "meta.json"}
+    for entry in path.iterdir():
+        if entry.name not in keep:
+            if entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                entry.unlink(missing_ok=True)
+
+
+def _offer_rows(queryset):
+    """(id, vecteur haché) des offres, lues en streaming."""
+    for job_id, title, description in queryset.values_list("id", "title", "description").iterator(chunk_size=2000):
+        yield job_id, hashed_counts(f"{title}\n{title}\n{description}")
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _add_df(df, rows):
+    for _, (indices, _counts) in rows:
+        df[indices] += 1
+
+
+# ---- Mise à jour (tâches Celery) ----
+
+def _database_rows(max_id=None):
+    from .models import JobOffer
+
+    queryset = JobOffer.objects.order_by("id")
+    if max_id is not None:
+        queryset = queryset.filter(id__lte=max_id)
+    return _offer_rows(queryset)
+
+
+def rebuild_index(path=None, rows=_database_rows):
+    """
+    Reconstruction complète : IDF calculé sur toutes les offres, segments de SEGMENT_SIZE offres.
+    rows(max_id) : itérateur (job_id, vecteur haché) trié par id (les offres en base par défaut).
+    """
+    path = path or index_dir()
+    path.mkdir(parents=True, exist_ok=True)
+    previous = read_meta(path) or {"version": 0}
+    version = previous["version"] + 1
+
+    # Passe 1 : fréquences documentaires
+    df = np.zeros(N_FEATURES, dtype=np.int64)
+    n_docs, last_job_id = 0, 0
+    for chunk in _chunks(rows(None), SEGMENT_SIZE):
+        _add_df(df, chunk)
+        n_docs += len(chunk)
+        last_job_id = chunk[-1][0]
+    idf = idf_weights(df, n_docs)
+
+    # Passe 2 : segments (sur les offres lues en passe 1 uniquement)
+    segments = []
+    for number, chunk in enumerate(_chunks(rows(last_job_id), SEGMENT_SIZE)):
+        name = f"seg_{version:06d}_{number:04d}"
+        write_segment(path, name, *build_matrix(chunk, idf))
+        segments.append(name)
+
+    df_name = f"df_{version:06d}.npy"
+    np.save(path / df_name, df)
+    meta = {"version": version, "n_docs": n_docs, "last_job_id": last_job_id, "segments": segments, "df": df_name}
+    _write_meta(path, meta)
+    _cleanup(path, meta)
+    return meta
+
+
+def update_index(path=None):
+    """
+    Ajoute un segment pour les offres créées depuis le dernier passage.
+    L'IDF est mis à jour pour les requêtes ; les segments existants gardent le
+    leur jusqu'à la prochaine reconstruction.
+    """
+    from .models import JobOffer
+
+    path = path or index_dir()
+    meta = read_meta(path)
+    if meta is None or len(meta["segments"]) >= MAX_SEGMENTS:
+        return rebuild_index(path)
+    rows = list(_offer_rows(JobOffer.objects.filter(id__gt=meta["last_job_id"]).order_by("id")[:SEGMENT_SIZE]))
+    if not rows:
+        return meta
+
+    version = meta["version"] + 1
+    df = np.load(path / meta["df"])
+    _add_df(df, rows)
+    n_docs = meta["n_docs"] + len(rows)
+    name = f"seg_{version:06d}_0000"
+    write_segment(path, name, *build_matrix(rows, idf_weights(df, n_docs)))
+
+    df_name = f"df_{version:06d}.npy"
+    np.save(path / df_name, df)
+    meta = {
+        "version": version,
+        "n_docs": n_docs,
+        "last_job_id": rows[-1][0],
+        "segments": meta["segments"] + [name],
+        "df": df_name,
+    }
+    _write_meta(path, meta)
+    _cleanup(path, meta)
+    return meta
+
+
+def locked(func):
+    """Un seul constructeur d'index à la fois (plusieurs workers Celery)."""
+    if not cache.add(LOCK_KEY, 1, LOCK_TTL):
+        logger.info("recommend: index déjà en cours de construction")
+        return None
+    try:
+        return func()
+    finally:
+        cache.delete(LOCK_KEY)
+
+
+# ---- Lecture (API) ----
+
+class Segment:
+    def __init__(self, path):
+        def load(name):
+            return np.load(path / f"{name}.npy", mmap_mode="r")
+
+        self.ids = load("ids")
+        # copy=False : la matrice référence les tableaux mmap (indices et indptr de même type, sinon scipy convertit)
+        self.matrix = sparse.csc_matrix(
+            (load("data"), load("indices"), load("indptr")), shape=(len(self.ids), N_FEATURES), copy=False
+        )
+
+    def top(self, columns, weights, k):
+        """(ids, scores) des k meilleures lignes du segment (non triées)."""
+        # Seules les colonnes des mots du profil sont lues : coût ∝ nb d'offres qui les contiennent
+        scores = self.matrix[:, columns] @ weights
+        if len(scores) > k:
+            best = np.argpartition(scores, -k)[-k:]
+            return self.ids[best], scores[best]
+        return np.asarray(self.ids), scores
+
+
+class RecommendationIndex:
+    """Index chargé en mémoire partagée (mmap) ; une instance par version de meta.json."""
+
+    def __init__(self, path, meta):
+        self.version = meta["version"]
+        self.idf = idf_weights(np.load(path / meta["df"], mmap_mode="r"), meta["n_docs"])
+        self.segments = [Segment(path / name) for name in meta["segments"]]
+
+    def top_k(self, text, k=10, exclude=()):
+        """[(job_id, score)] triés par score décroissant, sans les offres de exclude."""
+        columns, weights = query_vector(text, self.idf)
+        if not len(columns) or not self.segments:
+            return []
+        wanted = k + len(exclude)
+        parts = [segment.top(columns, weights, wanted) for segment in self.segments]
+        ids = np.concatenate([p[0] for p in parts])
+        scores = np.concatenate([p[1] for p in parts])
+        keep = (scores > 0) & ~np.isin(ids, np.fromiter(exclude, dtype=np.int64, count=len(exclude)))
+        ids, scores = ids[keep], scores[keep]
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [(int(ids[i]), float(scores[i])) for i in order]
+
+
+_index = None
+_index_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """Index courant du process ; meta.json relu au plus toutes les RELOAD_INTERVAL secondes."""
+    global _index, _index_checked_at
+    now = time.monotonic()
+    if _index is not None and now - _index_checked_at < RELOAD_INTERVAL:
+        return _index
+    with _index_lock:
+        _index_checked_at = now
+        meta = read_meta()
+        if meta is None:
+            _index = None
+        elif _index is None or _index.version != meta["version"]:
+            try:
+                _index = RecommendationIndex(index_dir(), meta)
+            except FileNotFoundError:
+                # Reconstruction en cours entre la lecture de meta.json et des segments : on garde l'ancien
+                logger.warning("recommend: index version %s incomplet, nouvel essai plus tard", meta["version"])
+    return _index
+
+
+def profile_text(profile):
+    return f"{profile.skills}\n{profile.skills}\n{profile.experience}"
+
+
+def recommend_job_ids(profile, k=10, exclude=()):
+    index = get_index()
+    if index is None:
+        return []
+    return index.top_k(profile_text(profile), k=k, exclude=exclude)
@@ -0,0 +1,73 @@
+"""
+jobs/search.py - Recherche plein texte PostgreSQL pour les offres
+=================================================================
+
+Remplace le SearchFilter de DRF (3 ILIKE '%terme%' + jointure Company) par
+une recherche sur un tsvector stocké et indexé (GIN) :
+- poids A : titre de l'offre
+- poids B : nom de l'entreprise
+- poids C : description
+- configuration "french" : stemming (développeur / développeurs, etc.)
+
+Le vecteur est recalculé par les signals (jobs/signals.py) à chaque écriture.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, FloatField, OuterRef, Subquery
+from django.db.models.functions import Cast
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+from .models import Company
+
+SEARCH_CONFIG = "french"
+
+
+def job_offer_search_vector():
+    """
+    Expression du tsvector pondéré d'une offre.
+
+    Le nom de l'entreprise passe par une sous-requête : un UPDATE ne peut pas
+    référencer un champ joint (company__name).
+    """
+    company_name = Subquery(Company.objects.filter(pk=OuterRef("company_id")).order_by().values("name")[:1])
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector(company_name, weight="B", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(queryset):
+    """Recalcule search_vector pour les offres du queryset (un seul UPDATE)."""
+    return queryset.update(search_vector=job_offer_search_vector())
+
+
+class JobOfferSearchFilter(SearchFilter):
+    """
+    Filtre ?search= basé sur le tsvector de JobOffer.
+
+    - Syntaxe "websearch" : mots (ET implicite), "phrase exacte", -exclusion, OR
+    - Sans ?ordering= explicite, les résultats sont triés par pertinence (ts_rank)
+      puis selon le tri par défaut de la vue.
+
+    Doit être placé APRÈS OrderingFilter dans filter_backends pour que le tri
+    par pertinence ne soit pas écrasé par le tri par défaut.
+    """
+
+    search_description = "Recherche plein texte (titre, entreprise, description)."
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        query = SearchQuery(" ".join(terms), search_type="websearch", config=SEARCH_CONFIG)
+        # ts_rank renvoie un real (float4) : converti en double précision pour que la
+        # valeur du curseur (float Python) se compare exactement (jobs/pagination.py)
+        queryset = queryset.filter(search_vector=query).annotate(
+            search_rank=Cast(SearchRank(F("search_vector"), query), FloatField())
+        )
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            return queryset
+        return queryset.order_by("-search_rank", *queryset.query.order_by)
+
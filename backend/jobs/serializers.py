@@ -1,8 +1,11 @@
 """
 jobs/serializers.py - Serializers pour JobOffer, Company, Application, CandidateProfile
 """
+from django.conf import settings
 from rest_framework import serializers
 from .models import JobOffer, Company, Application, CandidateProfile
+from .protected_media import cv_download_url
+from .uploads import CV_SIGNATURES, cv_extension
 
 
 class CandidateProfileSerializer(serializers.ModelSerializer):
@@ -24,14 +27,20 @@ class CandidateProfileSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
+        # Le chemin /media/cvs/... n'est pas servi : lecture via cv_url
+        extra_kwargs = {"cv": {"write_only": True}}
+
+    def validate_cv(self, value):
+        # Deuxième ligne de défense si le fichier n'est pas passé par CVUploadHandler
+        if value and cv_extension(value.name) not in CV_SIGNATURES:
+            raise serializers.ValidationError(f"Formats acceptés : {', '.join(CV_SIGNATURES)}.")
+        if value and value.size > settings.CV_MAX_UPLOAD_SIZE:
+            raise serializers.ValidationError("Fichier trop volumineux.")
+        return value
 
     def get_cv_url(self, obj):
-        if obj.cv:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.cv.url)
-            return obj.cv.url
-        return None
+        # Lien protégé et signé (jobs/protected_media.py), plus /media/ directement
+        return cv_download_url(self.context.get("request"), obj)
 
 
 class CandidateProfileBriefSerializer(serializers.ModelSerializer):
@@ -44,12 +53,8 @@ class CandidateProfileBriefSerializer(serializers.ModelSerializer):
         fields = ["full_name", "phone", "cv_url", "cover_letter", "skills"]
 
     def get_cv_url(self, obj):
-        if obj.cv:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.cv.url)
-            return obj.cv.url
-        return None
+        # Lien protégé et signé (jobs/protected_media.py), plus /media/ directement
+        return cv_download_url(self.context.get("request"), obj)
 
 
 class CompanySerializer(serializers.ModelSerializer):
@@ -57,8 +62,8 @@ class CompanySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Company
-        fields = ["id", "name", "sector", "description", "owner", "created_at"]
-        read_only_fields = ["id", "created_at"]
+        fields = ["id", "name", "sector", "description", "owner", "created_at", "updated_at"]
+        read_only_fields = ["id", "created_at", "updated_at"]
 
 
 class JobOfferSerializer(serializers.ModelSerializer):
@@ -79,9 +84,12 @@ class JobOfferSerializer(serializers.ModelSerializer):
             "description",
             "salary",
             "location",
+            "latitude",
+            "longitude",
             "created_at",
+            "updated_at",
         ]
-        read_only_fields = ["id", "created_at"]
+        read_only_fields = ["id", "latitude", "longitude", "created_at", "updated_at"]
 
 
 class ApplicationSerializer(serializers.ModelSerializer):
@@ -107,8 +115,37 @@ class ApplicationSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "user", "status", "created_at"]
 
     def get_candidate_profile(self, obj):
+        # Le queryset doit faire select_related("user__candidate_profile") :
+        # sinon chaque ligne coûte une requête (voir ApplicationViewSet.get_queryset)
         try:
             profile = obj.user.candidate_profile
             return CandidateProfileBriefSerializer(profile, context=self.context).data
         except CandidateProfile.DoesNotExist:
             return None
+
+
+class RecruiterOfferSerializer(serializers.ModelSerializer):
+    """Offre d'un recruteur avec ses compteurs de candidatures (annotés par la vue)."""
+
+    company_name = serializers.CharField(source="company.name", read_only=True, default=None)
+    applications_count = serializers.IntegerField(read_only=True)
+    pending_count = serializers.IntegerField(read_only=True)
+    accepted_count = serializers.IntegerField(read_only=True)
+    rejected_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = JobOffer
+        fields = [
+            "id",
+            "title",
+            "company",
+            "company_name",
+            "location",
+            "salary",
+            "created_at",
+            "applications_count",
+            "pending_count",
+            "accepted_count",
+            "rejected_count",
+        ]
+        read_only_fields = fields
@@ -8,14 +8,35 @@ Les Signals permettent d'exécuter du code lors d'événements du modèle :
 - post_delete : après suppression
 - etc.
 
-Ici : à chaque création/mise à jour d'une JobOffer, on envoie une notification
-via Celery (de manière asynchrone pour ne pas bloquer la requête).
+Ici : à chaque création d'une JobOffer, on écrit un événement dans l'outbox
+(jobs/outbox.py), publié vers Celery après le COMMIT par drain_outbox_task ; et on
+maintient le vecteur de recherche plein texte (jobs/search.py), le
+classement des offres tendances (jobs/trending.py) et la génération du cache
+de GET /api/jobs/ (jobs/cache.py). Les compétences des profils candidats sont
+normalisées à chaque save() (jobs/skills.py) et le texte de leur CV extrait
+par Celery quand le fichier change (jobs/cv.py). Le lieu des offres est
+géocodé avant chaque save() (jobs/geo.py). L'état des utilisateurs mis en cache
+pour l'authentification JWT (core/auth.py) est supprimé quand User ou
+UserProfile change.
 """
-from django.db.models.signals import post_save
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import JobOffer
-from .tasks import send_job_notification_task
+from core.auth import invalidate_user
+
+from . import geo, outbox, skills, trending
+from .cache import bump_generation
+from .models import Application, CandidateProfile, Company, JobOffer, UserProfile
+from .search import update_search_vectors
+
+
+@receiver(pre_save, sender=JobOffer)
+def job_offer_pre_save(sender, instance, update_fields=None, **kwargs):
+    """Coordonnées recalculées depuis location (recherche en mémoire dans le gazetteer)."""
+    if update_fields is None or "location" in update_fields:
+        geo.set_coordinates(instance)
 
 
 @receiver(post_save, sender=JobOffer)
@@ -24,13 +45,100 @@ def job_offer_post_save(sender, instance, created, **kwargs):
     Déclenché après chaque save() sur JobOffer.
     
     - created=True : c'est une création (pas une mise à jour)
-    - On appelle la tâche Celery pour envoyer la notification en arrière-plan
-    - .delay() = exécution asynchrone (ne bloque pas)
+    - On recalcule le search_vector (UPDATE ciblé, pas de nouveau save())
+    - On écrit l'événement de notification dans l'outbox : même transaction que
+      l'offre (si le save() est dans un transaction.atomic), aucun appel au broker
     """
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and "location" in update_fields and "latitude" not in update_fields:
+        # save(update_fields=["location"]) : les coordonnées calculées en pre_save ne sont pas écrites
+        JobOffer.objects.filter(pk=instance.pk).update(latitude=instance.latitude, longitude=instance.longitude)
+    update_search_vectors(JobOffer.objects.filter(pk=instance.pk))
+    # Après le COMMIT : avant, une lecture concurrente remettrait l'ancienne version en cache
+    job_id = instance.pk
+    transaction.on_commit(lambda: trending.invalidate_jobs([job_id]))
+    transaction.on_commit(bump_generation)
     if created:
         company_name = instance.company.name if instance.company else "N/A"
-        send_job_notification_task.delay(
-            job_id=instance.id,
-            job_title=instance.title,
-            company=company_name,
+        outbox.enqueue(outbox.TOPIC_JOB_CREATED, {
+            "job_id": instance.id,
+            "job_title": instance.title,
+            "company": company_name,
+        })
+        outbox.enqueue(outbox.TOPIC_JOB_MATCH_CANDIDATES, {"job_ids": [instance.id]})
+
+
+@receiver(post_save, sender=Company)
+def company_post_save(sender, instance, created, **kwargs):
+    """Le nom de l'entreprise fait partie du search_vector et de la sérialisation de ses offres."""
+    if not created:
+        offers = JobOffer.objects.filter(company=instance)
+        update_search_vectors(offers)
+        job_ids = list(offers.values_list("pk", flat=True))
+        transaction.on_commit(lambda: trending.invalidate_jobs(job_ids))
+    transaction.on_commit(bump_generation)
+
+
+@receiver(post_delete, sender=Company)
+def company_post_delete(sender, instance, **kwargs):
+    transaction.on_commit(bump_generation)
+
+
+@receiver(post_delete, sender=JobOffer)
+def job_offer_post_delete(sender, instance, **kwargs):
+    """Une offre supprimée disparaît immédiatement des tendances et des listes en cache."""
+    job_id = instance.pk
+    transaction.on_commit(lambda: trending.forget_job(job_id))
+    transaction.on_commit(bump_generation)
+
+
+@receiver(post_save, sender=Application)
+def application_post_save(sender, instance, created, **kwargs):
+    """Chaque nouvelle candidature fait monter le score tendance de l'offre (après commit)."""
+    if created:
+        transaction.on_commit(
+            lambda: trending.record_application(instance.job_offer_id, instance.created_at)
         )
+
+
+@receiver(post_init, sender=CandidateProfile)
+def candidate_profile_post_init(sender, instance, **kwargs):
+    """Mémorise le fichier du CV au chargement pour détecter un nouvel upload (sans requête)."""
+    instance._loaded_cv_name = instance.__dict__.get("cv")
+
+
+@receiver(post_save, sender=CandidateProfile)
+def candidate_profile_post_save(sender, instance, update_fields=None, **kwargs):
+    """
+    - Tient à jour les compétences normalisées (index inversé CandidateSkill) du profil
+    - Nouveau CV : extraction du texte par Celery après le COMMIT (fichier et ligne visibles)
+    """
+    from .tasks import extract_cv_task
+
+    if update_fields is None or "skills" in update_fields:
+        skills.sync_profiles([instance])
+    if "cv" not in instance.__dict__:
+        return  # champ différé (only / defer) : le CV n'a pas été modifié
+    cv_name = instance.cv.name or ""
+    if cv_name != (getattr(instance._loaded_cv_name, "name", instance._loaded_cv_name) or ""):
+        profile_id = instance.pk
+        transaction.on_commit(lambda: extract_cv_task.delay(profile_id))
+    instance._loaded_cv_name = cv_name
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def user_post_save(sender, instance, update_fields=None, **kwargs):
+    """Compte modifié (username, is_active, is_staff...) : état d'authentification relu au prochain appel."""
+    if update_fields is not None and set(update_fields) <= {"last_login", "password"}:
+        return
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_user(user_id))
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def user_profile_post_save(sender, instance, **kwargs):
+    """Rôle modifié : les jetons portant l'ancien rôle sont refusés (401 token_stale) jusqu'au rafraîchissement."""
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_user(user_id))
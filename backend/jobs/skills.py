@@ -0,0 +1,122 @@
+"""
+jobs/skills.py - Compétences normalisées et candidats correspondant à une offre
+===============================================================================
+
+CandidateProfile.skills reste le champ texte saisi par le candidat ("Python, Django").
+Il est découpé et normalisé dans Skill / CandidateSkill :
+
+- sync_profiles() : à chaque save() du profil (jobs/signals.py) et par lots dans
+  `python manage.py backfill_skills` pour les profils existants
+- matching_candidates() : les termes de l'offre (titre + description, n-grammes
+  de 1 à MAX_SKILL_WORDS mots) sont cherchés dans Skill.name (index unique), puis
+  UNE requête GROUP BY sur l'index inversé CandidateSkill(skill, profile) donne
+  les candidats, triés par nombre de compétences en commun
+- notify_matching_candidates() : parcours en streaming (iterator) et envoi par
+  paquets dans le pipeline de notifications (jobs/notifications.py)
+"""
+import re
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+
+from . import notifications
+from .models import CandidateSkill, JobOffer, Skill
+
+MAX_SKILL_LENGTH = 100
+MAX_SKILL_WORDS = 3
+# "c++", "c#", "node.js" : on garde + # . dans les mots
+WORD_RE = re.compile(r"[\w+#.]+")
+NOTIFY_CHUNK_SIZE = 500
+
+
+def normalize_skill(name):
+    """Minuscules, espaces réduits, ponctuation de fin retirée ; "" si vide ou trop long."""
+    name = " ".join(name.casefold().split()).strip(" .;:")
+    return name if len(name) <= MAX_SKILL_LENGTH else ""
+
+
+def parse_skills(text):
+    """Texte libre séparé par des virgules (ou ; / retours à la ligne) → ensemble de noms normalisés."""
+    parts = re.split(r"[,;\n]", text or "")
+    return {name for name in (normalize_skill(part) for part in parts) if name}
+
+
+def resolve_skills(names):
+    """{nom normalisé: id} ; les compétences manquantes sont créées (2 requêtes)."""
+    if not names:
+        return {}
+    Skill.objects.bulk_create([Skill(name=name) for name in names], ignore_conflicts=True)
+    return dict(Skill.objects.filter(name__in=names).values_list("name", "id"))
+
+
+def sync_profiles(profiles):
+    """
+    Remplace les compétences normalisées des profils par celles de leur champ skills.
+    Un nombre de requêtes constant quel que soit le nombre de profils du lot.
+    """
+    wanted = {profile.pk: parse_skills(profile.skills) for profile in profiles}
+    with transaction.atomic():
+        ids = resolve_skills(set().union(*wanted.values()))
+        CandidateSkill.objects.filter(profile_id__in=wanted).delete()
+        CandidateSkill.objects.bulk_create([
+            CandidateSkill(profile_id=profile_id, skill_id=ids[name])
+            for profile_id, names in wanted.items()
+            for name in names
+        ])
+
+
+def job_terms(offer):
+    """N-grammes (1 à MAX_SKILL_WORDS mots) du titre et de la description de l'offre."""
+    words = [word.strip(".") for word in WORD_RE.findall(f"{offer.title}\n{offer.description}".casefold())]
+    words = [word for word in words if word]
+    terms = set()
+    for size in range(1, MAX_SKILL_WORDS + 1):
+        for i in range(len(words) - size + 1):
+            term = " ".join(words[i:i + size])
+            if len(term) <= MAX_SKILL_LENGTH:
+                terms.add(term)
+    return terms
+
+
+def matching_candidates(offer, min_skills=None):
+    """
+    Candidats ayant au moins min_skills compétences citées dans l'offre :
+    QuerySet de dicts {"profile_id", "email", "matched"} trié par matched décroissant.
+    """
+    if min_skills is None:
+        min_skills = settings.JOBS_MATCH_MIN_SKILLS
+    skill_ids = list(Skill.objects.filter(name__in=job_terms(offer)).values_list("id", flat=True))
+    if not skill_ids:
+        return CandidateSkill.objects.none()
+    return (
+        CandidateSkill.objects.filter(skill_id__in=skill_ids)
+        .exclude(profile__user__email="")
+        .values("profile_id", email=F("profile__user__email"))
+        .annotate(matched=Count("skill_id"))
+        .filter(matched__gte=min_skills)
+        .order_by("-matched", "profile_id")
+    )
+
+
+def notify_matching_candidates(job_ids):
+    """Notifie les candidats correspondant à chaque offre ; retourne le nombre de messages mis en file."""
+    queued = 0
+    offers = JobOffer.objects.filter(pk__in=job_ids).select_related("company").only(
+        "id", "title", "description", "company__name"
+    )
+    for offer in offers:
+        company = offer.company.name if offer.company else "N/A"
+        chunk = []
+        for row in matching_candidates(offer).iterator(chunk_size=NOTIFY_CHUNK_SIZE):
+            chunk.append(notifications.message(
+                [row["email"]],
+                f"Une offre correspond à votre profil : {offer.title}",
+                f"{offer.title} chez {company} correspond à {row['matched']} de vos compétences "
+                f"(offre #{offer.id} sur JobPulse).",
+            ))
+            if len(chunk) >= NOTIFY_CHUNK_SIZE:
+                queued += notifications.enqueue(chunk)
+                chunk = []
+        queued += notifications.enqueue(chunk)
+    return queued
@@ -6,24 +6,182 @@ Les tâches Celery s'exécutent en arrière-plan (dans le worker).
 Elles sont appelées de manière asynchrone : la requête HTTP ne bloque pas.
 
 Exemple : envoi d'email après création d'une offre.
+
+Les tâches de notification sont publiées par l'outbox (jobs/outbox.py) avec un
+event_id : livraison "au moins une fois", les doublons sont ignorés. Elles
+passent par la queue "notifications" (CELERY_TASK_ROUTES) et mettent les
+messages en file : l'envoi SMTP est groupé par flush_notifications_task
+(jobs/notifications.py).
 """
-import time
+import logging
+
 from celery import shared_task
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+
+from . import notifications
+from .outbox import claim_event, release_event
+
+logger = logging.getLogger(__name__)
 
 
 @shared_task
-def send_job_notification_task(job_id: int, job_title: str, company: str):
+def send_job_notification_task(job_id: int, job_title: str, company: str, event_id: int = None):
     """
-    Simule l'envoi d'un email de notification pour une nouvelle offre.
-    
-    En production, on remplacerait time.sleep(5) par un vrai envoi (SendGrid, etc.)
+    Notification d'une nouvelle offre : le message est mis en file (jobs/notifications.py)
+    et envoyé avec les autres par flush_notifications_task. Ne bloque plus le worker.
     
     Args:
         job_id: ID de l'offre créée
         job_title: Titre du poste
         company: Nom de l'entreprise
+        event_id: ID de l'OutboxEvent (déduplication)
+    """
+    if not claim_event(event_id):
+        return
+    try:
+        notifications.enqueue(notifications.job_created_messages(job_id, job_title, company))
+    except Exception:
+        release_event(event_id)
+        raise
+
+
+@shared_task
+def send_job_batch_notification_task(job_ids: list, event_id: int = None):
+    """
+    Notification groupée pour un lot d'offres importées (POST /api/jobs/import/).
+    Un seul message récapitulatif par lot au lieu d'un par offre.
+
+    Args:
+        job_ids: IDs des offres créées dans le lot
+        event_id: ID de l'OutboxEvent (déduplication)
     """
-    # Simule le temps d'envoi d'un email (5 secondes)
-    time.sleep(5)
-    # En production : send_mail(...)
-    print(f"[Celery] Notification envoyée pour offre #{job_id}: {job_title} @ {company}")
+    from .models import JobOffer
+
+    if not claim_event(event_id):
+        return
+    try:
+        jobs = JobOffer.objects.filter(pk__in=job_ids).select_related("company").only("id", "title", "company__name")
+        notifications.enqueue(notifications.job_batch_messages(
+            [(job.id, job.title, job.company.name if job.company else "N/A") for job in jobs]
+        ))
+    except Exception:
+        release_event(event_id)
+        raise
+
+
+@shared_task
+def notify_matching_candidates_task(job_ids: list, event_id: int = None):
+    """
+    Notifie les candidats dont les compétences correspondent aux offres créées
+    (une requête sur l'index inversé par offre, jobs/skills.py).
+
+    Args:
+        job_ids: IDs des offres créées
+        event_id: ID de l'OutboxEvent (déduplication)
+    """
+    from .skills import notify_matching_candidates
+
+    if not claim_event(event_id):
+        return
+    try:
+        return notify_matching_candidates(job_ids)
+    except Exception:
+        release_event(event_id)
+        raise
+
+
+@shared_task(bind=True, max_retries=5)
+def flush_notifications_task(self):
+    """
+    Envoie les notifications accumulées pendant NOTIFICATION_BATCH_WINDOW secondes
+    sur une seule connexion SMTP. En cas d'erreur SMTP, les messages restent en
+    file et la tâche est relancée.
+    """
+    try:
+        return notifications.flush()
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=30)
+
+
+@shared_task
+def drain_outbox_task():
+    """Publie les événements en attente de l'outbox (planifiée par Celery beat)."""
+    from .outbox import drain
+
+    return drain()
+
+
+@shared_task
+def purge_outbox_task():
+    """Supprime les événements outbox publiés depuis plus de 7 jours."""
+    from .outbox import purge_published
+
+    return purge_published()
+
+
+@shared_task
+def update_recommend_index_task():
+    """Ajoute les nouvelles offres à l'index de recommandation (planifiée par Celery beat)."""
+    from .recommend import locked, update_index
+
+    meta = locked(update_index)
+    return meta and meta["n_docs"]
+
+
+@shared_task
+def rebuild_recommend_index_task():
+    """Reconstruit entièrement l'index de recommandation (IDF, offres modifiées ou supprimées)."""
+    from .recommend import locked, rebuild_index
+
+    meta = locked(rebuild_index)
+    return meta and meta["n_docs"]
+
+
+@shared_task(
+    soft_time_limit=settings.CV_EXTRACTION_SOFT_TIME_LIMIT,
+    time_limit=settings.CV_EXTRACTION_TIME_LIMIT,
+)
+def extract_cv_task(profile_id: int):
+    """
+    Extrait et indexe le texte du CV d'un profil (jobs/cv.py), sur la queue "cv".
+    Au-delà de CV_EXTRACTION_SOFT_TIME_LIMIT secondes, le fichier est marqué
+    comme traité avec un texte vide ; le worker est tué à CV_EXTRACTION_TIME_LIMIT.
+    """
+    from .cv import process_profile_cv
+
+    try:
+        return process_profile_cv(profile_id)
+    except SoftTimeLimitExceeded:
+        logger.warning("cv: extraction trop longue pour le profil %s, abandonnée", profile_id)
+        return process_profile_cv(profile_id, timed_out=True)
+
+
+@shared_task
+def export_applications_task(user_id: int, params: dict, fmt: str):
+    """
+    Export asynchrone des candidatures (POST /api/applications/export/async/).
+    Retourne le nom du fichier écrit dans MEDIA_ROOT/exports/ (jobs/exports.py).
+    """
+    from django.contrib.auth import get_user_model
+
+    from .exports import export_queryset, write_export
+
+    user = get_user_model().objects.get(pk=user_id)
+    return write_export(export_queryset(user, params), fmt)
+
+
+@shared_task
+def purge_exports_task():
+    """Supprime les fichiers d'export de plus de 24 h."""
+    from .exports import purge_exports
+
+    return purge_exports()
+
+
+@shared_task
+def rebuild_trending_scores_task():
+    """Reconstruit le classement des offres tendances depuis les candidatures (jobs/trending.py)."""
+    from .trending import rebuild_scores
+
+    return rebuild_scores()
@@ -0,0 +1,69 @@
+"""
+Redis en mémoire pour les tests : les commandes utilisées par
+jobs/notifications.py (listes) et core/throttling.py (script du seau à jetons).
+"""
+import math
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+
+class FakeTokenBucketScript:
+    """Équivalent Python de core.throttling.TOKEN_BUCKET_LUA, sur les hashes du FakeRedis."""
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    def __call__(self, keys, args, client=None):
+        redis = client if client is not None else self.redis
+        redis.check()
+        capacity, rate, now = (float(arg) for arg in args)
+        state = redis.hashes.get(keys[0], {})
+        tokens = float(state.get("tokens", capacity))
+        ts = float(state.get("ts", now))
+        tokens = min(capacity, tokens + max(0, now - ts) * rate)
+        allowed, wait = 0, 0
+        if tokens >= 1:
+            tokens -= 1
+            allowed = 1
+        else:
+            wait = (1 - tokens) / rate
+        redis.hashes[keys[0]] = {"tokens": str(tokens), "ts": str(now)}
+        redis.ttls[keys[0]] = math.ceil((capacity - tokens) / rate) + 1
+        return [allowed, str(wait).encode()]
+
+
+class FakeRedis:
+    """Sous-ensemble de redis.Redis ; down=True : chaque commande lève ConnectionError."""
+
+    def __init__(self, down=False):
+        self.down = down
+        self.lists = {}
+        self.hashes = {}
+        self.ttls = {}
+
+    def check(self):
+        if self.down:
+            raise RedisConnectionError("Redis indisponible (test)")
+
+    def rpush(self, key, *values):
+        self.check()
+        self.lists.setdefault(key, []).extend(value.encode() for value in values)
+        return len(self.lists[key])
+
+    def lpush(self, key, *values):
+        self.check()
+        items = self.lists.setdefault(key, [])
+        for value in values:
+            items.insert(0, value.encode())
+        return len(items)
+
+    def lpop(self, key, count=None):
+        self.check()
+        items = self.lists.get(key, [])
+        popped, self.lists[key] = items[: count or 1], items[count or 1:]
+        if count is None:
+            return popped[0] if popped else None
+        return popped or None
+
+    def register_script(self, script):
+        return FakeTokenBucketScript(self)
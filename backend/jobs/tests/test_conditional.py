@@ -0,0 +1,67 @@
+"""
+Requêtes conditionnelles (jobs/conditional.py) : 304 sur If-None-Match à jour,
+412 sur If-Match périmé, 404 pour un identifiant invalide.
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from jobs.models import Company, JobOffer
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE, METRICS_FLUSH_INTERVAL=3600)
+class ConditionalRequestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("recruteur")
+        cls.company = Company.objects.create(name="Acme", owner=cls.user)
+        # bulk_create : pas de signaux (search_vector PostgreSQL) à la préparation
+        cls.offer = JobOffer.objects.bulk_create([JobOffer(title="Développeur", company=cls.company)])[0]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_invalid_id_is_not_found(self):
+        for url in ("/api/jobs/abc/", "/api/companies/abc/"):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_missing_object_is_not_found(self):
+        self.assertEqual(self.client.get("/api/jobs/999999/").status_code, 404)
+        self.assertEqual(self.client.get("/api/companies/999999/").status_code, 404)
+
+    def test_detail_not_modified(self):
+        for url in (f"/api/jobs/{self.offer.pk}/", f"/api/companies/{self.company.pk}/"):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("Last-Modified", response)
+                etag = response["ETag"]
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"autre"').status_code, 200)
+
+    def test_list_not_modified(self):
+        etag = self.client.get("/api/jobs/")["ETag"]
+        self.assertEqual(self.client.get("/api/jobs/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    @mock.patch("jobs.signals.update_search_vectors")
+    def test_stale_if_match_is_rejected(self, update_search_vectors):
+        url = f"/api/companies/{self.company.pk}/"
+        etag = self.client.get(url)["ETag"]
+        self.client.force_authenticate(self.user)
+
+        response = self.client.patch(url, {"sector": "Logiciel"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        # Le client qui a lu avant la modification ne l'écrase pas
+        response = self.client.patch(url, {"sector": "Conseil"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.sector, "Logiciel")
@@ -0,0 +1,140 @@
+"""
+Routage des lectures vers les réplicas (core/db_router.py), avec deux bases
+SQLite en mémoire comme réplicas et un réplica injoignable.
+"""
+import asyncio
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core import db_router
+from core.db_router import ReplicaRoutingMiddleware, replica_reads
+from jobs.models import JobOffer
+from jobs.query_budget import QueryBudgetExceeded, assert_max_queries
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+REPLICAS = {
+    "replica_1": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+    "replica_2": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+    # Répertoire inexistant : la connexion échoue
+    "replica_3": {"ENGINE": "django.db.backends.sqlite3", "NAME": "/nonexistent/jobpulse/replica.sqlite3"},
+}
+HEALTHY = ["replica_1", "replica_2"]
+
+
+def reads_from(seen, write=False):
+    """Vue qui note l'alias de lecture choisi (après une écriture si write)."""
+    def view(request):
+        if write:
+            router.db_for_write(JobOffer)
+        seen.append(router.db_for_read(JobOffer))
+        return HttpResponse()
+
+    return view
+
+
+@override_settings(CACHES=LOCMEM_CACHE, REPLICA_STICKY_SECONDS=60)
+class ReplicaRoutingTests(SimpleTestCase):
+    databases = {DEFAULT_DB_ALIAS}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Alias ajoutés après SimpleTestCase.setUpClass : hors DATABASES du lanceur de tests
+        configured = connections.configure_settings({DEFAULT_DB_ALIAS: connections.settings[DEFAULT_DB_ALIAS], **REPLICAS})
+        for alias in REPLICAS:
+            connections.settings[alias] = configured[alias]
+
+    @classmethod
+    def tearDownClass(cls):
+        for alias in REPLICAS:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        db_router._health.clear()
+        self.factory = RequestFactory()
+        self.set_replicas(HEALTHY)
+
+    def set_replicas(self, aliases):
+        patcher = mock.patch.object(db_router, "replica_aliases", return_value=list(aliases))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def call(self, method, write=False, remote_addr="10.0.0.1"):
+        seen = []
+        middleware = ReplicaRoutingMiddleware(reads_from(seen, write))
+        middleware(getattr(self.factory, method)("/api/jobs/", REMOTE_ADDR=remote_addr))
+        return seen[0]
+
+    def test_get_reads_from_a_replica(self):
+        self.assertIn(self.call("get"), HEALTHY)
+
+    def test_reads_outside_a_request_use_default(self):
+        self.assertEqual(router.db_for_read(JobOffer), DEFAULT_DB_ALIAS)
+
+    def test_post_reads_from_default_and_pins_the_client(self):
+        self.assertEqual(self.call("post"), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.call("get"), DEFAULT_DB_ALIAS)
+        # Un autre client n'est pas concerné
+        self.assertIn(self.call("get", remote_addr="10.0.0.2"), HEALTHY)
+
+    def test_write_inside_get_switches_to_default_and_pins_the_client(self):
+        self.assertEqual(self.call("get", write=True), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.call("get"), DEFAULT_DB_ALIAS)
+
+    def test_replica_reads_flag(self):
+        seen = []
+
+        def view(request):
+            seen.append(replica_reads())
+            if request.method == "GET":
+                router.db_for_write(JobOffer)
+                seen.append(replica_reads())
+            return HttpResponse()
+
+        self.assertFalse(replica_reads())
+        ReplicaRoutingMiddleware(view)(self.factory.get("/api/jobs/"))
+        ReplicaRoutingMiddleware(view)(self.factory.post("/api/jobs/", REMOTE_ADDR="10.0.0.3"))
+        self.assertEqual(seen, [True, False, False])
+
+    def test_broken_replica_falls_back_to_default(self):
+        self.set_replicas(["replica_3"])
+        with self.assertLogs("core.db_router", "WARNING"):
+            self.assertEqual(self.call("get"), DEFAULT_DB_ALIAS)
+
+    def test_broken_replica_is_skipped(self):
+        self.set_replicas(["replica_1", "replica_3"])
+        with self.assertLogs("core.db_router", "WARNING"):
+            self.assertEqual({self.call("get") for _ in range(10)}, {"replica_1"})
+
+    def test_async_middleware(self):
+        seen = []
+
+        async def view(request):
+            # L'ORM async exécute les requêtes dans un thread (sync_to_async), comme ici
+            if request.method == "POST":
+                await sync_to_async(router.db_for_write)(JobOffer)
+            seen.append(await sync_to_async(router.db_for_read)(JobOffer))
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(view)
+        for method in ("get", "post", "get"):
+            asyncio.run(middleware(getattr(self.factory, method)("/api/jobs/")))
+        self.assertIn(seen[0], HEALTHY)
+        self.assertEqual(seen[1:], [DEFAULT_DB_ALIAS, DEFAULT_DB_ALIAS])
+
+    def test_query_budget_counts_every_alias(self):
+        with self.assertRaises(QueryBudgetExceeded) as raised:
+            with assert_max_queries(1):
+                for alias in (DEFAULT_DB_ALIAS, "replica_1"):
+                    with connections[alias].cursor() as cursor:
+                        cursor.execute("SELECT 1")
+        self.assertIn("[replica_1]", str(raised.exception))
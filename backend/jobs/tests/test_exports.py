@@ -0,0 +1,101 @@
+"""
+Exports CSV / NDJSON en streaming (jobs/exports.py) : contenu, filtres et droits.
+"""
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from jobs import exports
+from jobs.models import Application, CandidateProfile, Company, JobOffer
+
+User = get_user_model()
+
+
+def content(response):
+    return b"".join(response.streaming_content).decode()
+
+
+def csv_rows(text):
+    return list(csv.DictReader(io.StringIO(text.lstrip("\ufeff"))))
+
+
+def ndjson_rows(response):
+    return [json.loads(line) for line in content(response).splitlines()]
+
+
+@override_settings(METRICS_FLUSH_INTERVAL=3600)
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user("alice", email="alice@example.com")
+        cls.bob = User.objects.create_user("bob")
+        cls.staff = User.objects.create_user("admin", is_staff=True)
+        CandidateProfile.objects.create(user=cls.alice, full_name="Alice Martin", skills="python, django")
+        company = Company.objects.create(name="Acme")
+        # bulk_create : pas de signaux (search_vector PostgreSQL) à la préparation
+        cls.python, cls.java = JobOffer.objects.bulk_create([
+            JobOffer(title="Développeur Python", company=company, salary=50000, location="Lyon"),
+            JobOffer(title="Développeur Java", company=company, salary=40000, location="Paris"),
+        ])
+        Application.objects.bulk_create([
+            Application(user=cls.alice, job_offer=cls.python, message="Motivée", status="pending"),
+            Application(user=cls.alice, job_offer=cls.java, status="rejected"),
+            Application(user=cls.bob, job_offer=cls.python),
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def export(self, url, user, **params):
+        self.client.force_authenticate(user)
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_application_csv(self):
+        response = self.export("/api/applications/export/", self.alice)
+        self.assertEqual(response["Content-Type"], exports.CONTENT_TYPES["csv"])
+        self.assertRegex(response["Content-Disposition"], r'attachment; filename="applications-\d{8}-\d{6}\.csv"')
+        text = content(response)
+        self.assertTrue(text.startswith("\ufeff" + ",".join(exports.header(exports.APPLICATION_FIELDS))))
+        rows = csv_rows(text)
+        self.assertEqual([row["job_offer_title"] for row in rows], ["Développeur Python", "Développeur Java"])
+        self.assertEqual(rows[0]["user_email"], "alice@example.com")
+        self.assertEqual(rows[0]["full_name"], "Alice Martin")
+        self.assertEqual(rows[0]["company_name"], "Acme")
+
+    def test_application_ndjson_with_filter(self):
+        response = self.export("/api/applications/export/", self.alice, output="ndjson", status="pending")
+        self.assertEqual(response["Content-Type"], exports.CONTENT_TYPES["ndjson"])
+        rows = ndjson_rows(response)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["message"], "Motivée")
+        self.assertEqual(rows[0]["skills"], "python, django")
+
+    def test_non_staff_only_exports_own_applications(self):
+        rows = ndjson_rows(self.export("/api/applications/export/", self.bob, output="ndjson"))
+        self.assertEqual({row["user_username"] for row in rows}, {"bob"})
+        rows = ndjson_rows(self.export("/api/applications/export/", self.staff, output="ndjson"))
+        self.assertEqual(len(rows), 3)
+
+    def test_unknown_output_is_rejected(self):
+        self.client.force_authenticate(self.alice)
+        self.assertEqual(self.client.get("/api/applications/export/", {"output": "xml"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/jobs/export/", {"output": "xml"}).status_code, 400)
+
+    def test_job_csv_and_ndjson(self):
+        response = self.export("/api/jobs/export/", self.bob)
+        self.assertRegex(response["Content-Disposition"], r'filename="jobs-\d{8}-\d{6}\.csv"')
+        rows = csv_rows(content(response))
+        self.assertEqual([row["title"] for row in rows], ["Développeur Python", "Développeur Java"])
+        self.assertEqual(rows[0]["company_name"], "Acme")
+        rows = ndjson_rows(self.export("/api/jobs/export/", self.bob, output="ndjson", salary_min=45000))
+        self.assertEqual([row["id"] for row in rows], [self.python.pk])
+        self.assertEqual(rows[0]["location"], "Lyon")
+
+    def test_job_export_requires_authentication(self):
+        self.assertEqual(self.client.get("/api/jobs/export/").status_code, 401)
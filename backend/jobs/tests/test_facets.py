@@ -0,0 +1,92 @@
+"""
+Facettes de GET /api/jobs/facets/ (jobs/facets.py) : tranches de salaire, et
+compteurs par lieu / entreprise / tranche (GROUPING SETS : PostgreSQL uniquement).
+"""
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from jobs.facets import SALARY_BOUNDS, compute_facets, salary_bucket, salary_range
+from jobs.models import Company, JobOffer
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class SalaryRangeTests(SimpleTestCase):
+    def test_ranges(self):
+        self.assertEqual(salary_range(0), {"min": 0, "max": SALARY_BOUNDS[0]})
+        self.assertEqual(salary_range(1), {"min": SALARY_BOUNDS[0], "max": SALARY_BOUNDS[1]})
+        # Dernière tranche ouverte
+        self.assertEqual(salary_range(len(SALARY_BOUNDS)), {"min": SALARY_BOUNDS[-1], "max": None})
+
+
+class SalaryBucketTests(TestCase):
+    def test_bucket_bounds(self):
+        salaries = [None, 0, 29999, 30000, 59999, 80000, 200000]
+        JobOffer.objects.bulk_create([JobOffer(title=f"Offre {i}", salary=salary) for i, salary in enumerate(salaries)])
+
+        buckets = dict(JobOffer.objects.annotate(bucket=salary_bucket()).values_list("salary", "bucket"))
+
+        self.assertEqual(buckets, {None: None, 0: 0, 29999: 0, 30000: 1, 59999: 3, 80000: 5, 200000: 5})
+
+
+@skipUnless(connection.vendor == "postgresql", "GROUPING SETS : PostgreSQL uniquement")
+@override_settings(CACHES=LOCMEM_CACHE, METRICS_FLUSH_INTERVAL=3600)
+class ComputeFacetsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        acme, globex = Company.objects.bulk_create([Company(name="Acme"), Company(name="Globex")])
+        JobOffer.objects.bulk_create([
+            JobOffer(title="A", company=acme, location="Paris", salary=35000),
+            JobOffer(title="B", company=acme, location="Paris", salary=45000),
+            JobOffer(title="C", company=globex, location="Lyon", salary=36000),
+            JobOffer(title="D", company=None, location="", salary=None),
+        ])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_counts(self):
+        facets = compute_facets(JobOffer.objects.all())
+
+        self.assertEqual(facets["total"], 4)
+        self.assertEqual(facets["location"], [
+            {"value": "Paris", "count": 2},
+            {"value": "", "count": 1},
+            {"value": "Lyon", "count": 1},
+        ])
+        # Offre sans entreprise : valeur NULL distinguée de la ligne du total par GROUPING()
+        self.assertEqual(facets["company"], [
+            {"value": "Acme", "count": 2},
+            {"value": None, "count": 1},
+            {"value": "Globex", "count": 1},
+        ])
+        # Salaire non renseigné : pas de tranche
+        self.assertEqual(facets["salary"], [
+            {"value": 1, **salary_range(1), "count": 2},
+            {"value": 2, **salary_range(2), "count": 1},
+        ])
+
+    def test_filtered_selection(self):
+        facets = compute_facets(JobOffer.objects.filter(company__name="Acme"))
+
+        self.assertEqual(facets["total"], 2)
+        self.assertEqual(facets["location"], [{"value": "Paris", "count": 2}])
+
+    def test_empty_selection(self):
+        self.assertEqual(
+            compute_facets(JobOffer.objects.filter(title="Z")),
+            {"total": 0, "location": [], "company": [], "salary": []},
+        )
+
+    def test_endpoint_uses_list_filters_and_cache(self):
+        client = APIClient()
+        first = client.get("/api/jobs/facets/", {"salary_min": 36000})
+        second = client.get("/api/jobs/facets/", {"salary_min": 36000, "ordering": "-salary"})
+
+        self.assertEqual(first.data["total"], 2)
+        # ?ordering= ne fait pas partie de la clé des facettes
+        self.assertEqual((first["X-Cache"], second["X-Cache"]), ("MISS", "HIT"))
@@ -0,0 +1,126 @@
+"""
+Géocodage hors ligne et recherche par rayon (jobs/geo.py, ?near= / ?radius_km=).
+"""
+import math
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from jobs import geo
+from jobs.models import JobOffer
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+LYON = (45.7640, 4.8357)
+
+
+class GeocodeTests(SimpleTestCase):
+    def test_known_places(self):
+        self.assertEqual(geo.geocode("Lyon"), LYON)
+        self.assertEqual(geo.geocode("  LYON "), LYON)
+
+    def test_free_text_locations(self):
+        for location in ("Lyon (69)", "Lyon, France", "Remote / Lyon", "Lyon Part-Dieu", "lyon 3e"):
+            with self.subTest(location=location):
+                self.assertEqual(geo.geocode(location), LYON)
+
+    def test_accents_and_punctuation(self):
+        self.assertEqual(geo.normalize_place("Saint-Étienne"), "saint etienne")
+        self.assertEqual(geo.geocode("saint etienne"), geo.geocode("Saint-Étienne"))
+        self.assertIsNotNone(geo.geocode("Saint-Étienne"))
+
+    def test_unknown_places(self):
+        for location in ("", None, "Remote", "Atlantide"):
+            with self.subTest(location=location):
+                self.assertIsNone(geo.geocode(location))
+
+    def test_parse_point(self):
+        self.assertEqual(geo.parse_point("45.76, 4.83"), (45.76, 4.83))
+        self.assertEqual(geo.parse_point("Lyon"), LYON)
+        self.assertIsNone(geo.parse_point("95,4"))
+        self.assertIsNone(geo.parse_point("Atlantide"))
+
+
+class BoundingBoxTests(SimpleTestCase):
+    def test_contains_the_circle(self):
+        lat_min, lat_max, lon_min, lon_max = geo.bounding_box(*LYON, 100)
+
+        self.assertAlmostEqual(lat_max - LYON[0], 100 / geo.KM_PER_DEGREE)
+        self.assertAlmostEqual(LYON[0] - lat_min, 100 / geo.KM_PER_DEGREE)
+        # Un degré de longitude est plus court qu'à l'équateur : rectangle plus large
+        self.assertAlmostEqual(lon_max - LYON[1], 100 / (geo.KM_PER_DEGREE * math.cos(math.radians(LYON[0]))))
+        self.assertGreater(lon_max - lon_min, lat_max - lat_min)
+
+    def test_clamped_longitude_and_poles(self):
+        _, _, lon_min, lon_max = geo.bounding_box(0.0, 179.5, 200)
+        self.assertEqual(lon_max, 180.0)
+
+        # Près du pôle, cos(lat) est borné : rectangle fini, rabattu sur [-180, 180]
+        _, _, lon_min, lon_max = geo.bounding_box(89.99, 0.0, 50)
+        self.assertAlmostEqual(lon_max, 50 / (geo.KM_PER_DEGREE * 0.01))
+        _, _, lon_min, lon_max = geo.bounding_box(89.99, 0.0, 500)
+        self.assertEqual((lon_min, lon_max), (-180.0, 180.0))
+
+
+class WithinRadiusTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # bulk_create : pas de signaux (search_vector PostgreSQL), coordonnées posées à la main
+        locations = ("Lyon", "Villeurbanne", "Grenoble", "Paris", "Remote")
+        offers = [JobOffer(title=location, location=location) for location in locations]
+        for offer in offers:
+            geo.set_coordinates(offer)
+        JobOffer.objects.bulk_create(offers)
+
+    def titles(self, radius_km, point=LYON):
+        return set(geo.within_radius(JobOffer.objects.all(), *point, radius_km).values_list("title", flat=True))
+
+    def test_radius(self):
+        self.assertEqual(self.titles(10), {"Lyon", "Villeurbanne"})
+        # Lyon – Grenoble : ~95 km
+        self.assertEqual(self.titles(120), {"Lyon", "Villeurbanne", "Grenoble"})
+        self.assertEqual(self.titles(1000), {"Lyon", "Villeurbanne", "Grenoble", "Paris"})
+
+    def test_exact_distance_inside_the_box(self):
+        # Grenoble est dans le rectangle de 90 km autour de Lyon mais à plus de 90 km
+        lat_min, lat_max, lon_min, lon_max = geo.bounding_box(*LYON, 90)
+        grenoble = geo.geocode("Grenoble")
+        self.assertTrue(lat_min <= grenoble[0] <= lat_max and lon_min <= grenoble[1] <= lon_max)
+        self.assertNotIn("Grenoble", self.titles(90))
+
+    def test_offers_without_coordinates_excluded(self):
+        self.assertNotIn("Remote", self.titles(geo.MAX_RADIUS_KM))
+
+
+@override_settings(CACHES=LOCMEM_CACHE, METRICS_FLUSH_INTERVAL=3600)
+class NearFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        offers = [JobOffer(title=location, location=location) for location in ("Lyon", "Grenoble", "Paris")]
+        for offer in offers:
+            geo.set_coordinates(offer)
+        JobOffer.objects.bulk_create(offers)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get(self, **params):
+        return self.client.get("/api/jobs/", params)
+
+    def test_near_place_with_default_radius(self):
+        response = self.get(near="Villeurbanne")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([offer["title"] for offer in response.data["results"]], ["Lyon"])
+
+    def test_near_coordinates_and_radius(self):
+        response = self.get(near="45.76,4.83", radius_km=150)
+
+        self.assertEqual(sorted(offer["title"] for offer in response.data["results"]), ["Grenoble", "Lyon"])
+
+    def test_invalid_point_or_radius(self):
+        self.assertEqual(self.get(near="Atlantide").status_code, 400)
+        self.assertEqual(self.get(near="Lyon", radius_km=geo.MAX_RADIUS_KM + 1).status_code, 400)
+        self.assertEqual(self.get(near="Lyon", radius_km=0).status_code, 400)
@@ -0,0 +1,141 @@
+"""
+Import en masse (jobs/importers.py) : lecture CSV / JSON Lines, rapport par
+ligne, lots, événements outbox et owner des entreprises créées.
+"""
+import io
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from jobs import outbox
+from jobs.importers import FORMAT_CSV, FORMAT_JSONL, JobOfferImporter
+from jobs.models import Company, JobOffer, OutboxEvent
+
+User = get_user_model()
+
+
+def jsonl(*rows):
+    return io.BytesIO("".join(json.dumps(row) + "\n" for row in rows).encode())
+
+
+# search_vector : UPDATE PostgreSQL, sans objet ici
+@mock.patch("jobs.importers.update_search_vectors")
+class JobOfferImporterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user("recruiter")
+        cls.acme = Company.objects.create(name="Acme")
+
+    def test_csv_rows(self, _):
+        stream = io.BytesIO(
+            "\ufefftitle,company,description,salary,location\n"
+            "Développeur Python,Acme,API,50000,Lyon\n"
+            "Data engineer,,,,\n".encode()
+        )
+        report = JobOfferImporter(owner=self.recruiter).run(stream, FORMAT_CSV)
+
+        self.assertEqual(report["created"], 2)
+        self.assertEqual(report["failed"], 0)
+        python = JobOffer.objects.get(title="Développeur Python")
+        self.assertEqual((python.company, python.salary, python.location), (self.acme, 50000, "Lyon"))
+        # Cellule vide = champ absent
+        self.assertIsNone(JobOffer.objects.get(title="Data engineer").company_id)
+
+    def test_jsonl_rows(self, _):
+        stream = jsonl(
+            {"title": "Développeur Java", "company": "Acme", "salary": 40000},
+            {"title": "SRE", "location": "Paris"},
+        )
+        report = JobOfferImporter(owner=self.recruiter).run(stream, FORMAT_JSONL)
+
+        self.assertEqual(report["created"], 2)
+        self.assertEqual(JobOffer.objects.get(title="Développeur Java").company, self.acme)
+
+    def test_error_report_per_row(self, _):
+        stream = io.BytesIO(
+            b'{"title": "OK"}\n'
+            b"\n"
+            b"pas du json\n"
+            b'["une", "liste"]\n'
+            b'{"salary": 1000}\n'
+            b'{"title": "Salaire", "salary": "beaucoup"}\n'
+        )
+        report = JobOfferImporter(owner=self.recruiter).run(stream, FORMAT_JSONL)
+
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(report["failed"], 4)
+        self.assertEqual([error["row"] for error in report["errors"]], [3, 4, 5, 6])
+        self.assertIn("title", report["errors"][2]["errors"])
+        self.assertIn("salary", report["errors"][3]["errors"])
+        self.assertFalse(report["errors_truncated"])
+
+    def test_error_report_truncated(self, _):
+        stream = jsonl(*[{"salary": 1}] * 5)
+        report = JobOfferImporter(max_errors=2, owner=self.recruiter).run(stream, FORMAT_JSONL)
+
+        self.assertEqual(report["failed"], 5)
+        self.assertEqual(len(report["errors"]), 2)
+        self.assertTrue(report["errors_truncated"])
+
+    def test_batches_and_outbox_events(self, update_search_vectors):
+        stream = jsonl(*[{"title": f"Offre {i}"} for i in range(5)])
+        report = JobOfferImporter(batch_size=2, owner=self.recruiter).run(stream, FORMAT_JSONL)
+
+        self.assertEqual((report["created"], report["batches"]), (5, 3))
+        self.assertEqual(update_search_vectors.call_count, 3)
+        # Un événement de notification (et un de recherche des candidats) par lot, pas par offre
+        for topic in (outbox.TOPIC_JOB_BATCH_CREATED, outbox.TOPIC_JOB_MATCH_CANDIDATES):
+            events = OutboxEvent.objects.filter(topic=topic).order_by("id")
+            self.assertEqual([len(event.payload["job_ids"]) for event in events], [2, 2, 1])
+        self.assertEqual(OutboxEvent.objects.filter(topic=outbox.TOPIC_JOB_CREATED).count(), 0)
+
+    def test_created_companies_owned_by_importer(self, _):
+        stream = jsonl(
+            {"title": "A", "company": "Nouvelle"},
+            {"title": "B", "company": "Nouvelle"},
+            {"title": "C", "company": "Acme"},
+        )
+        JobOfferImporter(owner=self.recruiter).run(stream, FORMAT_JSONL)
+
+        self.assertEqual(Company.objects.get(name="Nouvelle").owner, self.recruiter)
+        self.assertEqual(Company.objects.filter(name="Nouvelle").count(), 1)
+        # Une entreprise existante garde son owner
+        self.acme.refresh_from_db()
+        self.assertIsNone(self.acme.owner)
+
+
+@override_settings(METRICS_FLUSH_INTERVAL=3600)
+@mock.patch("jobs.importers.update_search_vectors")
+class ImportEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user("recruiter")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter)
+
+    def post(self, body, content_type, query=""):
+        return self.client.generic("POST", f"/api/jobs/import/{query}", body, content_type=content_type)
+
+    def test_import_sets_owner(self, _):
+        response = self.post("title,company\nDéveloppeur Python,Nouvelle\n", "text/csv", "?batch_size=1")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(Company.objects.get(name="Nouvelle").owner, self.recruiter)
+
+    def test_unsupported_content_type(self, _):
+        response = self.post("{}", "application/json")
+
+        self.assertEqual(response.status_code, 415)
+
+    def test_anonymous_rejected(self, _):
+        self.client.force_authenticate(None)
+        response = self.post("title\nA\n", "text/csv")
+
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(JobOffer.objects.exists())
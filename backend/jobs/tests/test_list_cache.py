@@ -0,0 +1,138 @@
+"""
+Cache de GET /api/jobs/ par génération (jobs/cache.py) : en-têtes X-Cache,
+clé canonique, invalidation après écriture d'une offre ou d'une entreprise.
+"""
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from jobs.cache import (
+    RECENT_BUMP_KEY,
+    bump_generation,
+    cache_stats,
+    get_generation,
+    list_cache_params,
+    normalize_params,
+)
+from jobs.models import Company, JobOffer
+from jobs.views import JobOfferViewSet
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE, METRICS_FLUSH_INTERVAL=3600)
+class GenerationListCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(name="Acme")
+        # bulk_create : pas de signaux (search_vector PostgreSQL) à la préparation
+        cls.offer = JobOffer.objects.bulk_create(
+            [JobOffer(title="Développeur", company=cls.company, location="Paris")]
+        )[0]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get(self, params=None, **extra):
+        return self.client.get("/api/jobs/", params or {}, **extra)
+
+    def test_miss_then_hit(self):
+        first, second = self.get(), self.get()
+
+        self.assertEqual((first["X-Cache"], second["X-Cache"]), ("MISS", "HIT"))
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(cache_stats(), {"hits": 1, "misses": 1})
+
+    def test_bypass_header_refreshes_the_entry(self):
+        self.get()
+        JobOffer.objects.filter(pk=self.offer.pk).update(title="Renommée")  # sans signal : pas de bump
+
+        self.assertEqual(self.get()["X-Cache"], "HIT")
+        bypass = self.get(HTTP_X_CACHE_BYPASS="1")
+        self.assertEqual(bypass["X-Cache"], "BYPASS")
+        self.assertEqual(bypass.data["results"][0]["title"], "Renommée")
+        hit = self.get()
+        self.assertEqual((hit["X-Cache"], hit.data["results"][0]["title"]), ("HIT", "Renommée"))
+
+    def test_canonical_key(self):
+        self.get({"salary_min": "1000", "ordering": "-salary"})
+
+        # Ordre des paramètres indifférent, paramètres inconnus ignorés
+        self.assertEqual(self.get({"ordering": "-salary", "salary_min": "1000", "utm_source": "x"})["X-Cache"], "HIT")
+        self.assertEqual(self.get({"salary_min": "2000", "ordering": "-salary"})["X-Cache"], "MISS")
+
+    def test_text_filters_case_insensitive(self):
+        allowed = list_cache_params(JobOfferViewSet())
+        self.assertEqual(
+            normalize_params(QueryDict("location=Paris&salary_min=1000&utm_source=x"), allowed),
+            normalize_params(QueryDict("salary_min=1000&location=PARIS"), allowed),
+        )
+
+    def assert_write_bumps_after_commit(self, write):
+        self.get()
+        generation = get_generation()
+        # Tendances : Redis (django-redis), hors sujet ici
+        with mock.patch("jobs.signals.trending"), self.captureOnCommitCallbacks(execute=True):
+            write()
+            self.assertEqual(get_generation(), generation)
+        self.assertGreater(get_generation(), generation)
+        self.assertEqual(self.get()["X-Cache"], "MISS")
+
+    @mock.patch("jobs.signals.update_search_vectors")
+    def test_job_offer_save_bumps(self, _):
+        self.offer.title = "Développeuse"
+        self.assert_write_bumps_after_commit(self.offer.save)
+
+    @mock.patch("jobs.signals.update_search_vectors")
+    def test_job_offer_delete_bumps(self, _):
+        self.assert_write_bumps_after_commit(self.offer.delete)
+
+    @mock.patch("jobs.signals.update_search_vectors")
+    def test_company_save_bumps(self, _):
+        self.company.name = "Acme SA"
+        self.assert_write_bumps_after_commit(self.company.save)
+
+    @mock.patch("jobs.signals.update_search_vectors")
+    def test_company_delete_bumps(self, _):
+        self.assert_write_bumps_after_commit(self.company.delete)
+
+
+@override_settings(CACHES=LOCMEM_CACHE, METRICS_FLUSH_INTERVAL=3600)
+class ReplicaListCacheTests(TestCase):
+    """Une page lue sur un réplica juste après un bump n'est pas mise en cache."""
+
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name="Acme")
+        JobOffer.objects.bulk_create([JobOffer(title="Développeur", company=company)])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def statuses(self, on_replica):
+        with mock.patch("jobs.cache.replica_reads", return_value=on_replica):
+            return [self.client.get("/api/jobs/")["X-Cache"] for _ in range(2)]
+
+    def test_replica_page_after_a_recent_bump_is_not_stored(self):
+        bump_generation()
+        self.assertEqual(self.statuses(on_replica=True), ["MISS", "MISS"])
+
+    def test_replica_page_is_stored_once_replicas_caught_up(self):
+        bump_generation()
+        cache.delete(RECENT_BUMP_KEY)
+        self.assertEqual(self.statuses(on_replica=True), ["MISS", "HIT"])
+
+    def test_primary_page_is_stored_right_after_a_bump(self):
+        bump_generation()
+        self.assertEqual(self.statuses(on_replica=False), ["MISS", "HIT"])
+
+    @override_settings(REPLICA_MAX_LAG_SECONDS=5)
+    def test_recent_bump_marker_expires_with_the_replica_lag(self):
+        with mock.patch("jobs.cache.cache.set") as cache_set:
+            bump_generation()
+        cache_set.assert_called_once_with(RECENT_BUMP_KEY, 1, 5)
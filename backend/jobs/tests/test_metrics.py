@@ -0,0 +1,39 @@
+"""
+Accès à GET /metrics (core/metrics.py) : jeton obligatoire hors DEBUG.
+"""
+from unittest import mock
+
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core import metrics
+
+
+class MetricsAccessTests(SimpleTestCase):
+    def setUp(self):
+        # Sources (Redis, PostgreSQL) hors sujet ici
+        for name in ("flush", "_route_samples", "_outbox_samples", "_list_cache_samples", "_pool_samples"):
+            patcher = mock.patch.object(metrics, name)
+            self.addCleanup(patcher.stop)
+            patcher.start()
+        self.factory = RequestFactory()
+
+    def get(self, **headers):
+        return metrics.metrics_view(self.factory.get("/metrics", **headers))
+
+    @override_settings(METRICS_TOKEN="", DEBUG=False)
+    def test_without_token_in_production_is_not_found(self):
+        with self.assertRaises(Http404):
+            self.get()
+
+    @override_settings(METRICS_TOKEN="", DEBUG=True)
+    def test_without_token_in_debug_is_open(self):
+        self.assertEqual(self.get().status_code, 200)
+
+    @override_settings(METRICS_TOKEN="s3cret", DEBUG=False)
+    def test_token_is_required(self):
+        self.assertEqual(self.get().status_code, 403)
+        self.assertEqual(self.get(HTTP_AUTHORIZATION="Bearer autre").status_code, 403)
+        response = self.get(HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
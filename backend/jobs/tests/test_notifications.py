@@ -0,0 +1,92 @@
+"""
+Pipeline des notifications email (jobs/notifications.py) avec le backend
+email locmem de Django et un Redis en mémoire (jobs/tests/fakes.py).
+"""
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import SimpleTestCase, override_settings
+
+from jobs import notifications
+from jobs.tasks import flush_notifications_task, send_job_notification_task
+
+from .fakes import FakeRedis
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class CountingEmailBackend(EmailBackend):
+    """Backend locmem qui compte les connexions ouvertes et les appels à send_messages()."""
+
+    opened = 0
+    sends = 0
+
+    def open(self):
+        type(self).opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        type(self).sends += 1
+        return super().send_messages(messages)
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHE,
+    EMAIL_BACKEND="jobs.tests.test_notifications.CountingEmailBackend",
+    NOTIFICATION_BATCH_SIZE=2,
+    JOB_NOTIFICATION_RECIPIENTS=["alerts@jobpulse.test"],
+)
+class NotificationPipelineTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        CountingEmailBackend.opened = CountingEmailBackend.sends = 0
+        self.redis = FakeRedis()
+        for patcher in (
+            mock.patch("jobs.notifications.get_redis_connection", return_value=self.redis),
+            # Flush programmé mais pas exécuté : le test le lance lui-même
+            mock.patch.object(flush_notifications_task, "apply_async"),
+        ):
+            self.addCleanup(patcher.stop)
+            patcher.start()
+
+    def test_enqueued_messages_are_sent_by_one_flush_over_one_connection(self):
+        for job_id in range(5):
+            notifications.enqueue(notifications.job_created_messages(job_id, f"Offre {job_id}", "Acme"))
+        # Coalescence : un seul flush programmé pour les cinq messages
+        flush_notifications_task.apply_async.assert_called_once()
+        self.assertEqual(mail.outbox, [])
+
+        self.assertEqual(flush_notifications_task(), 5)
+        self.assertEqual([message.subject for message in mail.outbox], [
+            f"Nouvelle offre : Offre {job_id} @ Acme" for job_id in range(5)
+        ])
+        self.assertEqual(mail.outbox[0].to, ["alerts@jobpulse.test"])
+        # Paquets de NOTIFICATION_BATCH_SIZE messages sur la même connexion
+        self.assertEqual(CountingEmailBackend.opened, 1)
+        self.assertEqual(CountingEmailBackend.sends, 3)
+
+    def test_flush_releases_the_schedule_lock(self):
+        notifications.enqueue(notifications.job_created_messages(1, "Offre", "Acme"))
+        flush_notifications_task()
+        notifications.enqueue(notifications.job_created_messages(2, "Offre", "Acme"))
+        self.assertEqual(flush_notifications_task.apply_async.call_count, 2)
+
+    def test_repeated_event_is_sent_once(self):
+        for _ in range(3):
+            send_job_notification_task(7, "Développeur", "Acme", event_id=42)
+        send_job_notification_task(8, "Testeur", "Acme", event_id=43)
+        flush_notifications_task()
+        self.assertEqual([message.subject for message in mail.outbox], [
+            "Nouvelle offre : Développeur @ Acme",
+            "Nouvelle offre : Testeur @ Acme",
+        ])
+
+    def test_failed_send_requeues_the_batch(self):
+        notifications.enqueue(notifications.job_created_messages(1, "Offre", "Acme"))
+        with mock.patch.object(CountingEmailBackend, "send_messages", side_effect=OSError("SMTP")):
+            with self.assertLogs("jobs.notifications", "ERROR"), self.assertRaises(OSError):
+                notifications.flush()
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(notifications.flush(), 1)
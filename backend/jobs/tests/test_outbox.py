@@ -0,0 +1,73 @@
+"""
+Drainer de l'outbox (jobs/outbox.py) : publication, échec du broker et
+événements de sujet inconnu (abandonnés, sans bloquer la file).
+"""
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from jobs import outbox
+from jobs.models import OutboxEvent
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class DrainTests(TestCase):
+    def setUp(self):
+        self.handler = mock.Mock()
+        patcher = mock.patch("jobs.outbox._handlers", return_value={outbox.TOPIC_JOB_CREATED: self.handler})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_publishes_pending_events(self):
+        event = outbox.enqueue(outbox.TOPIC_JOB_CREATED, {"job_id": 1})
+
+        self.assertEqual(outbox.drain(), 1)
+
+        self.handler.apply_async.assert_called_once_with(kwargs={"job_id": 1, "event_id": event.pk})
+        event.refresh_from_db()
+        self.assertIsNotNone(event.published_at)
+        self.assertEqual(outbox.outbox_lag()["pending"], 0)
+
+    def test_unknown_topic_is_abandoned(self):
+        unknown = outbox.enqueue("job.unknown", {})
+        event = outbox.enqueue(outbox.TOPIC_JOB_CREATED, {"job_id": 1})
+
+        with self.assertLogs("jobs.outbox", "ERROR"):
+            outbox.drain()
+
+        unknown.refresh_from_db()
+        self.assertIsNotNone(unknown.failed_at)
+        self.assertIsNone(unknown.published_at)
+        self.assertEqual(unknown.attempts, 1)
+        event.refresh_from_db()
+        self.assertIsNotNone(event.published_at)
+        # Plus relu par les passages suivants
+        self.assertEqual(outbox.drain(), 0)
+        self.assertEqual(outbox.outbox_lag(), {"pending": 0, "oldest_age_seconds": 0.0, "failed": 1})
+
+    def test_unknown_topics_do_not_block_the_queue(self):
+        OutboxEvent.objects.bulk_create(
+            [OutboxEvent(topic="job.unknown") for _ in range(outbox.DRAIN_BATCH_SIZE)]
+        )
+        event = outbox.enqueue(outbox.TOPIC_JOB_CREATED, {"job_id": 1})
+
+        with self.assertLogs("jobs.outbox", "ERROR"):
+            outbox.drain()
+
+        event.refresh_from_db()
+        self.assertIsNotNone(event.published_at)
+
+    def test_broker_failure_keeps_event_pending(self):
+        self.handler.apply_async.side_effect = ConnectionError
+        event = outbox.enqueue(outbox.TOPIC_JOB_CREATED, {"job_id": 1})
+
+        with self.assertLogs("jobs.outbox", "ERROR"):
+            outbox.drain()
+
+        event.refresh_from_db()
+        self.assertEqual(event.attempts, 1)
+        self.assertIsNone(event.published_at)
+        self.assertIsNone(event.failed_at)
+        self.assertEqual(outbox.outbox_lag()["pending"], 1)
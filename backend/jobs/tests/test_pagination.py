@@ -0,0 +1,113 @@
+"""
+Pagination par curseur (jobs/pagination.py) : chaque ligne est vue une seule
+fois, y compris quand beaucoup de lignes partagent la même valeur de tri.
+"""
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from jobs.models import Company, JobOffer
+from jobs.pagination import EstimatedCountPaginator
+from jobs.search import update_search_vectors
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def walk(client, url, link="next"):
+    """ids de toutes les pages en suivant les liens next (ou previous)."""
+    ids = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200, response.content
+        ids.extend(row["id"] for row in response.json()["results"])
+        url = response.json()[link]
+    return ids
+
+
+@override_settings(CACHES=LOCMEM_CACHE, METRICS_FLUSH_INTERVAL=3600)
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name="Acme")
+        JobOffer.objects.bulk_create([JobOffer(title=f"Offre {index}", company=company) for index in range(25)])
+        # Toutes les offres à la même date : seul l'id départage
+        JobOffer.objects.update(created_at=timezone.now())
+        cls.ids = list(JobOffer.objects.order_by("-id").values_list("id", flat=True))
+
+    def setUp(self):
+        # Pages d'une autre classe de tests encore en cache sous la même génération
+        cache.clear()
+
+    def test_pages_through_ties_without_gaps_or_repeats(self):
+        self.assertEqual(walk(APIClient(), "/api/jobs/"), self.ids)
+
+    def test_previous_links_walk_back(self):
+        client = APIClient()
+        url = "/api/jobs/"
+        while True:
+            data = client.get(url).json()
+            if not data["next"]:
+                break
+            url = data["next"]
+        backwards = walk(client, data["previous"], link="previous")
+        self.assertEqual(sorted(backwards), sorted(self.ids[: len(backwards)]))
+        self.assertEqual(len(backwards) + len(data["results"]), len(self.ids))
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name="Acme")
+        JobOffer.objects.bulk_create([JobOffer(title=f"Offre {index}", company=company) for index in range(12)])
+
+    def paginator(self):
+        return EstimatedCountPaginator(JobOffer.objects.order_by("-id"), 5)
+
+    @override_settings(JOBS_EXACT_COUNT_THRESHOLD=20)
+    def test_small_result_is_counted_once_without_explain(self):
+        paginator = self.paginator()
+        with self.assertNumQueries(1) as captured:
+            self.assertEqual(paginator.count, 12)
+        self.assertNotIn("EXPLAIN", captured.captured_queries[0]["sql"])
+        self.assertFalse(paginator.count_is_estimate)
+
+    @override_settings(JOBS_EXACT_COUNT_THRESHOLD=5)
+    def test_full_probe_falls_back_to_exact_count_without_planner(self):
+        if connection.vendor == "postgresql":
+            self.skipTest("estimation du planner disponible")
+        paginator = self.paginator()
+        self.assertEqual(paginator.count, 12)
+        self.assertFalse(paginator.count_is_estimate)
+
+    @skipUnless(connection.vendor == "postgresql", "EXPLAIN : PostgreSQL uniquement")
+    @override_settings(JOBS_EXACT_COUNT_THRESHOLD=5)
+    def test_full_probe_uses_planner_estimate(self):
+        paginator = self.paginator()
+        self.assertGreaterEqual(paginator.count, 6)
+        self.assertTrue(paginator.count_is_estimate)
+
+
+@skipUnless(connection.vendor == "postgresql", "recherche plein texte : PostgreSQL uniquement")
+@override_settings(CACHES=LOCMEM_CACHE, METRICS_FLUSH_INTERVAL=3600)
+class SearchRankPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name="Acme")
+        JobOffer.objects.bulk_create(
+            [JobOffer(title="Développeur Python", company=company) for _ in range(25)]
+            + [JobOffer(title="Développeur", description="Python apprécié", company=company) for _ in range(7)]
+        )
+        update_search_vectors(JobOffer.objects.all())
+
+    def setUp(self):
+        # Pages d'une autre classe de tests encore en cache sous la même génération
+        cache.clear()
+
+    def test_pages_through_equal_ranks_without_gaps_or_repeats(self):
+        ids = walk(APIClient(), "/api/jobs/?search=python")
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(set(ids), set(JobOffer.objects.values_list("id", flat=True)))
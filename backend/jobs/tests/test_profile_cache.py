@@ -0,0 +1,58 @@
+"""
+Validateurs de GET /api/profiles/me/ et lien signé cv_url (jobs/protected_media.py) :
+un 304 ne prolonge pas un lien au-delà de sa fenêtre de validité.
+"""
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from jobs.models import CandidateProfile
+from jobs.protected_media import token_user
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+# Début d'une fenêtre de CV_URL_MAX_AGE secondes
+START = 1_800_000_000 - 1_800_000_000 % settings.CV_URL_MAX_AGE
+
+
+@override_settings(CACHES=LOCMEM_CACHE, METRICS_FLUSH_INTERVAL=3600)
+class ProfileValidatorsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("candidat")
+        cls.profile = CandidateProfile.objects.create(user=cls.user, cv="cvs/cv.pdf")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, now, **headers):
+        with mock.patch("time.time", return_value=now):
+            return self.client.get("/api/profiles/me/", **headers)
+
+    def test_not_modified_within_the_window(self):
+        response = self.get(START + 10)
+        self.assertIn("token=", response.json()["cv_url"])
+        later = START + settings.CV_URL_MAX_AGE - 1
+        self.assertEqual(self.get(later, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+        self.assertEqual(self.get(later, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]).status_code, 304)
+
+    def test_next_window_returns_a_fresh_link(self):
+        response = self.get(START + 10)
+        next_window = START + settings.CV_URL_MAX_AGE
+        fresh = self.get(next_window, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh["ETag"], response["ETag"])
+        self.assertNotEqual(fresh.json()["cv_url"], response.json()["cv_url"])
+        self.assertEqual(self.get(next_window, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]).status_code, 200)
+
+    def test_token_is_accepted_for_two_windows(self):
+        token = self.get(START + settings.CV_URL_MAX_AGE - 1).json()["cv_url"].split("token=")[1]
+        with mock.patch("time.time", return_value=START + 2 * settings.CV_URL_MAX_AGE - 2):
+            self.assertEqual(token_user(token, self.profile), self.user)
+        with mock.patch("time.time", return_value=START + 3 * settings.CV_URL_MAX_AGE):
+            self.assertIsNone(token_user(token, self.profile))
@@ -0,0 +1,78 @@
+"""
+Budgets de requêtes SQL des listes de l'API (jobs/query_budget.py) : chaque
+liste est servie par un nombre fixe de requêtes, quel que soit le nombre de
+lignes de la page. N lignes sont créées pour qu'un N+1 dépasse le budget.
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from jobs.models import Application, CandidateProfile, Company, JobOffer, UserProfile
+from jobs.query_budget import assert_max_queries
+
+User = get_user_model()
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+# Plus d'une page (PAGE_SIZE = 10) : la page servie est pleine
+N = 12
+
+
+@override_settings(CACHES=LOCMEM_CACHE, METRICS_FLUSH_INTERVAL=3600)
+class ListQueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user("recruteur", password="x")
+        UserProfile.objects.create(user=cls.recruiter, role="recruiter")
+        cls.staff = User.objects.create_user("admin", password="x", is_staff=True)
+        # bulk_create : pas de signaux (search_vector PostgreSQL) à la préparation
+        companies = Company.objects.bulk_create(
+            [Company(name=f"Entreprise {index}", owner=cls.recruiter) for index in range(N)]
+        )
+        cls.offers = JobOffer.objects.bulk_create(
+            [JobOffer(title=f"Offre {index}", company=company) for index, company in enumerate(companies)]
+        )
+        cls.candidates = User.objects.bulk_create([User(username=f"candidat{index}") for index in range(N)])
+        CandidateProfile.objects.bulk_create([CandidateProfile(user=user) for user in cls.candidates])
+        Application.objects.bulk_create(
+            [Application(user=user, job_offer=offer) for user in cls.candidates for offer in cls.offers[:2]]
+            + [Application(user=cls.candidates[0], job_offer=offer) for offer in cls.offers[2:]]
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get(self, url, budget, user=None):
+        if user is not None:
+            self.client.force_authenticate(user)
+        with assert_max_queries(budget):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        results = response.json()
+        return results["results"] if isinstance(results, dict) else results
+
+    def test_job_list(self):
+        self.assertEqual(len(self.get("/api/jobs/", 1)), 10)
+
+    def test_company_list(self):
+        self.assertEqual(len(self.get("/api/companies/", 2)), 10)
+
+    def test_application_list_for_candidate(self):
+        self.assertEqual(len(self.get("/api/applications/", 1, user=self.candidates[0])), 10)
+
+    def test_application_list_for_staff(self):
+        self.assertEqual(len(self.get("/api/applications/", 1, user=self.staff)), 10)
+
+    def test_recruiter_offers(self):
+        self.assertEqual(len(self.get("/api/recruiter/offers/", 1, user=self.recruiter)), 10)
+
+    def test_recruiter_applicants(self):
+        url = f"/api/recruiter/offers/{self.offers[0].pk}/applicants/"
+        self.assertEqual(len(self.get(url, 2, user=self.recruiter)), 10)
+
+    def test_trending_jobs(self):
+        job_ids = [offer.pk for offer in self.offers[:10]]
+        with mock.patch("jobs.trending.top_job_ids", return_value=job_ids):
+            self.assertEqual(len(self.get("/api/jobs/trending/", 1)), 10)
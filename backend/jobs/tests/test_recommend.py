@@ -0,0 +1,190 @@
+"""
+Index de recommandation TF-IDF (jobs/recommend.py) : matrice, construction et
+mise à jour des segments, top-k, et GET /api/jobs/recommended/.
+"""
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from jobs import recommend
+from jobs.models import Application, CandidateProfile, JobOffer
+
+User = get_user_model()
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+TEXTS = {
+    1: "Développeur Python Django API REST",
+    2: "Développeur Java Spring",
+    3: "Comptable fiscalité paie",
+    4: "Data engineer Python Spark",
+    5: "Chef de projet agile",
+}
+
+
+def text_rows(texts):
+    return [(job_id, recommend.hashed_counts(text)) for job_id, text in sorted(texts.items())]
+
+
+def rows_source(texts):
+    """Équivalent de _database_rows(max_id) sur un dict {id: texte}."""
+    def rows(max_id):
+        return iter(text_rows({k: v for k, v in texts.items() if max_id is None or k <= max_id}))
+    return rows
+
+
+class TempIndexMixin:
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name)
+
+    def index(self):
+        return recommend.RecommendationIndex(self.path, recommend.read_meta(self.path))
+
+
+class BuildMatrixTests(SimpleTestCase):
+    def test_rows_l2_normalized(self):
+        idf = np.ones(recommend.N_FEATURES, dtype=np.float32)
+        ids, matrix = recommend.build_matrix(text_rows(TEXTS), idf)
+
+        self.assertEqual(ids.tolist(), [1, 2, 3, 4, 5])
+        self.assertEqual(matrix.shape, (5, recommend.N_FEATURES))
+        self.assertEqual(matrix.dtype, np.float32)
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        np.testing.assert_allclose(norms, 1.0, rtol=1e-5)
+
+    def test_empty_rows(self):
+        ids, matrix = recommend.build_matrix([], np.ones(recommend.N_FEATURES, dtype=np.float32))
+
+        self.assertEqual(len(ids), 0)
+        self.assertEqual(matrix.shape, (0, recommend.N_FEATURES))
+
+    def test_stop_words_and_case_ignored(self):
+        self.assertEqual(recommend.tokenize("Le Développeur et la DATA"), ["développeur", "data"])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class TopKTests(TempIndexMixin, SimpleTestCase):
+    def test_ranked_by_similarity(self):
+        recommend.rebuild_index(self.path, rows=rows_source(TEXTS))
+
+        ranked = self.index().top_k("python django", k=3)
+
+        self.assertEqual([job_id for job_id, _ in ranked], [1, 4])
+        self.assertGreater(ranked[0][1], ranked[1][1])
+
+    def test_k_and_exclude(self):
+        recommend.rebuild_index(self.path, rows=rows_source(TEXTS))
+        index = self.index()
+
+        self.assertEqual([job_id for job_id, _ in index.top_k("développeur python", k=1)], [1])
+        self.assertEqual([job_id for job_id, _ in index.top_k("python", exclude={1})], [4])
+
+    def test_unknown_or_empty_query(self):
+        recommend.rebuild_index(self.path, rows=rows_source(TEXTS))
+        index = self.index()
+
+        self.assertEqual(index.top_k("cobol"), [])
+        self.assertEqual(index.top_k(""), [])
+
+    @mock.patch("jobs.recommend.SEGMENT_SIZE", 2)
+    def test_results_merged_across_segments(self):
+        meta = recommend.rebuild_index(self.path, rows=rows_source(TEXTS))
+
+        self.assertEqual(len(meta["segments"]), 3)
+        self.assertEqual((meta["n_docs"], meta["last_job_id"]), (5, 5))
+        self.assertEqual([job_id for job_id, _ in self.index().top_k("développeur")], [2, 1])
+
+    def test_rebuild_replaces_previous_version(self):
+        first = recommend.rebuild_index(self.path, rows=rows_source(TEXTS))
+        second = recommend.rebuild_index(self.path, rows=rows_source({1: TEXTS[1]}))
+
+        self.assertEqual(second["version"], first["version"] + 1)
+        # Anciens segments et df supprimés
+        files = sorted(entry.name for entry in self.path.iterdir())
+        self.assertEqual(files, sorted([*second["segments"], second["df"], "meta.json"]))
+        self.assertEqual([job_id for job_id, _ in self.index().top_k("java")], [])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class UpdateIndexTests(TempIndexMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # bulk_create : pas de signaux (search_vector PostgreSQL) à la préparation
+        JobOffer.objects.bulk_create([JobOffer(title=TEXTS[i]) for i in (1, 2, 3)])
+
+    def test_new_offers_appended_as_a_segment(self):
+        meta = recommend.rebuild_index(self.path)
+        new = JobOffer.objects.bulk_create([JobOffer(title=TEXTS[4])])[0]
+
+        updated = recommend.update_index(self.path)
+
+        self.assertEqual(updated["version"], meta["version"] + 1)
+        self.assertEqual(updated["segments"][:-1], meta["segments"])
+        self.assertEqual((updated["n_docs"], updated["last_job_id"]), (4, new.pk))
+        self.assertIn(new.pk, [job_id for job_id, _ in self.index().top_k("spark")])
+
+    def test_nothing_new(self):
+        meta = recommend.rebuild_index(self.path)
+
+        self.assertEqual(recommend.update_index(self.path), meta)
+
+    def test_rebuild_without_index_or_too_many_segments(self):
+        meta = recommend.update_index(self.path)
+        self.assertEqual(len(meta["segments"]), 1)
+
+        JobOffer.objects.bulk_create([JobOffer(title=TEXTS[4])])
+        with mock.patch("jobs.recommend.MAX_SEGMENTS", 1):
+            rebuilt = recommend.update_index(self.path)
+        self.assertEqual((len(rebuilt["segments"]), rebuilt["n_docs"]), (1, 4))
+
+
+@override_settings(CACHES=LOCMEM_CACHE, METRICS_FLUSH_INTERVAL=3600)
+class RecommendedEndpointTests(TempIndexMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("alice")
+        CandidateProfile.objects.create(user=cls.user, skills="python, django", experience="API REST")
+        cls.django, cls.java, cls.data = JobOffer.objects.bulk_create(
+            [JobOffer(title=TEXTS[1]), JobOffer(title=TEXTS[2]), JobOffer(title=TEXTS[4])]
+        )
+
+    def setUp(self):
+        super().setUp()
+        recommend.rebuild_index(self.path)
+        patcher = mock.patch.multiple(recommend, _index=None, _index_checked_at=0.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, **params):
+        with self.settings(RECOMMEND_INDEX_DIR=str(self.path)):
+            return self.client.get("/api/jobs/recommended/", params)
+
+    def test_ranked_offers_with_score(self):
+        response = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([offer["id"] for offer in response.data], [self.django.pk, self.data.pk])
+        self.assertGreater(response.data[0]["score"], response.data[1]["score"])
+
+    def test_applied_offers_excluded_and_limit(self):
+        Application.objects.bulk_create([Application(user=self.user, job_offer=self.django)])
+
+        self.assertEqual([offer["id"] for offer in self.get(limit=1).data], [self.data.pk])
+
+    def test_deleted_offer_skipped(self):
+        JobOffer.objects.filter(pk=self.django.pk).delete()
+
+        self.assertEqual([offer["id"] for offer in self.get().data], [self.data.pk])
+
+    def test_invalid_limit(self):
+        self.assertEqual(self.get(limit="x").status_code, 400)
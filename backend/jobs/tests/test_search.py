@@ -0,0 +1,84 @@
+"""
+Recherche plein texte ?search= de GET /api/jobs/ (jobs/search.py) : remplace
+le SearchFilter de DRF ; pondération titre > entreprise > description.
+Le classement est vérifié sur PostgreSQL uniquement (tsvector, ts_rank).
+"""
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.filters import SearchFilter
+from rest_framework.test import APIClient
+
+from jobs.models import Company, JobOffer
+from jobs.search import JobOfferSearchFilter, update_search_vectors
+from jobs.views import JobOfferViewSet
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def titles(response):
+    return [offer["title"] for offer in response.data["results"]]
+
+
+class SearchBackendTests(TestCase):
+    def test_drf_search_filter_replaced(self):
+        backends = JobOfferViewSet.filter_backends
+        self.assertIn(JobOfferSearchFilter, backends)
+        self.assertNotIn(SearchFilter, backends)
+        # Après OrderingFilter : le tri par pertinence n'est pas écrasé
+        self.assertEqual(backends[-1], JobOfferSearchFilter)
+
+    @override_settings(CACHES=LOCMEM_CACHE, METRICS_FLUSH_INTERVAL=3600)
+    def test_blank_search_leaves_list_untouched(self):
+        cache.clear()
+        JobOffer.objects.bulk_create([JobOffer(title="Développeur"), JobOffer(title="Comptable")])
+
+        response = APIClient().get("/api/jobs/", {"search": "  "})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(titles(response)), ["Comptable", "Développeur"])
+
+
+@skipUnless(connection.vendor == "postgresql", "tsvector / ts_rank : PostgreSQL uniquement")
+@override_settings(CACHES=LOCMEM_CACHE, METRICS_FLUSH_INTERVAL=3600)
+class SearchRankingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        python_co = Company.objects.create(name="Python Factory")
+        other = Company.objects.create(name="Acme")
+        JobOffer.objects.bulk_create([
+            JobOffer(title="Comptable", company=other, description="Aucun rapport", salary=30000),
+            JobOffer(title="Chef de projet", company=other, description="Un peu de python", salary=60000),
+            JobOffer(title="Commercial", company=python_co, description="Vente", salary=40000),
+            JobOffer(title="Développeur Python", company=other, description="API Django", salary=50000),
+        ])
+        update_search_vectors(JobOffer.objects.all())
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def search(self, **params):
+        return titles(self.client.get("/api/jobs/", params))
+
+    def test_ranked_title_then_company_then_description(self):
+        self.assertEqual(self.search(search="python"), ["Développeur Python", "Commercial", "Chef de projet"])
+
+    def test_french_stemming(self):
+        self.assertEqual(self.search(search="développeurs"), ["Développeur Python"])
+
+    def test_websearch_syntax(self):
+        self.assertEqual(self.search(search="python -django"), ["Commercial", "Chef de projet"])
+        self.assertEqual(self.search(search='"chef de projet"'), ["Chef de projet"])
+
+    def test_explicit_ordering_wins_over_rank(self):
+        self.assertEqual(
+            self.search(search="python", ordering="-salary"),
+            ["Chef de projet", "Développeur Python", "Commercial"],
+        )
+
+    def test_no_substring_match(self):
+        # Plus d'ILIKE '%terme%' : un fragment de mot ne correspond pas
+        self.assertEqual(self.search(search="pyth"), [])
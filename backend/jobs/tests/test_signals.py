@@ -0,0 +1,44 @@
+"""
+Invalidation du cache des tendances (jobs/signals.py) : après le COMMIT seulement.
+"""
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from jobs.models import Company, JobOffer
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+@mock.patch("jobs.signals.update_search_vectors")
+@mock.patch("jobs.signals.bump_generation")
+@mock.patch("jobs.signals.outbox.enqueue")
+class TrendingInvalidationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(name="Acme")
+        # bulk_create : pas de signaux (search_vector PostgreSQL) à la préparation
+        cls.offer = JobOffer.objects.bulk_create([JobOffer(title="Développeur", company=cls.company)])[0]
+
+    @mock.patch("jobs.signals.trending.invalidate_jobs")
+    def test_job_offer_save_invalidates_on_commit(self, invalidate_jobs, enqueue, bump, update_search_vectors):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer.save()
+            invalidate_jobs.assert_not_called()
+        invalidate_jobs.assert_called_once_with([self.offer.pk])
+
+    @mock.patch("jobs.signals.trending.invalidate_jobs")
+    def test_company_save_invalidates_its_offers_on_commit(self, invalidate_jobs, enqueue, bump, update_search_vectors):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.company.save()
+            invalidate_jobs.assert_not_called()
+        invalidate_jobs.assert_called_once_with([self.offer.pk])
+
+    @mock.patch("jobs.signals.trending.forget_job")
+    def test_job_offer_delete_forgets_on_commit(self, forget_job, enqueue, bump, update_search_vectors):
+        job_id = self.offer.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer.delete()
+            forget_job.assert_not_called()
+        forget_job.assert_called_once_with(job_id)
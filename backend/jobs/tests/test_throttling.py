@@ -0,0 +1,119 @@
+"""
+Limitation de débit par seau à jetons (core/throttling.py), sur un Redis en
+mémoire (jobs/tests/fakes.py) : rafale puis 429, recharge, clés par IP et par
+compte, et passage sans limite quand Redis est indisponible.
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.throttling import TokenBucketThrottle, take_token
+
+from .fakes import FakeRedis
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+RATES = {"login": "5/min", "login_username": "3/min", "register": "2/hour", "apply": "2/hour"}
+
+
+class TakeTokenTests(TestCase):
+    def test_burst_then_wait(self):
+        redis = FakeRedis()
+        results = [take_token("throttle:test:a", 3, 60, now=1000.0, redis=redis) for _ in range(4)]
+        self.assertEqual([allowed for allowed, _ in results], [True, True, True, False])
+        # Un jeton toutes les 60 / 3 = 20 s
+        self.assertAlmostEqual(results[-1][1], 20.0)
+
+    def test_refill_after_the_period(self):
+        redis = FakeRedis()
+        for _ in range(3):
+            take_token("throttle:test:a", 3, 60, now=1000.0, redis=redis)
+        self.assertFalse(take_token("throttle:test:a", 3, 60, now=1010.0, redis=redis)[0])
+        self.assertTrue(take_token("throttle:test:a", 3, 60, now=1020.0, redis=redis)[0])
+        # Seau plein après une période entière, jamais au-delà de la capacité
+        allowed = [take_token("throttle:test:a", 3, 60, now=2000.0, redis=redis)[0] for _ in range(4)]
+        self.assertEqual(allowed, [True, True, True, False])
+
+    def test_buckets_are_independent(self):
+        redis = FakeRedis()
+        for _ in range(3):
+            take_token("throttle:test:a", 3, 60, now=1000.0, redis=redis)
+        self.assertTrue(take_token("throttle:test:b", 3, 60, now=1000.0, redis=redis)[0])
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHE,
+    METRICS_FLUSH_INTERVAL=3600,
+    # Échecs de connexion sans le coût du hachage réel
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+)
+class ThrottledViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.redis = FakeRedis()
+        self.now = 1000.0
+        for patcher in (
+            mock.patch("core.throttling.get_redis_connection", side_effect=lambda alias: self.redis),
+            mock.patch.object(TokenBucketThrottle, "THROTTLE_RATES", RATES),
+            mock.patch.object(TokenBucketThrottle, "timer", side_effect=lambda: self.now),
+        ):
+            self.addCleanup(patcher.stop)
+            patcher.start()
+        self.client = APIClient()
+
+    def login(self, username, ip):
+        return self.client.post(
+            "/api/auth/login/", {"username": username, "password": "mauvais"}, format="json", REMOTE_ADDR=ip
+        )
+
+    def assertThrottled(self, response, retry_after):
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], str(retry_after))
+
+    def test_login_is_limited_per_ip(self):
+        for index in range(5):
+            self.assertEqual(self.login(f"user{index}", "10.0.0.1").status_code, 401)
+        # 5/min : un jeton toutes les 12 s
+        self.assertThrottled(self.login("user9", "10.0.0.1"), 12)
+        self.assertEqual(self.login("user9", "10.0.0.2").status_code, 401)
+
+    def test_login_is_limited_per_username_across_ips(self):
+        for index in range(3):
+            self.assertEqual(self.login("Alice", f"10.0.1.{index}").status_code, 401)
+        # Même compte, casse et espaces ignorés
+        self.assertThrottled(self.login(" alice ", "10.0.1.9"), 20)
+        self.assertEqual(self.login("bob", "10.0.1.9").status_code, 401)
+
+    def test_login_refills_after_the_period(self):
+        for _ in range(3):
+            self.login("alice", "10.0.2.1")
+        self.assertEqual(self.login("alice", "10.0.2.1").status_code, 429)
+        self.now += 20
+        self.assertEqual(self.login("alice", "10.0.2.1").status_code, 401)
+        self.assertEqual(self.login("alice", "10.0.2.1").status_code, 429)
+
+    def test_register_is_limited_per_ip(self):
+        for _ in range(2):
+            self.assertEqual(self.client.post("/api/auth/register/", {}, REMOTE_ADDR="10.0.3.1").status_code, 400)
+        self.assertThrottled(self.client.post("/api/auth/register/", {}, REMOTE_ADDR="10.0.3.1"), 1800)
+        self.assertEqual(self.client.post("/api/auth/register/", {}, REMOTE_ADDR="10.0.3.2").status_code, 400)
+
+    def test_apply_is_limited_per_user(self):
+        User = get_user_model()
+        first, second = User.objects.create_user("premier"), User.objects.create_user("second")
+        self.client.force_authenticate(first)
+        for _ in range(2):
+            self.assertEqual(self.client.post("/api/applications/", {}).status_code, 400)
+        self.assertThrottled(self.client.post("/api/applications/", {}), 1800)
+        # Les lectures ne sont pas limitées
+        self.assertEqual(self.client.get("/api/applications/").status_code, 200)
+        self.client.force_authenticate(second)
+        self.assertEqual(self.client.post("/api/applications/", {}).status_code, 400)
+
+    def test_redis_down_fails_open(self):
+        self.redis.down = True
+        with self.assertLogs("core.throttling", "WARNING"):
+            statuses = {self.login("alice", "10.0.4.1").status_code for _ in range(10)}
+        self.assertEqual(statuses, {401})
@@ -0,0 +1,60 @@
+"""
+Filtres ?location= / ?company= (et variantes _similar) servis par les index
+GIN pg_trgm (jobs/lookups.py, migration 0007). PostgreSQL uniquement.
+"""
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from jobs.filters import JobOfferFilter
+from jobs.models import Company, JobOffer
+
+OFFERS = 20000
+COMPANIES = 20000
+
+
+@skipUnless(connection.vendor == "postgresql", "index trigrammes : PostgreSQL uniquement")
+class TrigramIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        companies = Company.objects.bulk_create(
+            [Company(name=f"Entreprise {index:05d}") for index in range(COMPANIES - 1)]
+            + [Company(name="Zorglub Industries")]
+        )
+        JobOffer.objects.bulk_create(
+            [
+                JobOffer(
+                    title=f"Offre {index}",
+                    company=companies[index % len(companies)],
+                    location="Quimperlé" if index % 5000 == 0 else f"Ville {index:05d}",
+                )
+                for index in range(OFFERS)
+            ],
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE jobs_joboffer")
+            cursor.execute("ANALYZE jobs_company")
+
+    def plan(self, **params):
+        queryset = JobOfferFilter(params, queryset=JobOffer.objects.all()).qs
+        return queryset.explain()
+
+    def test_location_contains_uses_trigram_index(self):
+        self.assertIn("joboffer_location_trgm", self.plan(location="quimper"))
+
+    def test_location_similar_uses_trigram_index(self):
+        self.assertIn("joboffer_location_trgm", self.plan(location_similar="Quimperle"))
+
+    def test_company_contains_uses_trigram_index(self):
+        self.assertIn("company_name_trgm", self.plan(company="zorglub"))
+
+    def test_company_similar_uses_trigram_index(self):
+        self.assertIn("company_name_trgm", self.plan(company_similar="Zorglb"))
+
+    def test_filters_do_not_wrap_column_in_upper(self):
+        queryset = JobOfferFilter({"location": "quimper"}, queryset=JobOffer.objects.all()).qs
+        sql = str(queryset.query)
+        self.assertIn("ILIKE", sql)
+        self.assertNotIn("UPPER(", sql)
@@ -0,0 +1,245 @@
+"""
+jobs/trending.py - Score "tendance" des offres (Redis)
+======================================================
+
+Le score d'une offre mesure la vitesse à laquelle elle reçoit des candidatures,
+sur des fenêtres glissantes calculées à partir de Application.created_at :
+
+    score = 6 × (candidatures dernière heure)
+          + 2 × (candidatures 6 dernières heures)
+          + 1 × (candidatures 24 dernières heures)
+
+Stockage Redis :
+- trending:apps:<heure>  : ZSET job_id → nb de candidatures reçues pendant cette heure
+                           (incrémenté à chaque candidature, expire après 25 h)
+- trending:scores        : ZSET job_id → score, union pondérée des 24 derniers
+                           ZSET horaires, recalculée au plus toutes les TRENDING_SCORES_TTL s
+- cache Django "trending:job:<id>" : offre sérialisée (lue sur le primaire),
+                           supprimée dès que l'offre (ou son entreprise) change,
+                           voir jobs/signals.py
+
+aget_trending_jobs() est la variante async (redis.asyncio, API async du cache
+et de l'ORM) utilisée par la vue ASGI (jobs/async_views.py).
+"""
+import logging
+import time
+import weakref
+from asyncio import get_running_loop
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from .models import Application, JobOffer
+
+logger = logging.getLogger(__name__)
+
+TRENDING_SIZE = 10
+WINDOW_HOURS = 24
+BUCKET_TTL = (WINDOW_HOURS + 1) * 3600
+TRENDING_SCORES_TTL = 60
+JOB_CACHE_TTL = 60 * 60
+
+BUCKET_KEY = "trending:apps:{hour}"
+SCORES_KEY = "trending:scores"
+JOB_CACHE_KEY = "trending:job:{id}"
+
+
+def _hour(dt=None):
+    """Numéro d'heure absolu (epoch / 3600) d'une date, ou de maintenant."""
+    timestamp = dt.timestamp() if dt is not None else time.time()
+    return int(timestamp // 3600)
+
+
+def _bucket_weight(age_hours):
+    """Poids d'un ZSET horaire selon son âge : somme des fenêtres qui le contiennent."""
+    weight = 1
+    if age_hours < 6:
+        weight += 2
+    if age_hours < 1:
+        weight += 6
+    return weight
+
+
+def record_application(job_id, created_at=None):
+    """Compte une candidature dans le ZSET de son heure (appelé après commit)."""
+    key = BUCKET_KEY.format(hour=_hour(created_at))
+    try:
+        redis = get_redis_connection("default")
+        pipe = redis.pipeline(transaction=False)
+        pipe.zincrby(key, 1, job_id)
+        pipe.expire(key, BUCKET_TTL)
+        pipe.execute()
+    except RedisError:
+        # Le score est reconstructible (rebuild_scores) : on ne bloque pas la candidature
+        logger.warning("trending: impossible d'enregistrer la candidature pour l'offre %s", job_id)
+
+
+def forget_job(job_id):
+    """Retire une offre supprimée de tous les ZSET et du cache."""
+    cache.delete(JOB_CACHE_KEY.format(id=job_id))
+    try:
+        redis = get_redis_connection("default")
+        now = _hour()
+        pipe = redis.pipeline(transaction=False)
+        for age in range(WINDOW_HOURS):
+            pipe.zrem(BUCKET_KEY.format(hour=now - age), job_id)
+        pipe.zrem(SCORES_KEY, job_id)
+        pipe.execute()
+    except RedisError:
+        logger.warning("trending: impossible de retirer l'offre %s", job_id)
+
+
+def invalidate_jobs(job_ids):
+    """Supprime les entrées sérialisées en cache des offres modifiées."""
+    cache.delete_many([JOB_CACHE_KEY.format(id=job_id) for job_id in job_ids])
+
+
+def _score_weights():
+    now = _hour()
+    return {BUCKET_KEY.format(hour=now - age): _bucket_weight(age) for age in range(WINDOW_HOURS)}
+
+
+def _refresh_scores(redis):
+    """Union pondérée des ZSET horaires dans trending:scores (si expiré)."""
+    if redis.exists(SCORES_KEY):
+        return
+    pipe = redis.pipeline()
+    pipe.zunionstore(SCORES_KEY, _score_weights())
+    pipe.expire(SCORES_KEY, TRENDING_SCORES_TTL)
+    pipe.execute()
+
+
+def top_job_ids(size=TRENDING_SIZE):
+    """Ids des offres au meilleur score, du plus fort au plus faible."""
+    try:
+        redis = get_redis_connection("default")
+        _refresh_scores(redis)
+        return [int(member) for member in redis.zrevrange(SCORES_KEY, 0, size - 1)]
+    except RedisError:
+        logger.warning("trending: Redis indisponible, repli sur les offres récentes")
+        return []
+
+
+def _jobs(using=None):
+    return JobOffer.objects.db_manager(using).select_related("company").defer("search_vector")
+
+
+def get_trending_jobs(serializer_class, size=TRENDING_SIZE):
+    """
+    Offres tendances sérialisées : entrées lues dans le cache Django, seules les
+    offres absentes du cache sont chargées depuis PostgreSQL (une requête).
+    Complété par les offres les plus récentes si peu d'offres ont un score.
+    """
+    job_ids = top_job_ids(size)
+    keys = {job_id: JOB_CACHE_KEY.format(id=job_id) for job_id in job_ids}
+    cached = cache.get_many(keys.values())
+    entries = {job_id: cached[key] for job_id, key in keys.items() if key in cached}
+
+    missing = [job_id for job_id in job_ids if job_id not in entries]
+    if missing:
+        # Entrées mises en cache : lues sur le primaire, pas sur un réplica en retard
+        fresh = {job.pk: dict(serializer_class(job).data) for job in _jobs(DEFAULT_DB_ALIAS).filter(pk__in=missing)}
+        cache.set_many({keys[job_id]: data for job_id, data in fresh.items()}, JOB_CACHE_TTL)
+        entries.update(fresh)
+
+    # Offres supprimées entre-temps : absentes de entries, donc ignorées
+    results = [entries[job_id] for job_id in job_ids if job_id in entries]
+    if len(results) < size:
+        recent = _jobs().exclude(pk__in=list(entries))[: size - len(results)]
+        results += serializer_class(recent, many=True).data
+    return results
+
+
+# ---- Variantes async (vue ASGI, jobs/async_views.py) ----
+
+# Un client redis.asyncio par boucle d'événements (ses connexions y sont liées)
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _async_redis():
+    loop = get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        pool = aioredis.BlockingConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_POOL_SIZE,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        )
+        client = _async_clients[loop] = aioredis.Redis(connection_pool=pool)
+    return client
+
+
+async def atop_job_ids(size=TRENDING_SIZE):
+    try:
+        client = _async_redis()
+        if not await client.exists(SCORES_KEY):
+            async with client.pipeline() as pipe:
+                pipe.zunionstore(SCORES_KEY, _score_weights())
+                pipe.expire(SCORES_KEY, TRENDING_SCORES_TTL)
+                await pipe.execute()
+        return [int(member) for member in await client.zrevrange(SCORES_KEY, 0, size - 1)]
+    except RedisError:
+        logger.warning("trending: Redis indisponible, repli sur les offres récentes")
+        return []
+
+
+async def aget_trending_jobs(serializer_class, size=TRENDING_SIZE):
+    """Même résultat que get_trending_jobs(), sans bloquer la boucle d'événements."""
+    job_ids = await atop_job_ids(size)
+    keys = {job_id: JOB_CACHE_KEY.format(id=job_id) for job_id in job_ids}
+    cached = await cache.aget_many(keys.values())
+    entries = {job_id: cached[key] for job_id, key in keys.items() if key in cached}
+
+    missing = [job_id for job_id in job_ids if job_id not in entries]
+    if missing:
+        fresh = {
+            job.pk: dict(serializer_class(job).data)
+            async for job in _jobs(DEFAULT_DB_ALIAS).filter(pk__in=missing)
+        }
+        await cache.aset_many({keys[job_id]: data for job_id, data in fresh.items()}, JOB_CACHE_TTL)
+        entries.update(fresh)
+
+    results = [entries[job_id] for job_id in job_ids if job_id in entries]
+    if len(results) < size:
+        recent = [job async for job in _jobs().exclude(pk__in=list(entries))[: size - len(results)]]
+        results += serializer_class(recent, many=True).data
+    return results
+
+
+def rebuild_scores():
+    """
+    Reconstruit les ZSET horaires depuis Application.created_at (24 dernières heures).
+    Utile après une perte des données Redis ou pour initialiser le classement.
+    """
+    since = timezone.now() - timedelta(hours=WINDOW_HOURS)
+    rows = (
+        Application.objects.filter(created_at__gte=since)
+        .annotate(hour=TruncHour("created_at"))
+        .values("hour", "job_offer_id")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    buckets = {}
+    for row in rows:
+        buckets.setdefault(BUCKET_KEY.format(hour=_hour(row["hour"])), {})[row["job_offer_id"]] = row["total"]
+
+    redis = get_redis_connection("default")
+    now = _hour()
+    pipe = redis.pipeline()
+    for age in range(WINDOW_HOURS):
+        pipe.delete(BUCKET_KEY.format(hour=now - age))
+    for key, counts in buckets.items():
+        pipe.zadd(key, counts)
+        pipe.expire(key, BUCKET_TTL)
+    pipe.delete(SCORES_KEY)
+    pipe.execute()
+    return sum(len(counts) for counts in buckets.values())
@@ -0,0 +1,73 @@
+"""
+jobs/uploads.py - Réception des CV (PUT/PATCH /api/profiles/me/)
+================================================================
+
+CVUploadHandler remplace les handlers d'upload par défaut (FILE_UPLOAD_HANDLERS) :
+le fichier est écrit sur disque par morceaux de chunk_size octets (jamais
+gardé en mémoire) et la réception s'arrête dès que :
+- le fichier dépasse CV_MAX_UPLOAD_SIZE
+- l'extension n'est pas autorisée, ou les premiers octets ne correspondent pas
+  au format annoncé (signature PDF / DOCX)
+
+Le motif du refus est noté sur la requête (upload_error) : ProfileViewSet.me
+répond 413 ou 415 au lieu d'ignorer silencieusement le fichier.
+"""
+import posixpath
+
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+
+CV_FIELD = "cv"
+# Extension → signature attendue en début de fichier
+CV_SIGNATURES = {
+    "pdf": b"%PDF-",
+    "docx": b"PK\x03\x04",
+}
+ERROR_TOO_LARGE = "too_large"
+ERROR_TYPE = "unsupported_type"
+
+
+def cv_extension(name):
+    return posixpath.splitext(name or "")[1][1:].lower()
+
+
+class CVUploadHandler(TemporaryFileUploadHandler):
+    """Fichier temporaire sur disque, limites de taille et de type pour le champ cv."""
+
+    chunk_size = 64 * 1024
+    request_length = None
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.request_length = content_length
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        self.checked = field_name != CV_FIELD
+        self.received = 0
+        if not self.checked:
+            if cv_extension(file_name) not in CV_SIGNATURES:
+                self._reject(ERROR_TYPE)
+            if self.request_length and self.request_length > settings.CV_MAX_UPLOAD_SIZE + self.chunk_size:
+                # Corps de requête trop gros d'après Content-Length : inutile d'écrire le fichier
+                self._reject(ERROR_TOO_LARGE)
+        self.extension = cv_extension(file_name)
+        super().new_file(field_name, file_name, *args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.checked:
+            # Le premier morceau contient la signature du format
+            if not raw_data.startswith(CV_SIGNATURES[self.extension]):
+                self._abort(ERROR_TYPE)
+            self.checked = True
+        self.received += len(raw_data)
+        if self.field_name == CV_FIELD and self.received > settings.CV_MAX_UPLOAD_SIZE:
+            self._abort(ERROR_TOO_LARGE)
+        return super().receive_data_chunk(raw_data, start)
+
+    def _reject(self, error):
+        self.request.upload_error = error
+        raise SkipFile()
+
+    def _abort(self, error):
+        # Fichier temporaire déjà ouvert : supprimé avant d'ignorer la suite du fichier
+        self.file.close()
+        self._reject(error)
@@ -5,19 +5,45 @@ jobs/urls.py - Routes API de l'app jobs
 On utilise DefaultRouter pour générer automatiquement les routes REST :
 - /api/jobs/         → Liste + Create
 - /api/jobs/{id}/    → Detail + Update + Delete
+- /api/recruiter/offers/ → Tableau de bord recruteur
+
+En mode ASGI (settings.ASYNC_READ_VIEWS), la liste, le détail et les tendances
+passent d'abord par les vues async de jobs/async_views.py.
 """
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from .views import JobOfferViewSet, CompanyViewSet, ApplicationViewSet, ProfileViewSet, TrendingJobsView
+from .views import (
+    JobOfferViewSet,
+    CompanyViewSet,
+    ApplicationViewSet,
+    ProfileViewSet,
+    RecruiterOfferViewSet,
+    TrendingJobsView,
+)
 
 router = DefaultRouter()
 router.register(r"jobs", JobOfferViewSet, basename="job")
 router.register(r"companies", CompanyViewSet, basename="company")
 router.register(r"applications", ApplicationViewSet, basename="application")
 router.register(r"profiles", ProfileViewSet, basename="profile")
+router.register(r"recruiter/offers", RecruiterOfferViewSet, basename="recruiter-offer")
+
+if settings.ASYNC_READ_VIEWS:
+    from . import async_views
+
+    urlpatterns = [
+        path("jobs/trending/", async_views.trending_jobs, name="jobs-trending"),
+        path("jobs/", async_views.job_list),
+        path("jobs/<int:pk>/", async_views.job_detail),
+    ]
+else:
+    urlpatterns = [
+        # Avant le router : sinon "trending" est capturé comme {id} par /jobs/{id}/
+        path("jobs/trending/", TrendingJobsView.as_view(), name="jobs-trending"),
+    ]
 
-urlpatterns = [
+urlpatterns += [
     path("", include(router.urls)),
-    path("jobs/trending/", TrendingJobsView.as_view(), name="jobs-trending"),
 ]
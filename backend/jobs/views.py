@@ -3,14 +3,23 @@ jobs/views.py - Vues API
 =========================
 
 - JobOfferViewSet : CRUD complet (Create, Read, Update, Delete) pour les offres
-- TrendingJobsView : Liste des jobs "tendances" avec cache 15 min (Étape 6)
+- TrendingJobsView : Liste des jobs "tendances" classés par score Redis (jobs/trending.py)
+- RecruiterOfferViewSet : Tableau de bord recruteur (offres + compteurs, candidats par offre)
 """
-from rest_framework import viewsets, generics
+from celery.result import AsyncResult
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from rest_framework import mixins, status, viewsets, generics
 from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAuthenticatedOrReadOnly
+from django_filters.rest_framework import DjangoFilterBackend
+
+from core.throttling import ApplyRateThrottle
 
 from .models import JobOffer, Company, Application, CandidateProfile
 from .serializers import (
@@ -18,11 +27,52 @@ from .serializers import (
     CompanySerializer,
     ApplicationSerializer,
     CandidateProfileSerializer,
+    RecruiterOfferSerializer,
 )
-from .filters import JobOfferFilter
+from . import exports
+from .cache import GenerationCachedListMixin, facet_cache_params
+from .conditional import ConditionalModelViewSetMixin, ConditionalRequestMixin, make_etag
+from .cv import cv_search_query
+from .facets import compute_facets
+from .filters import ApplicationFilter, JobOfferFilter
+from .importers import CONTENT_TYPES, JobOfferImporter
+from .pagination import KeysetPagination
+from .recommend import recommend_job_ids
+from .permissions import IsRecruiter
+from .protected_media import can_download_cv, cv_url_window, protected_file_response, token_user
+from .search import JobOfferSearchFilter
+from .tasks import export_applications_task
+from .uploads import ERROR_TOO_LARGE
+from .trending import get_trending_jobs
+
+# Texte et tsvector du CV : jamais sérialisés, potentiellement volumineux
+PROFILE_DEFERRED = ("user__candidate_profile__cv_text", "user__candidate_profile__cv_search_vector")
+# ETag / Last-Modified d'une offre : elle-même et son entreprise (sérialisée imbriquée)
+JOB_VALIDATOR_FIELDS = ("updated_at", "company__updated_at")
+
+
+def export_format(request):
+    """Format d'export demandé (csv par défaut), None s'il n'est pas supporté."""
+    # ?output= et non ?format= : ce dernier est réservé à la négociation de contenu DRF
+    fmt = request.query_params.get("output", exports.FORMAT_CSV)
+    return fmt if fmt in exports.CONTENT_TYPES else None
+
 
+def export_format_error():
+    return Response(
+        {"detail": f"output doit valoir {' ou '.join(exports.CONTENT_TYPES)}"},
+        status=status.HTTP_400_BAD_REQUEST,
+    )
 
-class JobOfferViewSet(viewsets.ModelViewSet):
+
+def job_validators(pk, row):
+    """(etag, last_modified) d'une offre à partir de ses JOB_VALIDATOR_FIELDS, None si elle n'existe pas."""
+    if row is None:
+        return None
+    return make_etag("job", pk, *row), max(filter(None, row))
+
+
+class JobOfferViewSet(ConditionalModelViewSetMixin, GenerationCachedListMixin, viewsets.ModelViewSet):
     """
     ViewSet = CRUD complet en une seule classe.
     
@@ -33,33 +83,138 @@ class JobOfferViewSet(viewsets.ModelViewSet):
     - PUT    /api/jobs/{id}/     → Mise à jour complète
     - PATCH  /api/jobs/{id}/     → Mise à jour partielle
     - DELETE /api/jobs/{id}/     → Supprimer une offre
+    - POST   /api/jobs/import/   → Import en masse (CSV ou JSON Lines, voir jobs/importers.py)
+    - GET    /api/jobs/recommended/ → Offres recommandées pour mon profil candidat (jobs/recommend.py)
+    - GET    /api/jobs/facets/   → Compteurs par lieu / entreprise / tranche de salaire (jobs/facets.py)
+    - GET    /api/jobs/export/?output=csv|ndjson → Export en streaming (authentifié, jobs/exports.py)
     
     Filtres : ?location=Paris&company=Tech&salary_min=30000&salary_max=80000
-    Recherche : ?search=python (dans title et description)
+    Recherche : ?search=python (plein texte PostgreSQL sur titre, entreprise et description,
+    résultats triés par pertinence si aucun ?ordering= n'est fourni)
     Tri : ?ordering=-salary, ?ordering=created_at, ?ordering=-created_at
+    Pagination : par curseur (?cursor=, liens next/previous), ou ?page=N pour la pagination classique
+    Cache : la liste est mise en cache par combinaison de filtres (jobs/cache.py, en-tête X-Cache)
+    Requêtes conditionnelles : ETag / Last-Modified, 304 et If-Match (jobs/conditional.py)
     
     Permissions : lecture (GET) publique, écriture (POST/PUT/PATCH/DELETE) réservée aux utilisateurs authentifiés (JWT)
     """
-    queryset = JobOffer.objects.select_related("company").all()
+    # search_vector ne sert qu'au filtrage : inutile de le transférer pour chaque ligne
+    queryset = JobOffer.objects.select_related("company").defer("search_vector")
     serializer_class = JobOfferSerializer
     filterset_class = JobOfferFilter
+    # JobOfferSearchFilter en dernier : il trie par pertinence après OrderingFilter
+    filter_backends = [DjangoFilterBackend, OrderingFilter, JobOfferSearchFilter]
+    pagination_class = KeysetPagination
     permission_classes = [IsAuthenticatedOrReadOnly]
-    search_fields = ["title", "description", "company__name"]
     ordering_fields = ["created_at", "salary", "title"]
     ordering = ["-created_at"]
+    # Identifiant numérique : /api/jobs/abc/ répond 404 (les validateurs filtrent sur pk avant la vue)
+    lookup_value_regex = r"\d+"
+
+    def perform_create(self, serializer):
+        # L'offre et son événement outbox (jobs/signals.py) sont commités ensemble
+        with transaction.atomic():
+            serializer.save()
 
+    def get_object_validators(self, pk):
+        return job_validators(pk, JobOffer.objects.filter(pk=pk).values_list(*JOB_VALIDATOR_FIELDS).first())
 
-class CompanyViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=["post"], url_path="import", permission_classes=[IsAuthenticated])
+    def import_offers(self, request):
+        """
+        Import en masse : corps text/csv (en-tête title,company,description,salary,location)
+        ou application/x-ndjson (un objet JSON par ligne). company = nom de l'entreprise
+        (créée avec owner = user connecté si elle n'existe pas).
+        ?batch_size=500 : taille des lots bulk_create (1 à JOBS_IMPORT_MAX_BATCH_SIZE).
+        """
+        content_type = (request.content_type or "").split(";")[0].strip().lower()
+        fmt = CONTENT_TYPES.get(content_type)
+        if fmt is None:
+            return Response(
+                {"detail": f"Content-Type non supporté. Attendu : {', '.join(sorted(CONTENT_TYPES))}"},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        try:
+            batch_size = int(request.query_params.get("batch_size", settings.JOBS_IMPORT_BATCH_SIZE))
+        except ValueError:
+            return Response({"detail": "batch_size doit être un entier"}, status=status.HTTP_400_BAD_REQUEST)
+        batch_size = max(1, min(batch_size, settings.JOBS_IMPORT_MAX_BATCH_SIZE))
+
+        importer = JobOfferImporter(
+            batch_size=batch_size, context=self.get_serializer_context(), owner=request.user
+        )
+        # request.stream : lecture ligne à ligne du corps, sans le charger en mémoire
+        report = importer.run(request.stream or [], fmt)
+        return Response(report, status=status.HTTP_201_CREATED if report["created"] else status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
+    def export(self, request):
+        """Export en streaming ?output=csv|ndjson, mêmes filtres que la liste (jobs/exports.py)."""
+        fmt = export_format(request)
+        if fmt is None:
+            return export_format_error()
+        return exports.streaming_response(
+            exports.job_export_queryset(request.query_params), fmt, exports.JOB_FIELDS, prefix="jobs"
+        )
+
+    @action(detail=False, methods=["get"])
+    def facets(self, request):
+        """
+        Facettes de la sélection courante (mêmes filtres et ?search= que la liste), en une requête
+        GROUPING SETS ; mises en cache par jeu de filtres et invalidées à chaque écriture d'offre.
+        """
+        return self.cached_response(
+            request,
+            facet_cache_params(self),
+            lambda: Response(compute_facets(self.filter_queryset(self.get_queryset()))),
+        )
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
+    def recommended(self, request):
+        """
+        Offres les plus proches de mon profil (skills + experience), score TF-IDF décroissant.
+        Les offres auxquelles j'ai déjà postulé sont exclues. ?limit=10 (1 à 50).
+        """
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 10)), 50))
+        except ValueError:
+            return Response({"detail": "limit doit être un entier"}, status=status.HTTP_400_BAD_REQUEST)
+        profile = CandidateProfile.objects.filter(user=request.user).only("skills", "experience").first()
+        if profile is None:
+            return Response([])
+
+        applied = set(Application.objects.filter(user=request.user).values_list("job_offer_id", flat=True))
+        # Marge : des offres supprimées depuis la dernière reconstruction de l'index peuvent remonter
+        ranked = recommend_job_ids(profile, k=limit * 2, exclude=applied)
+        offers = self.get_queryset().in_bulk([job_id for job_id, _ in ranked])
+        results = []
+        for job_id, score in ranked:
+            if job_id in offers and len(results) < limit:
+                data = self.get_serializer(offers[job_id]).data
+                data["score"] = round(score, 4)
+                results.append(data)
+        return Response(results)
+
+
+class CompanyViewSet(ConditionalModelViewSetMixin, viewsets.ModelViewSet):
     """
     CRUD pour les entreprises.
     GET /api/companies/ - Liste
     POST /api/companies/ - Créer (authentifié, owner = user connecté)
+    Requêtes conditionnelles : ETag / Last-Modified, 304 et If-Match (jobs/conditional.py)
     """
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     search_fields = ["name", "sector", "description"]
     ordering_fields = ["name", "created_at"]
+    lookup_value_regex = r"\d+"
+
+    def get_object_validators(self, pk):
+        updated_at = Company.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
+        if updated_at is None:
+            return None
+        return make_etag("company", pk, updated_at), updated_at
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
@@ -69,37 +224,178 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     """
     Candidatures : postuler à une offre (authentification requise).
     - GET /api/applications/ : mes candidatures
-    - POST /api/applications/ : postuler (job_offer, message)
+    - POST /api/applications/ : postuler (job_offer, message), limité par utilisateur (scope "apply")
     - GET /api/applications/1/ : détail
+    - GET /api/applications/export/?output=csv|ndjson : export en streaming (jobs/exports.py)
+    - POST /api/applications/export/async/?output=csv : export écrit par Celery, suivi via
+      GET /api/applications/export/async/{task_id}/ puis .../download/
     Le user est automatiquement l'utilisateur connecté.
+    Filtres (liste et exports) : ?job_offer=12&company=3&status=pending&created_after=2024-01-01
+    Pagination par curseur (?cursor=), ou ?page=N pour la pagination classique.
     """
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    filterset_class = ApplicationFilter
+    ordering_fields = ["created_at", "status"]
+    ordering = ["-created_at"]
 
     def get_queryset(self):
+        # user__candidate_profile : ApplicationSerializer.candidate_profile sans requête par ligne
+        queryset = Application.objects.select_related("job_offer", "user", "user__candidate_profile").defer(
+            "job_offer__description", "job_offer__search_vector", *PROFILE_DEFERRED
+        )
         if self.request.user.is_staff:
-            return Application.objects.select_related("user", "job_offer").all()
-        return Application.objects.filter(user=self.request.user).select_related("job_offer")
+            return queryset
+        return queryset.filter(user=self.request.user)
+
+    def get_throttles(self):
+        if self.action == "create":
+            return [ApplyRateThrottle()]
+        return super().get_throttles()
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        fmt = export_format(request)
+        if fmt is None:
+            return export_format_error()
+        return exports.streaming_response(exports.export_queryset(request.user, request.query_params), fmt)
+
+    @action(detail=False, methods=["post"], url_path="export/async")
+    def export_async(self, request):
+        fmt = export_format(request)
+        if fmt is None:
+            return export_format_error()
+        task = export_applications_task.delay(request.user.pk, request.query_params.dict(), fmt)
+        exports.register_task(task.id, request.user.pk)
+        status_url = reverse("application-export-status", kwargs={"task_id": task.id})
+        return Response(
+            {"task_id": task.id, "status_url": request.build_absolute_uri(status_url)},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    def _export_result(self, request, task_id):
+        if exports.task_owner(task_id) != request.user.pk:
+            raise Http404
+        return AsyncResult(task_id)
+
+    @action(detail=False, methods=["get"], url_path=r"export/async/(?P<task_id>[0-9a-f-]+)")
+    def export_status(self, request, task_id=None):
+        result = self._export_result(request, task_id)
+        data = {"task_id": task_id, "status": result.state}
+        if result.successful():
+            download_url = reverse("application-export-download", kwargs={"task_id": task_id})
+            data["download_url"] = request.build_absolute_uri(download_url)
+        elif result.failed():
+            data["detail"] = "L'export a échoué."
+        return Response(data)
+
+    @action(detail=False, methods=["get"], url_path=r"export/async/(?P<task_id>[0-9a-f-]+)/download")
+    def export_download(self, request, task_id=None):
+        result = self._export_result(request, task_id)
+        path = exports.export_path(result.result) if result.successful() else None
+        if path is None:
+            raise Http404
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=exports.filename(path.suffix[1:]))
 
-class ProfileViewSet(viewsets.GenericViewSet):
+
+class RecruiterOfferViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Tableau de bord du recruteur (offres des entreprises dont il est owner).
+    - GET /api/recruiter/offers/ : mes offres avec les compteurs pending / accepted / rejected
+    - GET /api/recruiter/offers/{id}/applicants/?status=pending : candidats d'une offre
+      ?cv_search=python django : recherche plein texte dans le CV des candidats (jobs/cv.py)
+
+    Chaque page = une seule requête agrégée (COUNT ... FILTER), servie par l'index
+    Application(job_offer, status, created_at). Pagination par curseur.
+    """
+    serializer_class = RecruiterOfferSerializer
+    permission_classes = [IsRecruiter]
+    pagination_class = KeysetPagination
+    ordering_fields = ["created_at", "title"]
+    ordering = ["-created_at"]
+
+    def get_queryset(self):
+        return (
+            JobOffer.objects.filter(company__owner=self.request.user)
+            .select_related("company")
+            .only("id", "title", "company_id", "company__name", "location", "salary", "created_at")
+            .annotate(
+                applications_count=Count("applications"),
+                pending_count=Count("applications", filter=Q(applications__status="pending")),
+                accepted_count=Count("applications", filter=Q(applications__status="accepted")),
+                rejected_count=Count("applications", filter=Q(applications__status="rejected")),
+            )
+        )
+
+    @action(detail=True, methods=["get"])
+    def applicants(self, request, pk=None):
+        offer = generics.get_object_or_404(JobOffer, pk=pk, company__owner=request.user)
+        applications = (
+            Application.objects.filter(job_offer=offer)
+            .select_related("job_offer", "user", "user__candidate_profile")
+            .defer("job_offer__description", "job_offer__search_vector", *PROFILE_DEFERRED)
+        )
+        status_filter = request.query_params.get("status")
+        if status_filter:
+            applications = applications.filter(status=status_filter)
+        cv_search = request.query_params.get("cv_search", "").strip()
+        if cv_search:
+            applications = applications.filter(user__candidate_profile__cv_search_vector=cv_search_query(cv_search))
+        page = self.paginate_queryset(applications)
+        serializer = ApplicationSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+
+
+class ProfileViewSet(ConditionalRequestMixin, viewsets.GenericViewSet):
     """
     Profil candidat : CV, lettre de motivation, compétences.
     GET /api/profiles/me/ → Mon profil
-    PUT /api/profiles/me/ → Mettre à jour mon profil
+    PUT /api/profiles/me/ → Mettre à jour mon profil (CV : PDF ou DOCX, CV_MAX_UPLOAD_SIZE max)
+    GET /api/profiles/{id}/cv/ → Télécharger un CV (jobs/protected_media.py)
+    ETag / Last-Modified sur updated_at et la fenêtre du lien signé cv_url : 304 en GET,
+    If-Match respecté en PUT/PATCH.
     """
     serializer_class = CandidateProfileSerializer
     permission_classes = [IsAuthenticated]
 
     def _get_profile(self):
-        profile, _ = CandidateProfile.objects.get_or_create(user=self.request.user)
+        profile, _ = CandidateProfile.objects.defer("cv_text", "cv_search_vector").get_or_create(
+            user=self.request.user
+        )
         return profile
 
+    def get_validators(self, request):
+        if self.action != "me":
+            return None
+        updated_at = (
+            CandidateProfile.objects.filter(user=request.user).values_list("updated_at", flat=True).first()
+        )
+        if updated_at is None:
+            return None
+        # cv_url porte un jeton signé : nouveaux validateurs à chaque fenêtre de validité du lien
+        window = cv_url_window()
+        return make_etag("profile", request.user.pk, updated_at, window.timestamp()), max(updated_at, window)
+
     @action(detail=False, methods=["get", "put", "patch"])
     def me(self, request):
+        return self.conditional_response(request, self._me)
+
+    def _me(self, request):
+        if request.method != "GET":
+            # Fichier refusé par CVUploadHandler (jobs/uploads.py) pendant la lecture du corps
+            request.data  # noqa: B018 - déclenche le parsing multipart
+            upload_error = getattr(request._request, "upload_error", None)
+            if upload_error == ERROR_TOO_LARGE:
+                return Response({"cv": ["Fichier trop volumineux."]}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+            if upload_error:
+                return Response(
+                    {"cv": ["Format non supporté : PDF ou DOCX uniquement."]},
+                    status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                )
         profile = self._get_profile()
         if request.method == "GET":
             serializer = self.get_serializer(profile)
@@ -109,16 +405,31 @@ class ProfileViewSet(viewsets.GenericViewSet):
         serializer.save(user=request.user)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"], permission_classes=[AllowAny])
+    def cv(self, request, pk=None):
+        """
+        CV du profil pk : le candidat, le staff, ou un recruteur ayant reçu sa candidature.
+        Authentification par JWT, ou ?token= (lien signé cv_url des serializers).
+        """
+        profile = generics.get_object_or_404(CandidateProfile.objects.only("id", "user_id", "cv"), pk=pk)
+        user = request.user
+        token = request.query_params.get("token")
+        if token and not user.is_authenticated:
+            user = token_user(token, profile)
+        if not profile.cv or not can_download_cv(user, profile):
+            # 404 plutôt que 403 : ne révèle pas l'existence du CV
+            raise Http404
+        return protected_file_response(profile.cv, f"cv-{profile.pk}.{profile.cv.name.rsplit('.', 1)[-1]}")
+
 
 class TrendingJobsView(generics.GenericAPIView):
     """
-    Vue des offres "tendances" (les 10 plus récentes).
-    Mise en cache 15 minutes pour réduire la charge sur la DB.
+    Vue des offres "tendances" : les 10 offres qui reçoivent le plus de
+    candidatures (fenêtres glissantes 1 h / 6 h / 24 h), complétées par les plus
+    récentes. Classement lu dans Redis, offres sérialisées en cache et
+    invalidées dès qu'elles changent (voir jobs/trending.py).
     """
     serializer_class = JobOfferSerializer
 
-    @method_decorator(cache_page(60 * 15))
     def get(self, request):
-        jobs = JobOffer.objects.select_related("company").all()[:10]
-        serializer = self.get_serializer(jobs, many=True)
-        return Response(serializer.data)
+        return Response(get_trending_jobs(self.get_serializer_class()))